@@ -1,19 +1,28 @@
 import json
 import os
+import re
+import sqlite3
 import sys
+import threading
 import uuid
+from array import array
 from pathlib import Path
 
 from PyQt5.QtCore import (
     Qt,
     QSortFilterProxyModel,
+    QAbstractItemModel,
     QAbstractTableModel,
     QModelIndex,
+    QObject,
     QSettings,
     QRegExp,
     QEvent,
+    QFileSystemWatcher,
     QLocale,
-    QRegularExpression,
+    QThread,
+    QTimer,
+    pyqtSignal,
 )
 from PyQt5.QtGui import (
     QColor,
@@ -62,14 +71,27 @@ from PyQt5.QtWidgets import (
     QTreeWidget,
     QTreeWidgetItem,
     QInputDialog,
+    QProgressBar,
 )
 
-from jsonschema import Draft7Validator, ValidationError
-
-# Set up paths relative to script location
-SCRIPT_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
-SCHEMA_DIR = SCRIPT_DIR.parent / "schemas"
-DATA_DIR = SCRIPT_DIR.parent / "open-db"
+from opendb_core import (
+    CACHE_DIR,
+    DATA_DIR,
+    SCHEMA_DIR,
+    SCRIPT_DIR,
+    ColumnStore,
+    Repository,
+    SchemaHelper,
+    SearchIndex,
+    ValidationCache,
+    ValidationEngine,
+    content_hash,
+    default_loader_workers,
+    format_error_summary,
+)
+from opendb_core import columns, jsoncodec, query, search
+from opendb_core.savequeue import SaveQueue
+from opendb_core.sqlindex import SqliteIndex
 
 # Ensure directories exist
 SCHEMA_DIR.mkdir(exist_ok=True)
@@ -1757,127 +1779,414 @@ class DataTableModel(QAbstractTableModel):
     Model for displaying hardware component data in a table with support for nested fields
     """
 
+    # Cell backgrounds for validation issues
+    MISSING_REQUIRED_COLOR = QColor(255, 200, 200)  # Light red
+    TYPE_MISMATCH_COLOR = QColor(255, 230, 200)  # Light orange
+    MISSING_OPTIONAL_COLOR = QColor(255, 255, 200)  # Light yellow
+
+    # Shared by every required cell, created on first use
+    _bold_font = None
+
     def __init__(self, data=None, headers=None, parent=None):
         super().__init__(parent)
         self._data = data or []
         self._headers = headers or []
+        self._column_by_field = {field: col for col, field in enumerate(self._headers)}
         self._validation_results = {}
+        # Background color of the cells with validation issues: {opendb_id: {column: QColor}}
+        self._cell_colors = {}
         self._required_fields = []
-        self._flattened_data = []
+        self._required_columns = set()
+        # JSON schema type of each field, used to sort by typed value
+        self._field_types = {}
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        # Rows added or changed while sorted are put in place shortly after, in one step
+        self._resort_timer = QTimer(self)
+        self._resort_timer.setSingleShot(True)
+        self._resort_timer.setInterval(100)
+        self._resort_timer.timeout.connect(self._resort)
+        # Cell values, stored column by column and built lazily (see opendb_core.columns)
+        self._columns = ColumnStore(self._headers, self._data)
+        self._row_by_id = {}
+        # Built on first search, then kept up to date as rows change
+        self._search_index = None
+        # Bumped when all rows are replaced, which discards an index being built
+        self._data_generation = 0
+        # Typed per-field indexes for structured queries, rebuilt lazily after changes
+        self._query_index = None
+        self._query_index_version = None
+        # Searches run on a worker thread; row changes and index access hold this lock
+        self._index_lock = threading.RLock()
+        # Bumped on every row change; _id_versions records when each entry last changed
+        self._version = 0
+        self._id_versions = {}
         self._flatten_data()
 
+    def headers(self):
+        """Field path shown in each column"""
+        return list(self._headers)
+
     def set_required_fields(self, required_fields):
         """Set which fields are required"""
         self._required_fields = required_fields
+        self._required_columns = {
+            self._column_by_field[field] for field in required_fields
+            if field in self._column_by_field
+        }
+
+    def set_field_types(self, field_types):
+        """Set the JSON schema type of each field, e.g. from SchemaHelper.get_property_types"""
+        self._field_types = field_types
 
     def set_validation_results(self, validation_results):
-        """Set validation results for entries"""
-        self._validation_results = validation_results
-        self.layoutChanged.emit()
+        """Set validation results for all entries, repainting only the rows that changed"""
+        changed_ids = []
+        for entry_id in list(self._validation_results):
+            if entry_id not in validation_results:
+                del self._validation_results[entry_id]
+                if self._cell_colors.pop(entry_id, None):
+                    changed_ids.append(entry_id)
+
+        updates = {
+            entry_id: result for entry_id, result in validation_results.items()
+            if self._validation_results.get(entry_id) is not result
+        }
+        changed_ids.extend(self._store_validation_results(updates))
+        self._emit_background_changed(changed_ids)
+
+    def update_validation_results(self, validation_results):
+        """Set validation results for some entries, repainting only the rows that changed"""
+        self._emit_background_changed(self._store_validation_results(validation_results))
+
+    def _store_validation_results(self, validation_results):
+        """Store results and their cell colors, returning the ids whose colors changed"""
+        changed_ids = []
+        for entry_id, result in validation_results.items():
+            self._validation_results[entry_id] = result
+            colors = self._validation_colors(result)
+            if colors != self._cell_colors.get(entry_id, {}):
+                changed_ids.append(entry_id)
+            if colors:
+                self._cell_colors[entry_id] = colors
+            else:
+                self._cell_colors.pop(entry_id, None)
+        return changed_ids
+
+    def _emit_background_changed(self, entry_ids):
+        """Emit dataChanged for the BackgroundRole of the rows of the given entries"""
+        rows = sorted(row for row in map(self.row_for_id, entry_ids) if row >= 0)
+        last_column = max(len(self._headers) - 1, 0)
+
+        # One signal per run of adjacent rows
+        start = 0
+        for i in range(1, len(rows) + 1):
+            if i == len(rows) or rows[i] != rows[i - 1] + 1:
+                self.dataChanged.emit(
+                    self.index(rows[start], 0), self.index(rows[i - 1], last_column),
+                    [Qt.BackgroundRole],
+                )
+                start = i
+
+    def _validation_colors(self, result):
+        """Background color of each column with an issue in a validation result"""
+        colors = {}
+        column_by_field = self._column_by_field
+
+        # Lowest priority first, so higher priority issues overwrite it
+        for field in result.get("missing_optional", []):
+            if field in column_by_field:
+                colors[column_by_field[field]] = self.MISSING_OPTIONAL_COLOR
+
+        for mismatch in result.get("type_mismatches", []):
+            # Mark the mismatched field and every column of a path leading to it
+            parts = mismatch["field"].split(".")
+            for end in range(1, len(parts) + 1):
+                col = column_by_field.get(".".join(parts[:end]))
+                if col is not None:
+                    colors[col] = self.TYPE_MISMATCH_COLOR
+
+        for field in result.get("missing_required", []):
+            if field in column_by_field:
+                colors[column_by_field[field]] = self.MISSING_REQUIRED_COLOR
+
+        return colors
 
     def _flatten_data(self):
         """Flatten nested data for display in table"""
-        self._flattened_data = []
-
-        for entry in self._data:
-            flattened = {}
-
-            # Always include ID
-            flattened["opendb_id"] = entry.get("opendb_id", "")
-
-            # Flatten other fields
-            for field in self._headers:
-                if field == "opendb_id":
-                    continue
-
-                if "." in field:
-                    # Handle nested fields with dot notation (e.g. "metadata.name")
-                    parts = field.split(".")
-                    value = entry
-                    for part in parts:
-                        if isinstance(value, dict) and part in value:
-                            value = value[part]
-                        else:
-                            value = ""
-                            break
-                    flattened[field] = value
-                else:
-                    # Handle top-level fields
-                    flattened[field] = entry.get(field, "")
+        self._columns = ColumnStore(self._headers, self._data)
+        self._rebuild_row_index()
 
-            self._flattened_data.append(flattened)
+    def _rebuild_row_index(self, start=0):
+        """Rebuild the opendb_id to row lookup from the given row onwards"""
+        if start == 0:
+            self._row_by_id = {}
+        for row in range(start, len(self._data)):
+            self._row_by_id[self._data[row].get("opendb_id")] = row
 
-    def data(self, index, role):
-        if not index.isValid():
-            return None
+    @staticmethod
+    def display_text(value):
+        """Text shown in a cell for a flattened value"""
+        return columns.display_text(value)
 
-        if role == Qt.DisplayRole:
-            row, col = index.row(), index.column()
-            if row >= len(self._flattened_data) or col >= len(self._headers):
-                return None
+    def _row_texts(self, row):
+        """Display text of every column of a row"""
+        store = self._columns
+        return [store.display(row, col) for col in range(len(self._headers))]
 
-            field = self._headers[col]
+    def row_id(self, row):
+        """Return the opendb_id of a row"""
+        return self._data[row].get("opendb_id", "")
 
-            # Return the value, ensuring proper string conversion with encoding handling
-            value = self._flattened_data[row].get(field, "")
+    def search_index(self):
+        """
+        Return the search index over the display text of all cells.
 
-            # Handle different types for display
-            if value is None:
-                return "null"
-            elif isinstance(value, dict):
-                return "{...}"  # Show indicator for objects
-            elif isinstance(value, list):
-                return f"[{len(value)} items]"  # Show count for arrays
-            else:
-                # Convert any non-string values to string, preserving Unicode characters
-                return str(value)
+        The index is built without holding the index lock, from a snapshot of
+        the rows, so the GUI thread can keep changing rows meanwhile. Rows
+        changed during the build are brought up to date before it is used.
+        """
+        while True:
+            with self._index_lock:
+                if self._search_index is not None:
+                    return self._search_index
+                version = self._version
+                data_generation = self._data_generation
+                paths = list(self._columns.paths)
+                rows = [(entry.get("opendb_id", ""), entry) for entry in self._data]
+
+            index = SearchIndex(len(paths))
+            texts_by_id = {}
+            for entry_id, entry in rows:
+                texts = [
+                    columns.display_text(columns.resolve_path(entry, parts)) for parts in paths
+                ]
+                index.add(entry_id, texts)
+                texts_by_id[entry_id] = texts
+
+            with self._index_lock:
+                if self._search_index is not None:
+                    return self._search_index
+                if data_generation != self._data_generation:
+                    continue  # All rows were replaced; build again from the new ones
+                for entry_id, changed in self._id_versions.items():
+                    if changed <= version:
+                        continue
+                    if entry_id in texts_by_id:
+                        index.remove(entry_id, texts_by_id[entry_id])
+                    row = self._row_by_id.get(entry_id)
+                    if row is not None:
+                        index.add(entry_id, self._row_texts(row))
+                self._search_index = index
+                return index
+
+    def search_index_supports(self, mode):
+        """Whether search_ids can answer queries in the given mode"""
+        return mode == search.QUERY or mode in SearchIndex.SUPPORTED_MODES
+
+    def parse_query(self, text):
+        """Parse a structured query over this model's fields; raises query.QueryError"""
+        return query.compile_query(text, tuple(self._headers))
+
+    def query_index(self):
+        """Return the typed field index for structured queries"""
+        with self._index_lock:
+            if self._query_index is None or self._query_index_version != self._version:
+                self._query_index = query.QueryIndex(self._data)
+                self._query_index_version = self._version
+            return self._query_index
+
+    def row_matches_query(self, row, node):
+        """Evaluate a parsed query against the typed values of one row"""
+        return 0 <= row < len(self._data) and node.matches(self._data[row])
+
+    def version(self):
+        """Counter that changes whenever a row is added, changed or removed"""
+        return self._version
+
+    def id_version(self, entry_id):
+        """Model version at which the given entry last changed"""
+        return self._id_versions.get(entry_id, 0)
+
+    def _mark_changed(self, entry_ids):
+        self._version += 1
+        for entry_id in entry_ids:
+            self._id_versions[entry_id] = self._version
+
+    def search_ids(self, term, mode, columns=None, is_cancelled=None):
+        """
+        Search the index from any thread.
 
-        elif role == Qt.BackgroundRole:
-            row, col = index.row(), index.column()
-            if row >= len(self._flattened_data) or col >= len(self._headers):
-                return None
+        Returns (version, ids) where ids is the set of matching opendb_ids as
+        of the given model version, or None if the index does not support the
+        mode or the search was cancelled. Raises re.error or query.QueryError
+        for an invalid pattern or query.
+        """
+        if mode == search.QUERY:
+            with self._index_lock:
+                node = self.parse_query(term)
+                return self._version, self.query_index().search(node)
+
+        while True:
+            # Built, if needed, before taking the lock, which then covers only the search
+            index = self.search_index()
+            with self._index_lock:
+                if index is not self._search_index:
+                    continue  # All rows were replaced meanwhile
+                if not index.supports(mode):
+                    return None
+                ids = index.search(term, mode, columns, is_cancelled)
+                if ids is None:
+                    return None
+                return self._version, ids
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Sort the rows by the typed values of a column. The new order is
+        computed from the column storage and applied in a single layout change.
+        """
+        self._resort_timer.stop()
+        self._sort_column = column
+        self._sort_order = order
+        if not 0 <= column < len(self._headers) or len(self._data) < 2:
+            return
+
+        with self._index_lock:
+            order_rows = columns.sort_order(
+                self._columns.column(column),
+                self._field_types.get(self._headers[column]),
+                descending=order == Qt.DescendingOrder,
+            )
+        if order_rows == list(range(len(order_rows))):
+            return
 
-            item_id = self._flattened_data[row].get("opendb_id")
-            field = self._headers[col]
+        self.layoutAboutToBeChanged.emit([], QAbstractItemModel.VerticalSortHint)
 
-            # No validation results available
-            if not self._validation_results:
-                return None
+        # Keep selections and other persistent indexes on the same entries
+        new_rows = [0] * len(order_rows)
+        for new_row, row in enumerate(order_rows):
+            new_rows[row] = new_row
+        old_indexes = self.persistentIndexList()
+        self.changePersistentIndexList(
+            old_indexes,
+            [self.index(new_rows[index.row()], index.column()) for index in old_indexes],
+        )
 
-            # Check validation issues for this specific field
-            if item_id in self._validation_results:
-                result = self._validation_results[item_id]
+        with self._index_lock:
+            self._data[:] = [self._data[row] for row in order_rows]
+            self._columns.rows_permuted(order_rows)
+            self._rebuild_row_index()
 
-                # Missing required field
-                if field in result.get("missing_required", []):
-                    return QColor(255, 200, 200)  # Light red
+        self.layoutChanged.emit([], QAbstractItemModel.VerticalSortHint)
 
-                # Type mismatch
-                for mismatch in result.get("type_mismatches", []):
-                    mismatch_field = mismatch["field"]
-                    # Check both exact match and field being part of a path
-                    if mismatch_field == field or mismatch_field.startswith(f"{field}."):
-                        return QColor(255, 230, 200)  # Light orange
+    def _schedule_resort(self):
+        if self._sort_column >= 0 and not self._resort_timer.isActive():
+            self._resort_timer.start()
 
-                # Missing optional field
-                if field in result.get("missing_optional", []):
-                    return QColor(255, 255, 200)  # Light yellow
+    def _resort(self):
+        self.sort(self._sort_column, self._sort_order)
 
-        elif role == Qt.FontRole:
+    def append_entries(self, entries):
+        """Append entries to the end of the model"""
+        if not entries:
+            return
+
+        start = len(self._data)
+        self.beginInsertRows(QModelIndex(), start, start + len(entries) - 1)
+        with self._index_lock:
+            self._data.extend(entries)
+            self._columns.rows_appended(start)
+            self._rebuild_row_index(start)
+            if self._search_index is not None:
+                for row in range(start, len(self._data)):
+                    self._search_index.add(self.row_id(row), self._row_texts(row))
+            self._mark_changed(entry.get("opendb_id") for entry in entries)
+        self.endInsertRows()
+        self._schedule_resort()
+
+    def row_for_id(self, entry_id):
+        """Return the row of the entry with the given opendb_id, or -1"""
+        return self._row_by_id.get(entry_id, -1)
+
+    def upsert_entry(self, entry):
+        """Replace the entry with the same opendb_id in place, or append it"""
+        row = self.row_for_id(entry.get("opendb_id"))
+        if row < 0:
+            self.append_entries([entry])
+            return
+
+        with self._index_lock:
+            if self._search_index is not None:
+                self._search_index.remove(self.row_id(row), self._row_texts(row))
+            self._data[row] = entry
+            self._columns.row_changed(row)
+            if self._search_index is not None:
+                self._search_index.add(self.row_id(row), self._row_texts(row))
+            self._mark_changed([entry.get("opendb_id")])
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, max(len(self._headers) - 1, 0))
+        )
+        self._schedule_resort()
+
+    def remove_entry(self, entry_id):
+        """Remove the entry with the given opendb_id, if present"""
+        row = self.row_for_id(entry_id)
+        if row < 0:
+            return
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        with self._index_lock:
+            if self._search_index is not None:
+                self._search_index.remove(entry_id, self._row_texts(row))
+            del self._data[row]
+            self._columns.row_removed(row)
+            del self._row_by_id[entry_id]
+            self._validation_results.pop(entry_id, None)
+            self._cell_colors.pop(entry_id, None)
+            self._rebuild_row_index(row)
+            self._mark_changed([entry_id])
+        self.endRemoveRows()
+
+    def set_entry_validation_result(self, entry_id, result):
+        """Set the validation result of a single entry and repaint its row"""
+        self.update_validation_results({entry_id: result})
+
+    def data(self, index, role):
+        if not index.isValid():
+            return None
+
+        if role == Qt.DisplayRole:
             row, col = index.row(), index.column()
-            if row >= len(self._flattened_data) or col >= len(self._headers):
+            if row >= len(self._data) or col >= len(self._headers):
                 return None
 
-            field = self._headers[col]
-            font = QFont()
+            # Display texts are cached by the column store
+            return self._columns.display(row, col)
 
+        elif role == Qt.BackgroundRole:
+            row, col = index.row(), index.column()
+            if row >= len(self._data) or col >= len(self._headers):
+                return None
+
+            # Validation issues of the cell, precomputed when results are set
+            colors = self._cell_colors.get(self.row_id(row))
+            if colors:
+                return colors.get(col)
+
+        elif role == Qt.FontRole:
             # Make required fields bold
-            if field in self._required_fields:
-                font.setBold(True)
-                return font
+            if index.column() in self._required_columns and index.row() < len(self._data):
+                return self.bold_font()
 
         return None
 
+    @classmethod
+    def bold_font(cls):
+        if cls._bold_font is None:
+            cls._bold_font = QFont()
+            cls._bold_font.setBold(True)
+        return cls._bold_font
+
     def headerData(self, section, orientation, role):
         if role == Qt.DisplayRole:
             if orientation == Qt.Horizontal and section < len(self._headers):
@@ -1887,7 +2196,7 @@ class DataTableModel(QAbstractTableModel):
         return None
 
     def rowCount(self, parent=QModelIndex()):
-        return len(self._flattened_data)
+        return len(self._data)
 
     def columnCount(self, parent=QModelIndex()):
         return len(self._headers)
@@ -1895,8 +2204,13 @@ class DataTableModel(QAbstractTableModel):
     def refresh_data(self, data):
         """Update the model with new data"""
         self.beginResetModel()
-        self._data = data
-        self._flatten_data()
+        with self._index_lock:
+            self._data = data
+            self._data_generation += 1
+            self._search_index = None
+            self._query_index = None
+            self._flatten_data()
+            self._mark_changed(entry.get("opendb_id") for entry in data)
         self.endResetModel()
 
     def get_row_data(self, row):
@@ -1906,6 +2220,337 @@ class DataTableModel(QAbstractTableModel):
         return None
 
 
+class PagedTableModel(QAbstractTableModel):
+    """
+    Model for categories too large to hold in memory, reading rows from the
+    SQLite query index in pages.
+
+    Rows are made available a page at a time through canFetchMore/fetchMore
+    as the view scrolls. Only the pages near the last one shown are kept,
+    flattened to display texts and validated when they are loaded; pages
+    further away are dropped once more than max_pages are held and read
+    again when needed. Sorting and filtering are done by the index, which
+    returns the row keys of all matches once, so pages are read by key
+    rather than sorting again for each page.
+    """
+
+    # Same cell colors and fonts as DataTableModel
+    MISSING_REQUIRED_COLOR = DataTableModel.MISSING_REQUIRED_COLOR
+    TYPE_MISMATCH_COLOR = DataTableModel.TYPE_MISMATCH_COLOR
+    MISSING_OPTIONAL_COLOR = DataTableModel.MISSING_OPTIONAL_COLOR
+    REMOVED_COLOR = QColor(150, 150, 150)
+    _validation_colors = DataTableModel._validation_colors
+    bold_font = DataTableModel.bold_font
+
+    def __init__(self, index_path, category, headers, validate=None, page_size=500,
+                 max_pages=20, parent=None):
+        super().__init__(parent)
+        self._index = SqliteIndex(index_path)
+        self._category = category
+        self._headers = headers
+        self._column_by_field = {field: col for col, field in enumerate(headers)}
+        self._parts = [columns.split_path(field) for field in headers]
+        self._required_columns = set()
+        self._field_types = {}
+        # Called with an entry to get its validation result as rows are loaded
+        self._validate = validate
+        self._page_size = page_size
+        self._max_pages = max_pages
+
+        # Current filter (a parsed query or None) and sort field
+        self._query = None
+        self._sort_field = None
+        self._descending = False
+
+        # Index row keys of the matching entries in display order, and how
+        # many rows the view has fetched
+        self._keys = array("q", self._index.keys(None, category))
+        self._row_count = min(len(self._keys), page_size)
+        # {page: {"ids", "entries", "texts", "colors"}}, most recently used last
+        self._pages = {}
+        # Entries saved or deleted (None) since the index was last synced
+        self._overrides = {}
+        self._validation_results = {}
+        self._version = 0
+
+    def close(self):
+        """Close the connection to the index"""
+        self._index.close()
+
+    def headers(self):
+        """Field path shown in each column"""
+        return list(self._headers)
+
+    def set_required_fields(self, required_fields):
+        """Set which fields are required"""
+        self._required_columns = {
+            self._column_by_field[field] for field in required_fields
+            if field in self._column_by_field
+        }
+
+    def set_field_types(self, field_types):
+        """Set the JSON schema type of each field; the index sorts by the types it was built with"""
+        self._field_types = field_types
+
+    def total_count(self):
+        """Number of entries matching the current filter"""
+        return len(self._keys)
+
+    def category_count(self):
+        """Number of entries of the category in the index"""
+        return self._index.count(None, self._category)
+
+    # Paging
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self._headers)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._row_count < len(self._keys)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self._page_size, len(self._keys) - self._row_count)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + count - 1)
+        self._row_count += count
+        self.endInsertRows()
+
+    def _page(self, page):
+        """The rows of a page, read from the index if not held"""
+        cached = self._pages.pop(page, None)
+        if cached is None:
+            cached = self._load_page(page)
+            # Keep the pages closest to this one
+            while len(self._pages) >= self._max_pages:
+                farthest = max(self._pages, key=lambda held: abs(held - page))
+                del self._pages[farthest]
+        self._pages[page] = cached
+        return cached
+
+    def _load_page(self, page):
+        start = page * self._page_size
+        keys = self._keys[start:start + self._page_size]
+        results = self._index.get_rows(keys)
+        rows = {"ids": [], "entries": [], "texts": [], "colors": []}
+        for key in keys:
+            # Gone from the index since the keys were read; shown empty until refreshed
+            _, entry = results.get(key, (None, {}))
+            entry_id = entry.get("opendb_id", "")
+            entry = self._overrides.get(entry_id) or entry
+            rows["ids"].append(entry_id)
+            rows["entries"].append(entry)
+            self._fill_row(rows, len(rows["ids"]) - 1, entry)
+        return rows
+
+    def _fill_row(self, rows, offset, entry):
+        """Flatten an entry into the display texts and cell colors of a row"""
+        texts = [
+            columns.display_text(columns.resolve_path(entry, parts)) for parts in self._parts
+        ]
+        entry_id = entry.get("opendb_id")
+        result = self._validation_results.get(entry_id)
+        if result is None and self._validate is not None and entry_id:
+            result = self._validate(entry)
+        colors = self._validation_colors(result) if result else {}
+        if offset < len(rows["texts"]):
+            rows["texts"][offset] = texts
+            rows["colors"][offset] = colors
+        else:
+            rows["texts"].append(texts)
+            rows["colors"].append(colors)
+
+    def _cell(self, row):
+        """(page rows, offset) of a row, or (None, -1) past the end of the index"""
+        page, offset = divmod(row, self._page_size)
+        rows = self._page(page)
+        if offset >= len(rows["ids"]):
+            return None, -1
+        return rows, offset
+
+    def data(self, index, role):
+        if not index.isValid() or index.row() >= self._row_count:
+            return None
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            rows, offset = self._cell(index.row())
+            if rows is not None and col < len(self._headers):
+                return rows["texts"][offset][col]
+
+        elif role == Qt.BackgroundRole:
+            rows, offset = self._cell(index.row())
+            if rows is not None:
+                return rows["colors"][offset].get(col)
+
+        elif role == Qt.ForegroundRole:
+            # Deleted rows stay until the index is synced
+            rows, offset = self._cell(index.row())
+            if rows is not None and self._overrides.get(rows["ids"][offset], 0) is None:
+                return self.REMOVED_COLOR
+
+        elif role == Qt.FontRole:
+            if col in self._required_columns:
+                return self.bold_font()
+
+        return None
+
+    def headerData(self, section, orientation, role):
+        if role == Qt.DisplayRole:
+            if orientation == Qt.Horizontal and section < len(self._headers):
+                return self._headers[section]
+            else:
+                return str(section + 1)
+        return None
+
+    # Filter, sort and refresh
+
+    def set_query(self, node):
+        """Show only the entries matching a parsed query, or all for None"""
+        self._query = node
+        self._reset()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort by the typed values of a column, as indexed"""
+        field = self._headers[column] if 0 <= column < len(self._headers) else None
+        descending = order == Qt.DescendingOrder
+        if (field, descending) == (self._sort_field, self._descending):
+            return
+        self._sort_field = field
+        self._descending = descending
+        self._reset()
+
+    def _reset(self):
+        self.beginResetModel()
+        self._pages = {}
+        self._keys = self._read_keys()
+        self._row_count = min(len(self._keys), self._page_size)
+        self._version += 1
+        self.endResetModel()
+
+    def _read_keys(self):
+        return array("q", self._index.keys(
+            self._query, self._category, self._sort_field, self._descending
+        ))
+
+    def refresh(self):
+        """Show the current content of the index after it was synced"""
+        # Saves and deletes that reached the index no longer need overriding
+        current = self._index.get_entries(self._category, self._overrides)
+        for entry_id, entry in list(self._overrides.items()):
+            if current.get(entry_id) == entry:
+                del self._overrides[entry_id]
+        self._validation_results = {
+            entry_id: result for entry_id, result in self._validation_results.items()
+            if entry_id in self._overrides
+        }
+
+        keys = self._read_keys()
+        total = len(keys)
+        row_count = min(max(self._row_count, self._page_size), total)
+        if row_count < self._row_count:
+            self.beginRemoveRows(QModelIndex(), row_count, self._row_count - 1)
+            self._row_count = row_count
+            self.endRemoveRows()
+        self._keys = keys
+        self._pages = {}
+        self._version += 1
+        if row_count > self._row_count:
+            self.beginInsertRows(QModelIndex(), self._row_count, row_count - 1)
+            self._row_count = row_count
+            self.endInsertRows()
+        if self._row_count:
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self._row_count - 1, max(len(self._headers) - 1, 0)),
+            )
+
+    # Access by row and id, as in DataTableModel
+
+    def version(self):
+        """Counter that changes whenever the shown rows change"""
+        return self._version
+
+    def row_id(self, row):
+        """Return the opendb_id of a row"""
+        rows, offset = self._cell(row)
+        return rows["ids"][offset] if rows is not None else ""
+
+    def row_for_id(self, entry_id):
+        """Return the row of the entry with the given opendb_id among the held pages, or -1"""
+        for page, rows in self._pages.items():
+            if entry_id in rows["ids"]:
+                return page * self._page_size + rows["ids"].index(entry_id)
+        return -1
+
+    def get_row_data(self, row):
+        """Get the data for a specific row"""
+        if not 0 <= row < self._row_count:
+            return None
+        rows, offset = self._cell(row)
+        return rows["entries"][offset].copy() if rows is not None else None
+
+    def search_index_supports(self, mode):
+        """Searches are applied with set_query rather than through the proxy"""
+        return False
+
+    def parse_query(self, text):
+        """Parse a structured query over this model's fields; raises query.QueryError"""
+        return query.compile_query(text, tuple(self._headers))
+
+    def upsert_entry(self, entry):
+        """Show a saved entry in its row; new entries appear once the index is synced"""
+        entry_id = entry.get("opendb_id")
+        self._overrides[entry_id] = entry
+        self._validation_results.pop(entry_id, None)
+        self._update_row(entry_id)
+
+    def remove_entry(self, entry_id):
+        """Grey out a deleted entry until the index is synced"""
+        self._overrides[entry_id] = None
+        self._update_row(entry_id)
+
+    def _update_row(self, entry_id):
+        row = self.row_for_id(entry_id)
+        if row < 0:
+            return
+        rows, offset = self._cell(row)
+        entry = self._overrides.get(entry_id)
+        if entry is not None:
+            rows["entries"][offset] = entry
+            self._fill_row(rows, offset, entry)
+        self._version += 1
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, max(len(self._headers) - 1, 0))
+        )
+
+    def set_validation_results(self, validation_results):
+        """Set validation results; rows not given are validated as they are loaded"""
+        self._validation_results = dict(validation_results)
+        self._pages = {}
+        if self._row_count:
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self._row_count - 1, max(len(self._headers) - 1, 0)),
+                [Qt.BackgroundRole],
+            )
+
+    def update_validation_results(self, validation_results):
+        """Set validation results for some entries"""
+        self._validation_results.update(validation_results)
+        for entry_id in validation_results:
+            self._update_row(entry_id)
+
+    def set_entry_validation_result(self, entry_id, result):
+        """Set the validation result of a single entry and repaint its row"""
+        self.update_validation_results({entry_id: result})
+
+
 class AdvancedFilterProxyModel(QSortFilterProxyModel):
     """
     Enhanced filter proxy model with support for different search modes:
@@ -1914,36 +2559,114 @@ class AdvancedFilterProxyModel(QSortFilterProxyModel):
     - Starts With
     - Ends With
     - Regular Expression
+    - Query (structured field predicates, see opendb_core.query)
     """
     
     # Search mode constants
-    CONTAINS = 0
-    EXACT = 1
-    STARTS_WITH = 2
-    ENDS_WITH = 3
-    REGEX = 4
+    CONTAINS = search.CONTAINS
+    EXACT = search.EXACT
+    STARTS_WITH = search.STARTS_WITH
+    ENDS_WITH = search.ENDS_WITH
+    REGEX = search.REGEX
+    QUERY = search.QUERY
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.search_mode = self.CONTAINS
         self.search_columns = []  # If empty, search all columns
+        # Ids accepted by the current query, looked up in the source model's search index
+        self._accepted_key = None
+        self._accepted_ids = None
+        self._accepted_version = 0
+        # Sorting is done by the source model on typed values; the proxy keeps its order
+        self._source_sort_column = -1
+        self._source_sort_order = Qt.AscendingOrder
         
-    def setSearchMode(self, mode):
+    def setSearchMode(self, mode, invalidate=True):
         """Set the search mode"""
         self.search_mode = mode
-        self.invalidateFilter()
+        if invalidate:
+            self.invalidateFilter()
         
-    def setSearchColumns(self, columns):
+    def setSearchColumns(self, columns, invalidate=True):
         """Set which columns to search in (empty list means all columns)"""
         self.search_columns = columns
-        self.invalidateFilter()
+        if invalidate:
+            self.invalidateFilter()
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        if model is not None and self._source_sort_column >= 0:
+            model.sort(self._source_sort_column, self._source_sort_order)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort by typed values in the source model instead of comparing display strings"""
+        self._source_sort_column = column
+        self._source_sort_order = order
+        super().sort(-1, order)
+        if self.sourceModel() is not None:
+            self.sourceModel().sort(column, order)
+
+    def search_key(self, search_term):
+        """Identifies a query against the current source model"""
+        return (search_term, self.search_mode, tuple(self.search_columns), id(self.sourceModel()))
+
+    def set_search_result(self, key, version, ids):
+        """Use ids computed elsewhere (e.g. on a worker thread) for the query key"""
+        self._accepted_key = key
+        self._accepted_version = version
+        self._accepted_ids = ids
         
+    def accepted_ids(self, search_term):
+        """
+        Ids of the source rows matching search_term, answered from the source
+        model's search index, or None if the index can't answer this query
+        """
+        source = self.sourceModel()
+        if not hasattr(source, "search_ids"):
+            return None
+
+        key = self.search_key(search_term)
+        if key != self._accepted_key:
+            try:
+                result = source.search_ids(search_term, self.search_mode, self.search_columns)
+            except (re.error, query.QueryError):
+                # Invalid regular expression or query: nothing matches
+                result = (source.version(), set())
+            if result is None:
+                return None
+            self.set_search_result(key, *result)
+        return self._accepted_ids
+
     def filterAcceptsRow(self, source_row, source_parent):
         """Override to implement custom filtering logic"""
         # If filter is empty, accept all rows
-        if not self.filterRegExp().pattern():
+        search_term = self.filterRegExp().pattern()
+        if not search_term:
             return True
-            
+
+        # Answer from the search index when the mode allows it
+        accepted = self.accepted_ids(search_term)
+        if accepted is not None:
+            source = self.sourceModel()
+            row_id = source.row_id(source_row)
+            # Rows changed after the search ran are checked directly
+            if source.id_version(row_id) <= self._accepted_version:
+                return row_id in accepted
+
+        return self.row_matches(source_row, source_parent, search_term)
+
+    def row_matches(self, source_row, source_parent, search_term):
+        """Check the cells of one row against search_term"""
+        if self.search_mode == self.QUERY:
+            # Queries look at typed values rather than cell text
+            source = self.sourceModel()
+            try:
+                node = source.parse_query(search_term)
+            except query.QueryError:
+                return False
+            return source.row_matches_query(source_row, node)
+
         # If specific columns are set, only search in those columns
         if self.search_columns:
             columns_to_search = self.search_columns
@@ -1961,7 +2684,6 @@ class AdvancedFilterProxyModel(QSortFilterProxyModel):
                 continue
                 
             text = str(data)
-            search_term = self.filterRegExp().pattern()
             
             # Apply the appropriate search mode
             if self.search_mode == self.CONTAINS:
@@ -1977,187 +2699,211 @@ class AdvancedFilterProxyModel(QSortFilterProxyModel):
                 if text.lower().endswith(search_term.lower()):
                     return True
             elif self.search_mode == self.REGEX:
+                # Compiled once per pattern; invalid patterns are rejected before filtering
                 try:
-                    regex = QRegularExpression(search_term)
-                    if regex.match(text).hasMatch():
-                        return True
-                except:
-                    # If regex is invalid, fall back to contains
-                    if search_term.lower() in text.lower():
-                        return True
+                    regex = search.compile_regex(search_term)
+                except re.error:
+                    return False
+                if regex.search(text):
+                    return True
                     
         return False
 
 
-class SchemaHelper:
-    """Helper class for working with JSON schema"""
+class SearchWorker(QThread):
+    """Runs a table search against the model's search index in the background"""
 
-    @staticmethod
-    def get_all_properties(schema, prefix=""):
-        """Get all properties from a schema including nested ones"""
-        properties = []
+    search_finished = pyqtSignal(int, object)
 
-        if not schema or not isinstance(schema, dict):
-            return properties
+    def __init__(self, model, search_term, mode, columns, generation, index_path=None,
+                 category=None, index_version=None, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.search_term = search_term
+        self.mode = mode
+        self.columns = list(columns)
+        self.generation = generation
+        # SQLite index that answers queries, in sync with the model as of index_version
+        self.index_path = index_path
+        self.category = category
+        self.index_version = index_version
+        self._cancelled = False
+
+    def cancel(self):
+        """Request the worker to stop; its result will not be delivered"""
+        self._cancelled = True
+
+    def run(self):
+        result = None
+        if self.mode == search.QUERY and self.index_path is not None:
+            result = self.search_sql_index()
+        if result is None:
+            result = self.model.search_ids(
+                self.search_term, self.mode, self.columns, lambda: self._cancelled
+            )
+        if not self._cancelled:
+            # result is (version, ids), or None if the index can't answer the query
+            self.search_finished.emit(self.generation, result)
 
-        schema_properties = schema.get("properties", {})
+    def search_sql_index(self):
+        """
+        Evaluate a query in the SQLite index. Rows changed after index_version
+        are checked against the model by the proxy. Returns None on failure.
+        """
+        node = self.model.parse_query(self.search_term)
+        try:
+            with SqliteIndex(self.index_path) as index:
+                return self.index_version, set(index.ids(node, self.category))
+        except sqlite3.Error:
+            return None
 
-        for prop_name, prop_data in schema_properties.items():
-            # Skip opendb_id for display
-            if prop_name == "opendb_id":
-                continue
 
-            # Add the property itself
-            prop_path = f"{prefix}{prop_name}" if prefix else prop_name
-            properties.append(prop_path)
+class SaveQueueSignals(QObject):
+    """Delivers SaveQueue callbacks from its background thread to the GUI thread"""
 
-            # Check if this is an object with nested properties
-            prop_type = prop_data.get("type")
+    pending_changed = pyqtSignal(int)
+    flushed = pyqtSignal(int)
+    failed = pyqtSignal(str)
 
-            # Handle type that could be a list like ["object", "null"]
-            if isinstance(prop_type, list):
-                prop_type = next((t for t in prop_type if t != "null"), None)
 
-            if prop_type == "object" and "properties" in prop_data:
-                # Add nested properties with dot notation
-                nested_prefix = f"{prop_path}."
-                nested_props = SchemaHelper.get_all_properties(prop_data, nested_prefix)
-                properties.extend(nested_props)
+class CategoryLoadWorker(QThread):
+    """Loads a category in the background and streams the entries in chunks"""
 
-        return properties
+    chunk_loaded = pyqtSignal(list)
+    progress = pyqtSignal(int, int)
+    loading_finished = pyqtSignal(list, bool)
 
-    @staticmethod
-    def get_required_fields(schema, prefix=""):
-        """Get all required fields including nested ones with dot notation"""
-        required = []
+    def __init__(self, repository, category, chunk_size=250, parent=None):
+        super().__init__(parent)
+        self.repository = repository
+        self.category = category
+        self.chunk_size = chunk_size
+        # Stats of the files being loaded, the baseline for watching the category
+        self.file_stats = None
+        # {filename: opendb_id} of the loaded entries
+        self.entry_ids = {}
+        self._cancelled = False
+
+    def cancel(self):
+        """Request the worker to stop after the current chunk"""
+        self._cancelled = True
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def run(self):
+        errors = []
+        try:
+            self.file_stats = self.repository.scan_category(self.category)
+            chunks = self.repository.iter_category_chunks(
+                self.category, self.chunk_size, self.file_stats, self.entry_ids
+            )
+        except Exception as e:
+            self.loading_finished.emit([(self.category, str(e))], self._cancelled)
+            return
 
-        if not schema or not isinstance(schema, dict):
-            return required
+        try:
+            for entries, chunk_errors, done, total in chunks:
+                if self._cancelled:
+                    break
+                errors.extend(chunk_errors)
+                if entries:
+                    self.chunk_loaded.emit(entries)
+                self.progress.emit(done, total)
+        except Exception as e:
+            errors.append((self.category, str(e)))
+        finally:
+            chunks.close()
 
-        # Get top-level required fields
-        for field in schema.get("required", []):
-            if field != "opendb_id":  # Skip ID field
-                field_path = f"{prefix}{field}" if prefix else field
-                required.append(field_path)
+        self.loading_finished.emit(errors, self._cancelled)
 
-        # Check for required fields in nested objects
-        for prop_name, prop_data in schema.get("properties", {}).items():
-            prop_type = prop_data.get("type")
 
-            # Handle type that could be a list like ["object", "null"]
-            if isinstance(prop_type, list):
-                prop_type = next((t for t in prop_type if t != "null"), None)
+class CategoryChangesWorker(QThread):
+    """Reads the entry files of a category that changed since the last scan"""
 
-            if prop_type == "object" and "properties" in prop_data:
-                # Add nested required fields with dot notation
-                nested_prefix = f"{prefix}{prop_name}." if prefix else f"{prop_name}."
-                nested_required = SchemaHelper.get_required_fields(prop_data, nested_prefix)
-                required.extend(nested_required)
+    # category, new file stats, (filename, entry) of updated files, removed file names, errors
+    changes_found = pyqtSignal(str, dict, list, list, list)
 
-        return required
+    def __init__(self, repository, category, known_stats, parent=None):
+        super().__init__(parent)
+        self.repository = repository
+        self.category = category
+        self.known_stats = known_stats
 
-    @staticmethod
-    def validate_entry(entry_data, schema):
-        """Validate a single entry against the schema, handling nested structures"""
-        validator = Draft7Validator(schema)
-        errors = sorted(validator.iter_errors(entry_data), key=lambda e: e.path)
-
-        results = {
-            "is_valid": len(errors) == 0,
-            "errors": [],
-            "missing_required": [],
-            "missing_optional": [],
-            "type_mismatches": [],
-        }
+    def run(self):
+        try:
+            stats, updated, removed, errors = self.repository.read_category_changes(
+                self.category, self.known_stats
+            )
+        except Exception as e:
+            stats, updated, removed, errors = self.known_stats, [], [], [(self.category, str(e))]
+        self.changes_found.emit(self.category, stats, updated, removed, errors)
 
-        # Get all properties and required fields, including nested ones
-        all_fields = SchemaHelper.get_all_properties(schema)
-        required_fields = SchemaHelper.get_required_fields(schema)
-        optional_fields = [f for f in all_fields if f not in required_fields]
 
-        # Check for each error from the validator
-        for error in errors:
-            results["errors"].append(str(error))
+class IndexSyncWorker(QThread):
+    """Brings the SQLite query index of a category up to date with its files"""
 
-            # Handle missing required properties
-            if error.validator == "required":
-                parent_path = [str(p) for p in error.path]
-                parent_prefix = ".".join(parent_path)
-                parent_prefix = f"{parent_prefix}." if parent_prefix else ""
+    # category, number of files indexed again or removed, errors
+    index_synced = pyqtSignal(str, int, list)
 
-                for missing in error.validator_value:
-                    # Skip opendb_id
-                    if missing == "opendb_id":
-                        continue
+    def __init__(self, index_path, repository, category, schema, model, model_version,
+                 parent=None):
+        super().__init__(parent)
+        self.index_path = index_path
+        self.repository = repository
+        self.category = category
+        self.schema = schema
+        # The model matches the files as of model_version, or None if unknown
+        self.model = model
+        self.model_version = model_version
 
-                    # Create the full path to the missing field
-                    missing_path = f"{parent_prefix}{missing}"
+    def run(self):
+        try:
+            with SqliteIndex(self.index_path) as index:
+                changed, errors = index.sync(self.repository, self.category, self.schema)
+        except (sqlite3.Error, OSError) as e:
+            self.model_version = None
+            changed, errors = 0, [(self.index_path, str(e))]
+        self.index_synced.emit(self.category, changed, errors)
 
-                    # Check if this is a required field
-                    if missing_path in required_fields:
-                        results["missing_required"].append(missing_path)
-                    else:
-                        results["missing_optional"].append(missing_path)
-
-            # Handle type mismatches
-            elif error.validator == "type":
-                path = ".".join(str(p) for p in error.path)
-                expected = error.validator_value
-                actual = type(error.instance).__name__
-                results["type_mismatches"].append({
-                    "field": path,
-                    "expected": expected,
-                    "actual": actual,
-                    "value": error.instance,
-                })
-
-        # Check for empty values in required fields
-        for field in required_fields:
-            # Get the field value using dot notation
-            parts = field.split(".")
-            value = entry_data
-            valid_path = True
-
-            for part in parts:
-                if isinstance(value, dict) and part in value:
-                    value = value[part]
-                else:
-                    valid_path = False
-                    break
 
-            if valid_path:
-                # Check for empty strings or null values
-                if isinstance(value, str) and value.strip() == "":
-                    if field not in results["missing_required"]:
-                        results["missing_required"].append(field)
-                elif value is None:
-                    if field not in results["missing_required"]:
-                        results["missing_required"].append(field)
-
-        # Check for missing optional fields
-        for field in optional_fields:
-            # Get the field value using dot notation
-            parts = field.split(".")
-            value = entry_data
-            valid_path = True
-
-            for part in parts:
-                if isinstance(value, dict) and part in value:
-                    value = value[part]
-                else:
-                    valid_path = False
-                    break
+class ValidationWorker(QThread):
+    """Runs a ValidationEngine pass in the background"""
+
+    progress = pyqtSignal(int, int)
+    # Results of each shard as it completes, so the table can show them right away
+    results_ready = pyqtSignal(dict)
+    validation_finished = pyqtSignal(dict, bool)
+    # Emitted instead of validation_finished when the pass fails
+    validation_failed = pyqtSignal(str)
+
+    def __init__(self, engine, schema, entries, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.schema = schema
+        self.entries = list(entries)
+        self._cancelled = False
+
+    def cancel(self):
+        """Request the worker to stop after the current shard"""
+        self._cancelled = True
 
-            if not valid_path or value is None:
-                results["missing_optional"].append(field)
-            elif isinstance(value, str) and value.strip() == "":
-                results["missing_optional"].append(field)
+    def run(self):
+        merged = {}
+        try:
+            for results, done, total in self.engine.iter_validate(
+                self.schema, self.entries, lambda: self._cancelled
+            ):
+                merged.update(results)
+                if results:
+                    self.results_ready.emit(results)
+                self.progress.emit(done, total)
+        except Exception as e:
+            self.validation_failed.emit(str(e))
+            return
 
-        # Update is_valid based on our findings
-        if results["missing_required"] or results["type_mismatches"]:
-            results["is_valid"] = False
+        self.validation_finished.emit(merged, self._cancelled)
 
-        return results
 
 class JsonSyntaxHighlighter(QSyntaxHighlighter):
     """Syntax highlighter for JSON in a QTextEdit"""
@@ -2915,7 +3661,7 @@ class SchemaEditor(ThemedDialog):
         if index == 0:  # GUI Editor
             # Update GUI editor from JSON
             try:
-                schema_data = json.loads(self.json_editor.toPlainText())
+                schema_data = jsoncodec.loads(self.json_editor.toPlainText())
                 self.update_gui_from_json(schema_data)
             except json.JSONDecodeError:
                 QMessageBox.warning(
@@ -3123,7 +3869,7 @@ class SchemaEditor(ThemedDialog):
                 schema_data = self.get_schema_from_gui()
             else:  # JSON Editor
                 schema_json = self.json_editor.toPlainText()
-                schema_data = json.loads(schema_json)
+                schema_data = jsoncodec.loads(schema_json)
 
             # Check schema name
             schema_name = self.name_input.text().strip()
@@ -3250,6 +3996,78 @@ class SettingsDialog(ThemedDialog):
         paths_group.setLayout(paths_layout)
         layout.addWidget(paths_group)
 
+        # Performance group
+        performance_group = QGroupBox("Performance")
+        performance_layout = QFormLayout()
+
+        # Number of threads used to read entry files
+        self.loader_workers_spin = QSpinBox()
+        self.loader_workers_spin.setRange(1, 64)
+        self.loader_workers_spin.setValue(
+            int(self.settings.value("loader_workers", default_loader_workers()))
+        )
+
+        # Persistent cache of parsed entries
+        self.entry_cache_check = QCheckBox("Cache parsed entries between sessions")
+        self.entry_cache_check.setChecked(
+            str(self.settings.value("entry_cache", "true")).lower() == "true"
+        )
+
+        # Packed snapshot per category, read instead of the entry files when fresh
+        self.category_snapshot_check = QCheckBox(
+            "Keep a packed snapshot of each category (faster loads on network drives)"
+        )
+        self.category_snapshot_check.setChecked(
+            str(self.settings.value("category_snapshots", "false")).lower() == "true"
+        )
+
+        # SQLite index that answers queries
+        self.query_index_check = QCheckBox("Keep a SQLite index for queries")
+        self.query_index_check.setChecked(
+            str(self.settings.value("query_index", "false")).lower() == "true"
+        )
+
+        # Number of processes used by Validate All
+        self.validation_workers_spin = QSpinBox()
+        self.validation_workers_spin.setRange(1, 128)
+        self.validation_workers_spin.setValue(
+            int(self.settings.value("validation_workers", os.cpu_count() or 1))
+        )
+
+        performance_layout.addRow("Loader Threads:", self.loader_workers_spin)
+        performance_layout.addRow("Validation Processes:", self.validation_workers_spin)
+        performance_layout.addRow("", self.entry_cache_check)
+        performance_layout.addRow("", self.category_snapshot_check)
+        performance_layout.addRow("", self.query_index_check)
+
+        # Categories this large are browsed page by page from the query index
+        self.paged_threshold_spin = QSpinBox()
+        self.paged_threshold_spin.setRange(1000, 100000000)
+        self.paged_threshold_spin.setSingleStep(10000)
+        self.paged_threshold_spin.setSuffix(" entries")
+        self.paged_threshold_spin.setValue(int(self.settings.value("paged_threshold", 50000)))
+        self.paged_threshold_spin.setToolTip(
+            "Categories with at least this many entries are read from the query index "
+            "as you scroll instead of being loaded into memory"
+        )
+        performance_layout.addRow("Page Categories From:", self.paged_threshold_spin)
+
+        # Persistent cache of validation results
+        self.validation_cache_check = QCheckBox("Cache validation results between sessions")
+        self.validation_cache_check.setChecked(
+            str(self.settings.value("validation_cache", "true")).lower() == "true"
+        )
+        performance_layout.addRow("", self.validation_cache_check)
+
+        # Sync saved files to disk before a save counts as done
+        self.sync_writes_check = QCheckBox("Sync saved files to disk")
+        self.sync_writes_check.setChecked(
+            str(self.settings.value("sync_writes", "true")).lower() == "true"
+        )
+        performance_layout.addRow("", self.sync_writes_check)
+        performance_group.setLayout(performance_layout)
+        layout.addWidget(performance_group)
+
         # Add buttons
         button_layout = QHBoxLayout()
         self.save_button = QPushButton("Save Settings")
@@ -3286,6 +4104,14 @@ class SettingsDialog(ThemedDialog):
             "theme": "dark" if self.dark_radio.isChecked() else "light",
             "schema_dir": self.schema_path.text(),
             "data_dir": self.data_path.text(),
+            "loader_workers": self.loader_workers_spin.value(),
+            "entry_cache": self.entry_cache_check.isChecked(),
+            "category_snapshots": self.category_snapshot_check.isChecked(),
+            "query_index": self.query_index_check.isChecked(),
+            "paged_threshold": self.paged_threshold_spin.value(),
+            "validation_workers": self.validation_workers_spin.value(),
+            "validation_cache": self.validation_cache_check.isChecked(),
+            "sync_writes": self.sync_writes_check.isChecked(),
         }
 
 def apply_window_theme(window, dark_mode=False):
@@ -3329,6 +4155,68 @@ class MainWindow(QMainWindow):
         self.current_category = None
         self.schemas = {}
         self.data = {}
+        self.load_worker = None
+        self.validation_worker = None
+        self.search_worker = None
+        self.search_generation = 0
+        # Cancelled search workers that are still finishing
+        self.stale_search_workers = []
+        self.repository = Repository(
+            DATA_DIR,
+            SCHEMA_DIR,
+            CACHE_DIR if self.use_entry_cache() else None,
+            self.loader_workers(),
+            self.sync_writes(),
+            self.snapshot_dir(),
+        )
+        # Saves and deletes are written to disk in the background
+        self.save_error = None  # Last failed write, until a batch is written again
+        self.save_signals = SaveQueueSignals(self)
+        self.save_signals.pending_changed.connect(self.on_save_pending_changed)
+        self.save_signals.flushed.connect(self.on_save_flushed)
+        self.save_signals.failed.connect(self.on_save_failed)
+        self.save_queue = SaveQueue(
+            self.repository,
+            on_pending=self.save_signals.pending_changed.emit,
+            on_flushed=self.save_signals.flushed.emit,
+            on_error=lambda e: self.save_signals.failed.emit(str(e)),
+        )
+        self.validation_engine = ValidationEngine(
+            int(self.settings.value("validation_workers", os.cpu_count() or 1)),
+            cache_path=self.validation_cache_path(),
+        )
+
+        # Apply changes made to the open-db tree by other programs
+        self.file_stats = None  # Stats of the current category's files when last read
+        # opendb_id in each file of the current category, as rows are keyed by id
+        self.file_entry_ids = {}
+        self.schema_stats = {}
+        self.watched_category_dir = None
+        self.changes_worker = None
+        self.fs_watcher = QFileSystemWatcher(self)
+        self.fs_watcher.directoryChanged.connect(self.on_directory_changed)
+        # Schema files are few, so in-place edits are watched too
+        self.fs_watcher.fileChanged.connect(self.on_schema_file_changed)
+        if SCHEMA_DIR.is_dir():
+            self.fs_watcher.addPath(str(SCHEMA_DIR))
+
+        # SQLite query index, synced in the background after loads and writes
+        self.index_sync_worker = None
+        self.index_version = None  # Model version the index is known to match
+        self.index_sync_timer = QTimer(self)
+        self.index_sync_timer.setSingleShot(True)
+        self.index_sync_timer.setInterval(1000)
+        self.index_sync_timer.timeout.connect(self.start_index_sync)
+
+        # Wait for bursts of changes, like a git checkout, to settle
+        self.data_watch_timer = QTimer(self)
+        self.data_watch_timer.setSingleShot(True)
+        self.data_watch_timer.setInterval(500)
+        self.data_watch_timer.timeout.connect(self.check_category_changes)
+        self.schema_watch_timer = QTimer(self)
+        self.schema_watch_timer.setSingleShot(True)
+        self.schema_watch_timer.setInterval(500)
+        self.schema_watch_timer.timeout.connect(self.check_schema_changes)
 
         self.init_ui()
         self.apply_theme()
@@ -3359,6 +4247,12 @@ class MainWindow(QMainWindow):
         self.search_box = QLineEdit()
         self.search_box.setPlaceholderText("Search by name or ID...")
         self.search_box.textChanged.connect(self.on_search_changed)
+
+        # Wait for a pause in typing before searching
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.start_search)
         
         # Search mode dropdown
         self.search_mode_combo = QComboBox()
@@ -3367,6 +4261,7 @@ class MainWindow(QMainWindow):
         self.search_mode_combo.addItem("Starts With", AdvancedFilterProxyModel.STARTS_WITH)
         self.search_mode_combo.addItem("Ends With", AdvancedFilterProxyModel.ENDS_WITH)
         self.search_mode_combo.addItem("Regex", AdvancedFilterProxyModel.REGEX)
+        self.search_mode_combo.addItem("Query", AdvancedFilterProxyModel.QUERY)
         self.search_mode_combo.currentIndexChanged.connect(self.on_search_mode_changed)
         
         # Search column dropdown - will be populated when a category is selected
@@ -3491,6 +4386,22 @@ class MainWindow(QMainWindow):
         legend_widget.setLayout(legend_layout)
         self.status_bar.addPermanentWidget(legend_widget)
 
+        # Progress indicator for background category loading
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(200)
+        self.load_progress.setTextVisible(True)
+        self.load_progress.hide()
+        self.status_bar.addPermanentWidget(self.load_progress)
+
+        self.cancel_load_button = QPushButton("Cancel")
+        self.cancel_load_button.clicked.connect(self.on_cancel_clicked)
+        self.cancel_load_button.hide()
+        self.status_bar.addPermanentWidget(self.cancel_load_button)
+
+        # Changes still waiting to be written to disk
+        self.save_status_label = QLabel("")
+        self.status_bar.addPermanentWidget(self.save_status_label)
+
     def create_menu_bar(self):
         """Create the application menu bar"""
         menubar = self.menuBar()
@@ -3609,6 +4520,51 @@ class MainWindow(QMainWindow):
         # Store current theme in class variable for dialogs to access
         self.is_dark_mode = is_dark
 
+    def loader_workers(self):
+        """Number of threads used to load category files"""
+        return int(self.settings.value("loader_workers", default_loader_workers()))
+
+    def use_entry_cache(self):
+        """Whether parsed entries are cached on disk between loads"""
+        return str(self.settings.value("entry_cache", "true")).lower() == "true"
+
+    def snapshot_dir(self):
+        """Directory of the packed category snapshots, or None when they are disabled"""
+        if str(self.settings.value("category_snapshots", "false")).lower() != "true":
+            return None
+        return CACHE_DIR / "snapshots"
+
+    def query_index_path(self):
+        """Path of the SQLite query index, or None when it is disabled"""
+        if str(self.settings.value("query_index", "false")).lower() != "true":
+            return None
+        return CACHE_DIR / "query_index.sqlite"
+
+    def paged_threshold(self):
+        """Number of entry files from which a category is browsed page by page"""
+        return int(self.settings.value("paged_threshold", 50000))
+
+    def use_paged_model(self, category):
+        """Whether a category is too large to load and is browsed from the query index"""
+        return (
+            self.query_index_path() is not None
+            and self.repository.count_category_files(category) >= self.paged_threshold()
+        )
+
+    def is_paged(self):
+        """Whether the current category is browsed page by page"""
+        return isinstance(self.table_model, PagedTableModel)
+
+    def sync_writes(self):
+        """Whether saved files are synced to disk before a save completes"""
+        return str(self.settings.value("sync_writes", "true")).lower() == "true"
+
+    def validation_cache_path(self):
+        """Path of the validation result cache, or None when it is disabled"""
+        if str(self.settings.value("validation_cache", "true")).lower() != "true":
+            return None
+        return CACHE_DIR / "validation.sqlite"
+
     def show_settings(self):
         """Show settings dialog"""
         dialog = SettingsDialog(self.settings, self)
@@ -3620,6 +4576,25 @@ class MainWindow(QMainWindow):
             self.settings.setValue("theme", new_settings["theme"])
             self.settings.setValue("schema_dir", new_settings["schema_dir"])
             self.settings.setValue("data_dir", new_settings["data_dir"])
+            self.settings.setValue("loader_workers", new_settings["loader_workers"])
+            self.settings.setValue("entry_cache", new_settings["entry_cache"])
+            self.repository.max_workers = self.loader_workers()
+            self.repository.cache_dir = CACHE_DIR if self.use_entry_cache() else None
+            self.settings.setValue("category_snapshots", new_settings["category_snapshots"])
+            self.repository.snapshot_dir = self.snapshot_dir()
+            self.settings.setValue("query_index", new_settings["query_index"])
+            self.settings.setValue("paged_threshold", new_settings["paged_threshold"])
+            self.index_version = None
+            self.schedule_index_sync()
+            self.settings.setValue("sync_writes", new_settings["sync_writes"])
+            self.repository.fsync = self.sync_writes()
+            self.settings.setValue("validation_workers", new_settings["validation_workers"])
+
+            # Restart the validation processes with the new worker count
+            self.validation_engine.shutdown()
+            self.validation_engine.max_workers = new_settings["validation_workers"]
+            self.settings.setValue("validation_cache", new_settings["validation_cache"])
+            self.validation_engine.cache_path = self.validation_cache_path()
 
             # Apply theme
             self.apply_theme()
@@ -3666,8 +4641,7 @@ class MainWindow(QMainWindow):
             schema_data = schema_result["data"]
 
             # Check if schema already exists
-            schema_path = SCHEMA_DIR / f"{schema_name}.schema.json"
-            if schema_path.exists():
+            if self.repository.schema_path(schema_name).exists():
                 confirm = QMessageBox.question(
                     self,
                     "Schema Exists",
@@ -3679,8 +4653,7 @@ class MainWindow(QMainWindow):
 
             # Save the schema
             try:
-                with open(schema_path, "w", encoding="utf-8") as f:
-                    json.dump(schema_data, f, indent=2, ensure_ascii=False)
+                self.repository.save_schema(schema_name, schema_data)
 
                 # Reload schemas
                 self.load_schemas()
@@ -3720,13 +4693,12 @@ class MainWindow(QMainWindow):
             schema_data = schema_result["data"]
 
             # Save the schema
-            schema_path = SCHEMA_DIR / f"{schema_name}.schema.json"
             try:
-                with open(schema_path, "w", encoding="utf-8") as f:
-                    json.dump(schema_data, f, indent=2, ensure_ascii=False)
+                self.repository.save_schema(schema_name, schema_data)
 
-                # Reload schemas
+                # Reload schemas, dropping validators built from the old one
                 self.schemas[schema_name] = schema_data
+                SchemaHelper.clear_compiled_schemas()
 
                 # Reload data with the updated schema
                 self.load_category_data(schema_name)
@@ -3743,28 +4715,34 @@ class MainWindow(QMainWindow):
 
     def load_schemas(self):
         """Load all available schemas"""
-        schema_files = list(SCHEMA_DIR.glob("*.schema.json"))
-        self.schemas = {}
+        self.watch_schema_files()
+        self.schema_stats = self.repository.scan_schemas()
+        self.schemas, errors = self.repository.load_schemas()
+        SchemaHelper.clear_compiled_schemas()
 
         # Block signals during loading
         self.category_combo.blockSignals(True)
         self.category_combo.clear()
+        for category in self.schemas:
+            self.category_combo.addItem(category)
+        self.category_combo.blockSignals(False)
 
-        for schema_file in schema_files:
-            category = schema_file.name.split(".")[0]
-            try:
-                with open(schema_file, encoding="utf-8") as f:
-                    schema = json.load(f)
-                self.schemas[category] = schema
-                self.category_combo.addItem(category)
-            except Exception as e:
-                QMessageBox.warning(
-                    self,
-                    "Schema Error",
-                    f"Failed to load schema {schema_file}: {str(e)}",
-                )
+        if errors:
+            QMessageBox.warning(
+                self,
+                "Schema Error",
+                f"Failed to load {len(errors)} schema(s):\n\n{format_error_summary(errors)}",
+            )
 
-        self.category_combo.blockSignals(False)
+        # Drop cached validation results for schema versions that no longer exist
+        cache_path = self.validation_cache_path()
+        if cache_path is not None:
+            try:
+                cache = ValidationCache(cache_path)
+                cache.prune(content_hash(schema) for schema in self.schemas.values())
+                cache.close()
+            except (sqlite3.Error, OSError):
+                pass
 
         # Load first category if available
         if self.category_combo.count() > 0:
@@ -3772,59 +4750,407 @@ class MainWindow(QMainWindow):
 
     def load_category_data(self, category):
         """Load all data for a specific category, with support for nested schemas"""
+        # Stop any load or validation still running for the previous category
+        self.cancel_loading()
+        self.cancel_validation()
+
+        # Files on disk must include queued changes before they are read back
+        if not self.save_queue.flush(timeout=10):
+            QMessageBox.warning(
+                self,
+                "Unsaved Changes",
+                f"{self.save_queue.pending_count()} change(s) could not be written to disk, "
+                f"so category {category} was not loaded. They stay queued and are "
+                "retried with the next change or reload.",
+            )
+            # Keep showing the category the changes were made in
+            if self.current_category:
+                self.category_combo.blockSignals(True)
+                self.category_combo.setCurrentText(self.current_category)
+                self.category_combo.blockSignals(False)
+            return
+
         self.current_category = category
         self.data = {}
+        self.file_stats = None
+        self.file_entry_ids = {}
+        self.index_version = None
+        self.watch_category(category)
 
-        category_dir = DATA_DIR / category
-        category_dir.mkdir(exist_ok=True)
+        # Get schema
+        schema = self.schemas.get(category, {})
+        if self.use_paged_model(category):
+            self.setup_paged_model(schema)
+            return
+        self.setup_table_model(schema, [])
 
-        data_files = list(category_dir.glob("*.json"))
-        entries = []
+        # Read and parse the entry files in the background, adding rows as they arrive
+        self.load_worker = CategoryLoadWorker(self.repository, category, parent=self)
+        self.load_worker.chunk_loaded.connect(self.on_entries_loaded)
+        self.load_worker.progress.connect(self.on_load_progress)
+        self.load_worker.loading_finished.connect(self.on_loading_finished)
 
-        for data_file in data_files:
-            try:
-                with open(data_file, encoding="utf-8") as f:
-                    entry = json.load(f)
-
-                    # Store by ID for faster lookup
-                    entry_id = entry.get("opendb_id")
-                    if entry_id:
-                        self.data[entry_id] = entry
-                        entries.append(entry)
-            except Exception as e:
-                QMessageBox.warning(
-                    self, "Data Error", f"Failed to load data {data_file}: {str(e)}"
-                )
+        self.load_progress.setValue(0)
+        self.load_progress.setMaximum(0)  # Busy indicator until the file count is known
+        self.load_progress.show()
+        self.cancel_load_button.show()
+        self.status_bar.showMessage(f"Loading category {category}...")
 
-        # Get schema
-        schema = self.schemas.get(category, {})
+        self.load_worker.start()
 
+    def setup_table_model(self, schema, entries):
+        """Show entries in a new table model with the columns of schema"""
         # Create headers from schema properties, including nested ones
         headers = ["opendb_id"]  # Always include ID
         schema_properties = SchemaHelper.get_all_properties(schema)
         headers.extend(schema_properties)
 
         # Update the table model
-        self.table_model = DataTableModel(entries, headers)
+        self.set_table_model(DataTableModel(entries, headers), schema)
+
+    def setup_paged_model(self, schema):
+        """Browse the current category page by page from the query index"""
+        category = self.current_category
+        headers = ["opendb_id"] + SchemaHelper.get_all_properties(schema)
+        model = PagedTableModel(
+            self.query_index_path(), category, headers,
+            validate=lambda entry: self.validate_entry(entry, self.schemas.get(category, {})),
+        )
+        self.set_table_model(model, schema)
+
+        # The index is read right away and refreshed once it is in sync with the files
+        self.status_bar.showMessage(f"Indexing category {category} for paged browsing...")
+        self.start_index_sync()
+
+    def set_table_model(self, model, schema):
+        """Show a new table model for schema in the table view"""
+        previous = self.table_model
+        self.table_model = model
 
         # Set required fields, including nested ones
         required_fields = SchemaHelper.get_required_fields(schema)
         self.table_model.set_required_fields(required_fields)
+        self.table_model.set_field_types(SchemaHelper.get_property_types(schema))
 
         # Set up the proxy model
         self.proxy_model.setSourceModel(self.table_model)
-        
+        if isinstance(previous, PagedTableModel):
+            previous.close()
+
         # Update search columns dropdown
         self.update_search_columns()
 
+        # Paged models filter in the index, others in the proxy
+        if self.search_box.text() and (self.is_paged() or isinstance(previous, PagedTableModel)):
+            self.start_search()
+
+    def watch_category(self, category):
+        """Watch the directory of a category for changes made by other programs"""
+        if self.watched_category_dir is not None:
+            self.fs_watcher.removePath(self.watched_category_dir)
+            self.watched_category_dir = None
+
+        category_dir = self.repository.category_dir(category)
+        try:
+            category_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return
+        if self.fs_watcher.addPath(str(category_dir)):
+            self.watched_category_dir = str(category_dir)
+
+    def on_directory_changed(self, path):
+        """Check a watched directory once its changes settle"""
+        if Path(path) == SCHEMA_DIR:
+            self.schema_watch_timer.start()
+        elif path == self.watched_category_dir:
+            self.data_watch_timer.start()
+
+    def on_schema_file_changed(self, path):
+        """Check the schemas once changes to a schema file settle"""
+        self.schema_watch_timer.start()
+
+    def watch_schema_files(self):
+        """Watch every schema file, including ones that were added or replaced"""
+        watched = set(self.fs_watcher.files())
+        paths = [str(path) for path in SCHEMA_DIR.glob("*.schema.json") if str(path) not in watched]
+        if paths:
+            self.fs_watcher.addPaths(paths)
+
+    def check_category_changes(self):
+        """Read the entry files of the current category that changed on disk"""
+        if not self.current_category:
+            return
+        if self.is_paged():
+            # Syncing the index reads the changed files
+            self.schedule_index_sync()
+            return
+        if self.load_worker is not None or self.changes_worker is not None:
+            # Check again once the running load or check is done
+            self.data_watch_timer.start()
+            return
+        if self.file_stats is None:
+            return
+
+        self.changes_worker = CategoryChangesWorker(
+            self.repository, self.current_category, self.file_stats, parent=self
+        )
+        self.changes_worker.changes_found.connect(self.on_category_changes)
+        self.changes_worker.finished.connect(self.changes_worker.deleteLater)
+        self.changes_worker.start()
+
+    def on_category_changes(self, category, stats, updated, removed, errors):
+        """Apply entry files that were added, modified or removed on disk"""
+        if self.sender() is not self.changes_worker:
+            return
+        self.changes_worker = None
+        # A load started meanwhile reads every file anyway
+        if category != self.current_category or self.load_worker is not None:
+            return
+        self.file_stats = stats
+
+        # Ids that a removed or modified file no longer holds
+        dropped = []
+        for filename in removed:
+            entry_id = self.file_entry_ids.pop(filename, None)
+            if entry_id is not None:
+                dropped.append(entry_id)
+        for filename, entry in updated:
+            entry_id = entry["opendb_id"] if entry is not None else None
+            previous_id = self.file_entry_ids.get(filename)
+            if previous_id is not None and previous_id != entry_id:
+                dropped.append(previous_id)
+            if entry_id is None:
+                self.file_entry_ids.pop(filename, None)
+            else:
+                self.file_entry_ids[filename] = entry_id
+
+        changed = []
+        for _, entry in updated:
+            if entry is None:
+                continue
+            entry_id = entry["opendb_id"]
+            # Queued edits win, and our own writes come back unchanged
+            if self.save_queue.pending_entry(category, entry_id) is not None:
+                continue
+            if self.data.get(entry_id) == entry:
+                continue
+            self.data[entry_id] = entry
+            self.table_model.upsert_entry(entry)
+            changed.append(entry)
+
+        removed_count = 0
+        # An id still held by another file keeps its row
+        held_ids = set(self.file_entry_ids.values()) if dropped else set()
+        for entry_id in dropped:
+            if entry_id in held_ids or entry_id not in self.data:
+                continue
+            if self.save_queue.pending_entry(category, entry_id) is not None:
+                continue
+            del self.data[entry_id]
+            self.table_model.remove_entry(entry_id)
+            removed_count += 1
+
+        if changed:
+            self.validate_changed_entries(changed)
+
+        if errors:
+            self.status_bar.showMessage(
+                f"Could not read {len(errors)} changed file(s) in {category}: "
+                f"{format_error_summary(errors, limit=1)}"
+            )
+        elif changed or removed_count:
+            self.status_bar.showMessage(
+                f"Applied changes from disk: {len(changed)} updated, {removed_count} removed",
+                5000,
+            )
+        if updated or removed:
+            self.schedule_index_sync()
+
+    def check_schema_changes(self):
+        """Reload schemas that changed on disk, revalidating the current category if needed"""
+        self.watch_schema_files()
+        stats = self.repository.scan_schemas()
+        if stats == self.schema_stats:
+            return
+        self.schema_stats = stats
+
+        schemas, errors = self.repository.load_schemas()
+        # A schema that can't be read, e.g. while it is being written, keeps its old version
+        for path, _ in errors:
+            category = Path(path).name.split(".")[0]
+            if category in self.schemas:
+                schemas[category] = self.schemas[category]
+        if errors:
+            self.status_bar.showMessage(
+                f"Failed to reload {len(errors)} schema(s): {format_error_summary(errors, limit=1)}"
+            )
+
+        old_schema = self.schemas.get(self.current_category)
+        self.schemas = schemas
+        SchemaHelper.clear_compiled_schemas()
+
+        # Update the category list without reloading the current category
+        categories = list(schemas)
+        if categories != [self.category_combo.itemText(i) for i in range(self.category_combo.count())]:
+            self.category_combo.blockSignals(True)
+            self.category_combo.clear()
+            self.category_combo.addItems(categories)
+            if self.current_category in schemas:
+                self.category_combo.setCurrentText(self.current_category)
+            self.category_combo.blockSignals(False)
+
+        if not self.current_category:
+            return
+        if self.current_category not in schemas:
+            if self.category_combo.count() > 0:
+                self.on_category_changed(0)
+            return
+
+        new_schema = schemas[self.current_category]
+        if old_schema is None or content_hash(new_schema) != content_hash(old_schema):
+            self.apply_schema_change(new_schema)
+
+    def apply_schema_change(self, schema):
+        """Show the current entries with a changed schema and revalidate them"""
+        if self.is_paged():
+            self.setup_paged_model(schema)
+            return
+
+        headers = ["opendb_id"] + SchemaHelper.get_all_properties(schema)
+        if headers == self.table_model.headers():
+            self.table_model.set_required_fields(SchemaHelper.get_required_fields(schema))
+            self.table_model.set_field_types(SchemaHelper.get_property_types(schema))
+            self.table_view.viewport().update()
+        else:
+            # New columns: rebuild the table from memory, no files need reading
+            self.setup_table_model(schema, list(self.data.values()))
+
+        self.status_bar.showMessage(f"Schema of {self.current_category} changed, revalidating...")
+        self.validate_all_entries()
+        self.index_version = None
+        self.schedule_index_sync()
+
+    def cancel_loading(self):
+        """Cancel the background load of the current category, if any"""
+        if self.load_worker is None:
+            return
+
+        worker = self.load_worker
+        self.load_worker = None
+        worker.cancel()
+        worker.wait()
+        worker.deleteLater()
+
+        self.load_progress.hide()
+        self.cancel_load_button.hide()
+
+    def cancel_validation(self):
+        """Cancel the background validation pass, if any"""
+        if self.validation_worker is None:
+            return
+
+        worker = self.validation_worker
+        self.validation_worker = None
+        worker.cancel()
+        worker.wait()
+        worker.deleteLater()
+
+        self.load_progress.hide()
+        self.cancel_load_button.hide()
+
+    def on_cancel_clicked(self):
+        """Handle the status bar Cancel button"""
+        if self.load_worker is not None:
+            self.cancel_loading()
+            self.status_bar.showMessage(
+                f"Loading cancelled: {len(self.data)} entries loaded for category "
+                f"{self.current_category}"
+            )
+        elif self.validation_worker is not None:
+            self.cancel_validation()
+            self.status_bar.showMessage("Validation cancelled")
+
+    def on_entries_loaded(self, entries):
+        """Add a chunk of entries delivered by the load worker"""
+        if self.sender() is not self.load_worker:
+            return
+
+        # Store by ID for faster lookup
+        for entry in entries:
+            self.data[entry["opendb_id"]] = entry
+
+        self.table_model.append_entries(entries)
+
+    def on_load_progress(self, done, total):
+        """Update the status bar progress indicator"""
+        if self.sender() is not self.load_worker:
+            return
+
+        self.load_progress.setMaximum(total)
+        self.load_progress.setValue(done)
+
+    def on_loading_finished(self, errors, cancelled):
+        """Finish loading the current category once the worker is done"""
+        worker = self.sender()
+        if worker is not self.load_worker or cancelled:
+            return
+
+        self.load_worker = None
+        self.file_stats = worker.file_stats
+        self.file_entry_ids = worker.entry_ids
+        if not cancelled:
+            self.schedule_index_sync()
+        worker.deleteLater()
+        self.load_progress.hide()
+        self.cancel_load_button.hide()
+
+        # Report all failed files at once instead of one dialog per file
+        if errors:
+            QMessageBox.warning(
+                self,
+                "Data Error",
+                f"Failed to load {len(errors)} file(s) in {self.current_category}:\n\n"
+                f"{format_error_summary(errors)}",
+            )
+
         # Validate data
         self.validate_all_entries()
 
         # Update status
         self.status_bar.showMessage(
-            f"Loaded {len(entries)} entries for category {category}"
+            f"Loaded {len(self.data)} entries for category {self.current_category}"
         )
 
+    def closeEvent(self, event):
+        """Write pending changes and stop background work before the window closes"""
+        if not self.save_queue.flush():
+            answer = QMessageBox.question(
+                self,
+                "Unsaved Changes",
+                f"{self.save_queue.pending_count()} change(s) could not be written to disk. "
+                "Close anyway and lose them?",
+                QMessageBox.Yes | QMessageBox.No,
+            )
+            if answer != QMessageBox.Yes:
+                event.ignore()
+                return
+        self.save_queue.close(timeout=5)
+
+        self.data_watch_timer.stop()
+        self.schema_watch_timer.stop()
+        if self.changes_worker is not None:
+            self.changes_worker.wait()
+        self.index_sync_timer.stop()
+        if self.index_sync_worker is not None:
+            self.index_sync_worker.wait()
+        self.cancel_search()
+        for worker in self.stale_search_workers:
+            worker.wait()
+        self.cancel_loading()
+        self.cancel_validation()
+        self.validation_engine.shutdown()
+        super().closeEvent(event)
+
     def on_category_changed(self, index):
         """Handle category selection change"""
         if index >= 0:
@@ -3832,7 +5158,127 @@ class MainWindow(QMainWindow):
             self.load_category_data(category)
 
     def on_search_changed(self, text):
-        """Handle search text change"""
+        """Handle search text change, searching once typing pauses"""
+        self.search_timer.start()
+
+    def start_search(self):
+        """Search for the current text in the background, superseding older searches"""
+        self.search_timer.stop()
+        self.cancel_search()
+        self.search_generation += 1
+
+        text = self.search_box.text()
+        mode = self.proxy_model.search_mode
+        self.mark_search_invalid(None)
+        if self.is_paged():
+            self.apply_paged_search(text, mode)
+            return
+
+        # Reject invalid patterns once, up front. The proxy matches no rows
+        # for them, rather than showing every row as if the box were empty.
+        if text and mode == AdvancedFilterProxyModel.REGEX:
+            try:
+                search.compile_regex(text)
+            except re.error as e:
+                self.apply_search(text)
+                self.mark_search_invalid(f"Invalid regular expression: {e}")
+                return
+        elif text and mode == AdvancedFilterProxyModel.QUERY:
+            try:
+                self.table_model.parse_query(text)
+            except query.QueryError as e:
+                self.apply_search(text)
+                self.mark_search_invalid(f"Invalid query: {e}")
+                return
+
+        if not text or not self.table_model.search_index_supports(mode):
+            # Nothing to look up in the index: filter directly
+            self.apply_search(text)
+            return
+
+        # Queries go to the SQLite index when it matches the table
+        index_path = None
+        if mode == AdvancedFilterProxyModel.QUERY and self.index_version is not None:
+            index_path = self.query_index_path()
+        self.search_worker = SearchWorker(
+            self.table_model, text, mode, self.proxy_model.search_columns,
+            self.search_generation, index_path, self.current_category, self.index_version,
+            parent=self,
+        )
+        self.search_worker.search_finished.connect(self.on_search_finished)
+        self.search_worker.finished.connect(self.on_search_worker_done)
+        self.search_worker.start()
+
+    def apply_paged_search(self, text, mode):
+        """Filter a paged category in the query index"""
+        self.proxy_model.setFilterRegExp("")
+        node = None
+        if text and mode == AdvancedFilterProxyModel.QUERY:
+            try:
+                node = self.table_model.parse_query(text)
+            except query.QueryError as e:
+                # The rows of the previous query stay until the text is fixed
+                self.mark_search_invalid(f"Invalid query: {e}")
+                return
+        elif text and mode == AdvancedFilterProxyModel.CONTAINS:
+            # Text fields containing the text, in the chosen column or any
+            headers = self.table_model.headers()
+            fields = [headers[col] for col in self.proxy_model.search_columns] or headers
+            node = query.Or([query.Compare(field, "~", text) for field in fields])
+        elif text:
+            self.table_model.set_query(None)
+            self.status_bar.showMessage(
+                "Paged categories can be searched with Contains or Query"
+            )
+            return
+
+        self.table_model.set_query(node)
+        self.status_bar.showMessage(
+            f"Displaying {self.table_model.total_count()} of "
+            f"{self.table_model.category_count()} entries"
+        )
+
+    def mark_search_invalid(self, message):
+        """Highlight the search box and show message, or clear the mark if message is None"""
+        if message is None:
+            self.search_box.setStyleSheet("")
+            self.search_box.setToolTip("")
+            return
+        self.search_box.setStyleSheet("background-color: #FFC0C0; color: black;")
+        self.search_box.setToolTip(message)
+        self.status_bar.showMessage(message)
+
+    def cancel_search(self):
+        """Cancel the running search; its result will be ignored"""
+        if self.search_worker is None:
+            return
+
+        self.search_worker.cancel()
+        self.stale_search_workers.append(self.search_worker)
+        self.search_worker = None
+
+    def on_search_worker_done(self):
+        """Release a finished search worker"""
+        worker = self.sender()
+        if worker in self.stale_search_workers:
+            self.stale_search_workers.remove(worker)
+        if worker is self.search_worker:
+            self.search_worker = None
+        worker.deleteLater()
+
+    def on_search_finished(self, generation, result):
+        """Apply the result of the latest background search"""
+        worker = self.sender()
+        if generation != self.search_generation or worker.model is not self.table_model:
+            return
+
+        if result is not None:
+            key = self.proxy_model.search_key(worker.search_term)
+            self.proxy_model.set_search_result(key, *result)
+        self.apply_search(worker.search_term)
+
+    def apply_search(self, text):
+        """Filter the table by text and show the number of matches"""
         self.proxy_model.setFilterRegExp(text)
         # Update status bar with count of filtered items
         visible_count = self.proxy_model.rowCount()
@@ -3842,21 +5288,23 @@ class MainWindow(QMainWindow):
     def on_search_mode_changed(self, index):
         """Handle search mode change"""
         mode = self.search_mode_combo.currentData()
-        self.proxy_model.setSearchMode(mode)
+        self.proxy_model.setSearchMode(mode, invalidate=False)
+        # Queries name their fields, so the column choice doesn't apply
+        self.search_column_combo.setEnabled(mode != AdvancedFilterProxyModel.QUERY)
         # Re-apply the current search text to trigger filtering with new mode
-        self.on_search_changed(self.search_box.text())
+        self.start_search()
         
     def on_search_column_changed(self, index):
         """Handle search column change"""
-        if index == 0:  # "All Columns"
-            self.proxy_model.setSearchColumns([])
+        if index <= 0:  # "All Columns"
+            self.proxy_model.setSearchColumns([], invalidate=False)
         else:
             # Adjust for 0-based column index (the combo box first item is "All Columns")
             column_index = index - 1
-            self.proxy_model.setSearchColumns([column_index])
+            self.proxy_model.setSearchColumns([column_index], invalidate=False)
             
         # Re-apply the current search text
-        self.on_search_changed(self.search_box.text())
+        self.start_search()
         
     def clear_search(self):
         """Clear the search box"""
@@ -3907,11 +5355,9 @@ class MainWindow(QMainWindow):
             # Get edited data
             edited_data = dialog.get_edited_data()
 
-            # Save to file
-            self.save_entry(edited_data)
-
-            # Refresh data
-            self.refresh_data()
+            # Save to file and update the table in place
+            if self.save_entry(edited_data):
+                self.apply_saved_entry(edited_data)
 
     def edit_selected_entry(self):
         """Edit the selected entry"""
@@ -3937,28 +5383,89 @@ class MainWindow(QMainWindow):
             # Get edited data
             edited_data = dialog.get_edited_data()
 
-            # Save to file
-            self.save_entry(edited_data)
+            # Save to file and update the table in place
+            if self.save_entry(edited_data):
+                self.apply_saved_entry(edited_data)
 
-            # Refresh data
-            self.refresh_data()
+    def apply_saved_entry(self, entry_data):
+        """Update the table and validation for a single saved entry"""
+        entry_id = entry_data.get("opendb_id")
+        schema = self.schemas.get(self.current_category, {})
+
+        self.table_model.upsert_entry(entry_data)
+        self.table_model.set_entry_validation_result(
+            entry_id, self.validate_entry(entry_data, schema)
+        )
+
+    def validate_changed_entries(self, entries):
+        """Validate entries that changed on disk"""
+        if self.validation_worker is not None or len(entries) > 50:
+            # A full pass picks up the new entries; cached results keep it quick
+            self.validate_all_entries()
+            return
+
+        schema = self.schemas.get(self.current_category, {})
+        self.table_model.update_validation_results({
+            entry["opendb_id"]: self.validate_entry(entry, schema) for entry in entries
+        })
 
     def validate_all_entries(self):
-        """Validate all entries for the current category"""
+        """Validate all entries for the current category in the background"""
         if not self.current_category:
             return
+        if self.is_paged():
+            self.status_bar.showMessage(
+                "Entries of a paged category are validated as their rows are shown"
+            )
+            return
+
+        # Restart if a previous pass is still running
+        self.cancel_validation()
 
         schema = self.schemas.get(self.current_category, {})
-        validation_results = {}
-        valid_count = 0
-        total_count = len(self.data)
+        self.validation_worker = ValidationWorker(
+            self.validation_engine, schema, self.data.items(), parent=self
+        )
+        self.validation_worker.progress.connect(self.on_validation_progress)
+        self.validation_worker.results_ready.connect(self.on_validation_results)
+        self.validation_worker.validation_finished.connect(self.on_validation_finished)
+        self.validation_worker.validation_failed.connect(self.on_validation_failed)
+
+        self.load_progress.setValue(0)
+        self.load_progress.setMaximum(max(len(self.data), 1))
+        self.load_progress.show()
+        self.cancel_load_button.show()
+        self.status_bar.showMessage(f"Validating {len(self.data)} entries...")
+
+        self.validation_worker.start()
+
+    def on_validation_progress(self, done, total):
+        """Update the status bar progress indicator"""
+        if self.sender() is not self.validation_worker:
+            return
+
+        self.load_progress.setMaximum(max(total, 1))
+        self.load_progress.setValue(done)
+
+    def on_validation_results(self, validation_results):
+        """Show the results of a validation shard as soon as it completes"""
+        if self.sender() is not self.validation_worker:
+            return
+        self.table_model.update_validation_results(validation_results)
+
+    def on_validation_finished(self, validation_results, cancelled):
+        """Apply the results of a completed validation pass"""
+        worker = self.sender()
+        if worker is not self.validation_worker or cancelled:
+            return
 
-        for entry_id, entry_data in self.data.items():
-            results = self.validate_entry(entry_data, schema)
-            validation_results[entry_id] = results
+        self.validation_worker = None
+        worker.deleteLater()
+        self.load_progress.hide()
+        self.cancel_load_button.hide()
 
-            if results["is_valid"]:
-                valid_count += 1
+        valid_count = sum(1 for results in validation_results.values() if results["is_valid"])
+        total_count = len(validation_results)
 
         # Update the table model with validation results
         self.table_model.set_validation_results(validation_results)
@@ -3968,6 +5475,20 @@ class MainWindow(QMainWindow):
             f"Validation: {valid_count}/{total_count} entries are valid"
         )
 
+    def on_validation_failed(self, message):
+        """Report a validation pass that stopped with an error"""
+        worker = self.sender()
+        if worker is not self.validation_worker:
+            return
+
+        self.validation_worker = None
+        worker.deleteLater()
+        self.load_progress.hide()
+        self.cancel_load_button.hide()
+
+        self.status_bar.showMessage("Validation failed")
+        QMessageBox.critical(self, "Validation Error", f"Validation failed: {message}")
+
     def delete_selected_entry(self):
         """Delete the selected entry"""
         selected_indexes = self.table_view.selectionModel().selectedRows()
@@ -4002,44 +5523,117 @@ class MainWindow(QMainWindow):
         if not entry_id:
             return
 
-        # Delete the file
-        file_path = DATA_DIR / self.current_category / f"{entry_id}.json"
+        # Delete the file in the background
         try:
-            if file_path.exists():
-                file_path.unlink()
+            self.save_queue.delete(self.current_category, entry_id)
 
             # Remove from data
             if entry_id in self.data:
                 del self.data[entry_id]
 
-            # Refresh data
-            self.refresh_data()
+            # Remove the row from the table
+            self.table_model.remove_entry(entry_id)
+            self.status_bar.showMessage(f"Deleted entry {entry_id}", 3000)
         except Exception as e:
             QMessageBox.critical(self, "Deletion Error", f"Failed to delete file: {str(e)}")
 
     def save_entry(self, entry_data):
-        """Save an entry to file"""
+        """Queue an entry to be written to file, returning True on success"""
         entry_id = entry_data.get("opendb_id")
         if not entry_id:
-            return
-
-        file_path = DATA_DIR / self.current_category / f"{entry_id}.json"
+            return False
 
         try:
-            # Create directory if it doesn't exist
-            file_path.parent.mkdir(exist_ok=True)
-
-            # Write to file
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(entry_data, f, indent=2, ensure_ascii=False)
+            # Written to file in the background, see on_save_flushed
+            self.save_queue.save(self.current_category, entry_data)
 
             # Update in-memory data
             self.data[entry_id] = entry_data
 
             # Show success message
             self.status_bar.showMessage(f"Saved entry {entry_id}", 3000)
+            return True
         except Exception as e:
             QMessageBox.critical(self, "Save Error", f"Failed to save file: {str(e)}")
+            return False
+
+    def on_save_pending_changed(self, count):
+        """Show how many changes are waiting to be written"""
+        if count and self.save_error is not None:
+            self.save_status_label.setText(f"{count} unsaved change(s), saving failed")
+        elif count:
+            self.save_status_label.setText(f"{count} unsaved change(s)")
+        else:
+            self.save_status_label.setText("All changes saved")
+
+    def on_save_flushed(self, count):
+        """Report a batch of changes written to disk"""
+        self.save_error = None
+        self.status_bar.showMessage(f"Wrote {count} change(s) to disk", 3000)
+        self.schedule_index_sync()
+
+    def schedule_index_sync(self):
+        """Sync the query index with the current category once changes settle"""
+        if self.query_index_path() is not None and self.current_category:
+            self.index_sync_timer.start()
+
+    def start_index_sync(self):
+        """Bring the query index of the current category up to date in the background"""
+        if self.query_index_path() is None or not self.current_category:
+            return
+        if self.load_worker is not None or self.index_sync_worker is not None:
+            # Try again once the load or the running sync is done
+            self.index_sync_timer.start()
+            return
+
+        # With nothing left to write, the model matches the files as of now
+        model_version = None
+        if self.save_queue.pending_count() == 0:
+            model_version = self.table_model.version()
+        self.index_sync_worker = IndexSyncWorker(
+            self.query_index_path(), self.repository, self.current_category,
+            self.schemas.get(self.current_category, {}), self.table_model, model_version,
+            parent=self,
+        )
+        self.index_sync_worker.index_synced.connect(self.on_index_synced)
+        self.index_sync_worker.finished.connect(self.index_sync_worker.deleteLater)
+        self.index_sync_worker.start()
+
+    def on_index_synced(self, category, changed, errors):
+        """Use the synced index for queries if it matches the table"""
+        worker = self.sender()
+        self.index_sync_worker = None
+        if category != self.current_category or worker.model is not self.table_model:
+            return
+        if self.is_paged():
+            self.table_model.refresh()
+            if errors:
+                self.status_bar.showMessage(
+                    f"Could not index {len(errors)} file(s) in {category}: "
+                    f"{format_error_summary(errors, limit=1)}"
+                )
+            elif not self.search_box.text():
+                self.status_bar.showMessage(
+                    f"Browsing {self.table_model.category_count()} entries of {category} page by page"
+                )
+            return
+        if worker.model_version is not None:
+            self.index_version = worker.model_version
+
+    def on_save_failed(self, message):
+        """Report changes that could not be written; they stay queued"""
+        first_error = self.save_error is None
+        self.save_error = message
+        self.status_bar.showMessage(f"Failed to save changes: {message}")
+        self.on_save_pending_changed(self.save_queue.pending_count())
+        # Every retry fails the same way until the cause is fixed; tell once
+        if first_error:
+            QMessageBox.critical(
+                self,
+                "Save Error",
+                f"Failed to save file: {message}\n\n"
+                "The changes stay queued and are written with the next change.",
+            )
 
     def refresh_data(self):
         """Refresh data for the current category"""
@@ -0,0 +1,47 @@
+"""
+Headless core of the open-db editor: schema handling, repository access and
+validation, importable without PyQt5
+"""
+
+from .columns import ColumnStore
+from .paths import CACHE_DIR, DATA_DIR, SCHEMA_DIR, SCRIPT_DIR
+from .query import QueryError, QueryIndex
+from .repository import (
+    CategoryLoader,
+    EntryCache,
+    Repository,
+    WriteBatch,
+    atomic_write_json,
+    default_loader_workers,
+    format_error_summary,
+)
+from .schema import CompiledSchema, SchemaHelper, content_hash
+from .search import SearchIndex
+from .snapshot import CategorySnapshot
+from .sqlindex import SqliteIndex
+from .validation import ValidationCache, ValidationEngine
+
+__all__ = [
+    "CACHE_DIR",
+    "DATA_DIR",
+    "SCHEMA_DIR",
+    "SCRIPT_DIR",
+    "CategoryLoader",
+    "CategorySnapshot",
+    "ColumnStore",
+    "CompiledSchema",
+    "EntryCache",
+    "QueryError",
+    "QueryIndex",
+    "Repository",
+    "SchemaHelper",
+    "SearchIndex",
+    "SqliteIndex",
+    "ValidationCache",
+    "ValidationEngine",
+    "WriteBatch",
+    "atomic_write_json",
+    "content_hash",
+    "default_loader_workers",
+    "format_error_summary",
+]
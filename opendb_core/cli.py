@@ -0,0 +1,377 @@
+"""
+Command line tools for the open-db tree.
+
+    python -m opendb_core validate [--category NAME ...] [--format jsonl|junit]
+    python -m opendb_core query QUERY [--category NAME ...] [--sort FIELD] [--limit N]
+
+validate checks every entry file of every category against its schema using
+the same rules as the editor (SchemaHelper.validate_entry) and exits with
+status 1 if any entry is invalid or cannot be parsed.
+
+query brings the SQLite index up to date with the entry files and prints the
+matching entries as JSON Lines; the query is evaluated by SQLite.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .paths import CACHE_DIR, DATA_DIR, SCHEMA_DIR
+from .query import QueryError, parse
+from .repository import CategoryLoader, Repository
+from .schema import CompiledSchema, SchemaHelper, content_hash
+from .sqlindex import SqliteIndex
+from .validation import ValidationCache
+
+# Per-process state of the validation workers, set up by _init_worker
+_worker_schemas = {}
+_worker_compiled = {}
+_worker_cache = None
+
+
+def _init_worker(schemas, cache_path):
+    """Process pool initializer: receive all schemas once per worker"""
+    global _worker_schemas, _worker_compiled, _worker_cache
+    _worker_schemas = schemas
+    _worker_compiled = {}
+    _worker_cache = ValidationCache(cache_path) if cache_path else None
+
+
+def _compiled_schema(category):
+    compiled = _worker_compiled.get(category)
+    if compiled is None:
+        compiled = CompiledSchema(_worker_schemas[category])
+        _worker_compiled[category] = compiled
+    return compiled
+
+
+def _validate_files(category, paths):
+    """Read, parse and validate entry files in a worker process"""
+    compiled = _compiled_schema(category)
+    records = []
+    parsed = []
+
+    for path in paths:
+        try:
+            entry = CategoryLoader.read_entry(path)
+        except Exception as e:
+            records.append({
+                "category": category,
+                "file": str(path),
+                "opendb_id": None,
+                "is_valid": False,
+                "parse_error": str(e),
+            })
+            continue
+        parsed.append((path, entry))
+
+    cached = {}
+    hashes = {}
+    if _worker_cache is not None:
+        hashes = {str(path): content_hash(entry) for path, entry in parsed}
+        cached = _worker_cache.get_many(compiled.fingerprint, hashes.values())
+
+    fresh = []
+    for path, entry in parsed:
+        entry_hash = hashes.get(str(path))
+        result = cached.get(entry_hash)
+        if result is None:
+            result = SchemaHelper.validate_entry(entry, compiled)
+            if entry_hash is not None:
+                fresh.append((entry_hash, result))
+
+        opendb_id = entry.get("opendb_id") if isinstance(entry, dict) else None
+        records.append({
+            "category": category,
+            "file": str(path),
+            "opendb_id": opendb_id,
+            **result,
+        })
+
+    if fresh:
+        _worker_cache.put_many(compiled.fingerprint, fresh)
+
+    return records
+
+
+def iter_tree_results(repository, categories=None, workers=None, shard_size=200,
+                      cache_path=None):
+    """
+    Validate every entry file of the given categories (all by default) in
+    parallel, yielding one record per file as shards complete.
+
+    Each record has category, file, opendb_id and is_valid keys plus either
+    the validate_entry result fields or a parse_error message.
+    """
+    schemas, schema_errors = repository.load_schemas()
+    for path, message in schema_errors:
+        yield {
+            "category": path.name.split(".")[0],
+            "file": str(path),
+            "opendb_id": None,
+            "is_valid": False,
+            "parse_error": message,
+        }
+
+    if categories:
+        missing = [category for category in categories if category not in schemas]
+        for category in missing:
+            yield {
+                "category": category,
+                "file": str(repository.schema_path(category)),
+                "opendb_id": None,
+                "is_valid": False,
+                "parse_error": "No schema for category",
+            }
+        schemas = {category: schemas[category] for category in categories if category in schemas}
+
+    shards = []
+    for category in schemas:
+        category_dir = repository.category_dir(category)
+        if not category_dir.is_dir():
+            continue
+        paths = sorted(category_dir / name for name in CategoryLoader.scan(category_dir))
+        for start in range(0, len(paths), shard_size):
+            shards.append((category, paths[start:start + shard_size]))
+
+    if not shards:
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        initializer=_init_worker,
+        initargs=(schemas, cache_path),
+    ) as executor:
+        futures = [executor.submit(_validate_files, category, paths) for category, paths in shards]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def write_jsonl(records, stream, include_valid=False):
+    """Write records as JSON Lines, returning (total, invalid) counts"""
+    total = 0
+    invalid = 0
+    for record in records:
+        total += 1
+        if not record["is_valid"]:
+            invalid += 1
+        elif not include_valid:
+            continue
+        stream.write(json.dumps(record, ensure_ascii=False, default=str))
+        stream.write("\n")
+        stream.flush()
+    return total, invalid
+
+
+def write_junit(records, stream):
+    """Write records as a JUnit XML report, one test suite per category"""
+    suites = {}
+    total = 0
+    invalid = 0
+
+    for record in records:
+        total += 1
+        suite = suites.setdefault(record["category"], [])
+        suite.append(record)
+        if not record["is_valid"]:
+            invalid += 1
+
+    root = ET.Element("testsuites", tests=str(total), failures=str(invalid))
+    for category in sorted(suites):
+        suite_records = sorted(suites[category], key=lambda r: r["file"])
+        failures = sum(1 for r in suite_records if not r["is_valid"])
+        suite = ET.SubElement(
+            root, "testsuite", name=category, tests=str(len(suite_records)),
+            failures=str(failures),
+        )
+        for record in suite_records:
+            case = ET.SubElement(
+                suite, "testcase", classname=category,
+                name=record["opendb_id"] or os.path.basename(record["file"]),
+                file=record["file"],
+            )
+            if not record["is_valid"]:
+                message, details = describe_failure(record)
+                failure = ET.SubElement(case, "failure", message=message)
+                failure.text = details
+
+    ET.ElementTree(root).write(stream, encoding="unicode", xml_declaration=True)
+    stream.write("\n")
+    return total, invalid
+
+
+def describe_failure(record):
+    """Short message and details text for an invalid record"""
+    if "parse_error" in record:
+        return "parse error", record["parse_error"]
+
+    lines = []
+    for field in record["missing_required"]:
+        lines.append(f"missing required: {field}")
+    for mismatch in record["type_mismatches"]:
+        lines.append(
+            f"type mismatch: {mismatch['field']}: expected {mismatch['expected']}, "
+            f"got {mismatch['actual']}"
+        )
+    if not lines:
+        lines.extend(record["errors"])
+
+    message = (
+        f"{len(record['missing_required'])} missing required, "
+        f"{len(record['type_mismatches'])} type mismatches"
+    )
+    return message, "\n".join(lines)
+
+
+def validate_command(args):
+    repository = Repository(args.data_dir, args.schema_dir)
+    records = iter_tree_results(
+        repository, args.category, args.workers, cache_path=args.cache
+    )
+
+    start = time.perf_counter()
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.format == "junit":
+            total, invalid = write_junit(records, output)
+        else:
+            total, invalid = write_jsonl(records, output, args.all)
+    finally:
+        if args.output:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Validated {total} entries in {elapsed:.2f}s: {invalid} invalid",
+        file=sys.stderr,
+    )
+    return 1 if invalid else 0
+
+
+def sync_index(index, repository, categories=None):
+    """Update the index for the given categories (all by default), reporting errors"""
+    schemas, schema_errors = repository.load_schemas()
+    for path, message in schema_errors:
+        print(f"{path}: {message}", file=sys.stderr)
+    for category in categories or sorted(schemas):
+        if category not in schemas:
+            print(f"No schema for category {category!r}", file=sys.stderr)
+            continue
+        changed, errors = index.sync(repository, category, schemas[category])
+        for path, message in errors:
+            print(f"{path}: {message}", file=sys.stderr)
+        if changed:
+            print(f"Indexed {changed} changed files in {category}", file=sys.stderr)
+
+
+def query_command(args):
+    repository = Repository(args.data_dir, args.schema_dir)
+    with SqliteIndex(args.index) as index:
+        if not args.no_sync:
+            sync_index(index, repository, args.category)
+
+        categories = args.category or [None]
+        fields = set()
+        for category in categories:
+            fields.update(index.fields(category))
+        try:
+            node = parse(args.query, fields) if args.query else None
+            if args.sort is not None and args.sort not in fields:
+                raise QueryError(f"Unknown field {args.sort!r}")
+        except QueryError as e:
+            print(f"Invalid query: {e}", file=sys.stderr)
+            return 2
+
+        if args.count:
+            print(sum(index.count(node, category) for category in categories))
+            return 0
+
+        # Without --category, one query sorts and pages across all categories
+        remaining = args.limit
+        offset = args.offset
+        for category in categories:
+            if remaining is not None and remaining <= 0:
+                break
+            if offset:
+                matches = index.count(node, category)
+                if offset >= matches:
+                    offset -= matches
+                    continue
+            results = index.search(
+                node, category, args.sort, args.descending, offset, remaining
+            )
+            offset = 0
+            if remaining is not None:
+                remaining -= len(results)
+            for entry_category, entry in results:
+                sys.stdout.write(
+                    json.dumps({"category": entry_category, "entry": entry}, ensure_ascii=False)
+                )
+                sys.stdout.write("\n")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m opendb_core", description="Command line tools for the open-db tree"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    validate = subparsers.add_parser(
+        "validate", help="Validate every entry against its category schema"
+    )
+    validate.add_argument("--data-dir", default=str(DATA_DIR), help="open-db data directory")
+    validate.add_argument("--schema-dir", default=str(SCHEMA_DIR), help="Schema directory")
+    validate.add_argument(
+        "--category", action="append",
+        help="Only validate this category (can be given several times)",
+    )
+    validate.add_argument(
+        "--workers", type=int, default=None, help="Number of worker processes (default: CPUs)"
+    )
+    validate.add_argument(
+        "--format", choices=["jsonl", "junit"], default="jsonl", help="Output format"
+    )
+    validate.add_argument("--output", help="Write the report to this file instead of stdout")
+    validate.add_argument(
+        "--all", action="store_true", help="Also list valid entries in JSON Lines output"
+    )
+    validate.add_argument("--cache", help="Validation result cache file to reuse and update")
+    validate.set_defaults(func=validate_command)
+
+    query = subparsers.add_parser(
+        "query", help="Print the entries matching a query, using the SQLite index"
+    )
+    query.add_argument(
+        "query", nargs="?", default="", help='Query, e.g. "cores>=8 AND socket=AM5" (default: all)'
+    )
+    query.add_argument("--data-dir", default=str(DATA_DIR), help="open-db data directory")
+    query.add_argument("--schema-dir", default=str(SCHEMA_DIR), help="Schema directory")
+    query.add_argument(
+        "--index", default=str(CACHE_DIR / "query_index.sqlite"), help="SQLite index file"
+    )
+    query.add_argument(
+        "--category", action="append",
+        help="Only search this category (can be given several times)",
+    )
+    query.add_argument("--sort", help="Sort by the typed values of this field")
+    query.add_argument("--descending", action="store_true", help="Sort in descending order")
+    query.add_argument("--offset", type=int, default=0, help="Skip this many matches")
+    query.add_argument("--limit", type=int, default=None, help="Print at most this many matches")
+    query.add_argument("--count", action="store_true", help="Only print the number of matches")
+    query.add_argument(
+        "--no-sync", action="store_true", help="Query the index without updating it first"
+    )
+    query.set_defaults(func=query_command)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,486 @@
+"""
+Columnar storage of table cells: one compact column per header path instead
+of one dict per row
+"""
+
+from array import array
+
+try:
+    import numpy
+except ImportError:  # numpy is optional; columns work without it
+    numpy = None
+
+# Storage type codes of the typed column kinds. Strings are dictionary
+# encoded: each cell stores an index into the column's list of distinct values.
+TYPECODES = {"int": "q", "float": "d", "bool": "b", "str": "I"}
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+def split_path(field):
+    """Pre-split dotted header path"""
+    return tuple(field.split("."))
+
+
+def resolve_path(entry, parts):
+    """Value of an entry at a split header path, or "" if it doesn't exist"""
+    value = entry
+    for part in parts:
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return ""
+    return value
+
+
+def value_kind(value):
+    """Column kind that can store value, or None for missing values"""
+    if value is None or value == "":
+        return None
+    value_type = type(value)
+    if value_type is bool:
+        return "bool"
+    if value_type is int:
+        return "int" if INT64_MIN <= value <= INT64_MAX else "object"
+    if value_type is float:
+        return "float"
+    if value_type is str:
+        return "str"
+    return "object"
+
+
+def infer_kind(values):
+    """Most common kind among values, "str" if they are all missing"""
+    counts = {}
+    for value in values:
+        kind = value_kind(value)
+        if kind is not None:
+            counts[kind] = counts.get(kind, 0) + 1
+    if not counts:
+        return "str"
+    # Ints fit in float columns, so a mix of both is a float column
+    if "int" in counts and "float" in counts:
+        counts["float"] += counts.pop("int")
+    return max(counts, key=counts.get)
+
+
+# Per-cell tags of numeric and bool columns, saying how to read the typed value
+TAG_VALUE = 0
+TAG_MISSING = 1  # no value at the path: ""
+TAG_NONE = 2  # null
+TAG_INT = 3  # an int stored in a float column
+TAG_EXCEPTION = 4  # doesn't fit the column, kept in exceptions
+
+FLOAT_EXACT_INT = 2 ** 53
+
+# Display texts of numbers are cached per column, up to this many distinct values
+MAX_CACHED_TEXTS = 4096
+
+
+def display_text(value):
+    """Text shown in a cell for a flattened value"""
+    # Handle different types for display
+    if value is None:
+        return "null"
+    elif isinstance(value, dict):
+        return "{...}"  # Show indicator for objects
+    elif isinstance(value, list):
+        return f"[{len(value)} items]"  # Show count for arrays
+    else:
+        # Convert any non-string values to string, preserving Unicode characters
+        return str(value)
+
+
+class Column:
+    """
+    Values of one header path.
+
+    Numbers and booleans are kept in a typed array with a one byte tag per
+    cell for missing and null values. Strings are dictionary encoded unless
+    most of them are distinct, in which case the column just references the
+    entries' own string objects. The rare values that don't fit the column's
+    kind are kept as-is in exceptions, keyed by row.
+    """
+
+    def __init__(self, kind, values=()):
+        self.kind = kind
+        self.exceptions = {}
+        self.tags = None
+        if kind == "object":
+            self.values = []
+        else:
+            self.values = array(TYPECODES[kind])
+        if kind == "str":
+            self.categories = []
+            self.codes = {}
+        elif kind != "object":
+            self.tags = bytearray()
+            self.texts = {}
+        # Re-infer the kind once this many values don't fit it
+        self.rebuild_at = 64
+        if not self._extend_fast(values):
+            for value in values:
+                self.append(value)
+
+    def _extend_fast(self, values):
+        """Bulk-load values into an empty column if they all fit its kind"""
+        kind = self.kind
+        if kind == "object":
+            self.values = list(values)
+            return True
+        if kind == "str":
+            if not all(type(value) is str or value is None for value in values):
+                return False
+            codes = self.codes
+            self.values = array("I", [codes.setdefault(value, len(codes)) for value in values])
+            self.categories = list(codes)
+            return True
+
+        value_type = {"int": int, "float": float, "bool": bool}[kind]
+        if not all(type(value) is value_type for value in values):
+            return False
+        try:
+            self.values = array(TYPECODES[kind], values)
+        except OverflowError:
+            return False
+        self.tags = bytearray(len(self.values))
+        return True
+
+    def _encode(self, row, value):
+        """Typed value to store for a cell, and its tag"""
+        kind = self.kind
+        value_type = type(value)
+        if kind == "object":
+            return value, TAG_VALUE
+        if kind == "str":
+            # None and "" are ordinary categories, so optional strings stay compact
+            if value_type is str or value is None:
+                code = self.codes.get(value)
+                if code is None:
+                    code = self.codes[value] = len(self.categories)
+                    self.categories.append(value)
+                return code, TAG_VALUE
+        elif value is None:
+            return 0, TAG_NONE
+        elif value_type is str and value == "":
+            return 0, TAG_MISSING
+        elif kind == "int":
+            if value_type is int and INT64_MIN <= value <= INT64_MAX:
+                return value, TAG_VALUE
+        elif kind == "float":
+            if value_type is float:
+                return value, TAG_VALUE
+            if value_type is int and -FLOAT_EXACT_INT <= value <= FLOAT_EXACT_INT:
+                return float(value), TAG_INT
+        elif value_type is bool:
+            return int(value), TAG_VALUE
+
+        self.exceptions[row] = value
+        return 0, TAG_EXCEPTION
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, value):
+        stored, tag = self._encode(len(self.values), value)
+        self.values.append(stored)
+        if self.tags is not None:
+            self.tags.append(tag)
+
+    def set(self, row, value):
+        self.exceptions.pop(row, None)
+        stored, tag = self._encode(row, value)
+        self.values[row] = stored
+        if self.tags is not None:
+            self.tags[row] = tag
+
+    def delete(self, row):
+        del self.values[row]
+        if self.tags is not None:
+            del self.tags[row]
+        if self.exceptions:
+            self.exceptions = {
+                r - (r > row): value for r, value in self.exceptions.items() if r != row
+            }
+
+    def get(self, row):
+        kind = self.kind
+        if kind == "object":
+            return self.values[row]
+        if kind == "str":
+            if self.exceptions and row in self.exceptions:
+                return self.exceptions[row]
+            return self.categories[self.values[row]]
+
+        tag = self.tags[row]
+        if tag == TAG_VALUE:
+            value = self.values[row]
+            return bool(value) if kind == "bool" else value
+        if tag == TAG_MISSING:
+            return ""
+        if tag == TAG_NONE:
+            return None
+        if tag == TAG_INT:
+            return int(self.values[row])
+        return self.exceptions[row]
+
+    def _mostly_distinct(self):
+        # Mostly distinct strings gain nothing from a dictionary
+        return self.kind == "str" and len(self.categories) > max(256, len(self.values) // 2)
+
+    def display(self, row):
+        """Display text of a cell, as display_text(self.get(row))"""
+        kind = self.kind
+        if kind == "object":
+            value = self.values[row]
+            return value if type(value) is str else display_text(value)
+        if kind == "str":
+            if self.exceptions and row in self.exceptions:
+                return display_text(self.exceptions[row])
+            value = self.categories[self.values[row]]
+            return "null" if value is None else value
+
+        tag = self.tags[row]
+        if tag != TAG_VALUE:
+            return display_text(self.get(row))
+
+        value = self.values[row]
+        # 0.0 and -0.0 are equal keys with different texts
+        if kind == "float" and value == 0:
+            return str(value)
+        text = self.texts.get(value)
+        if text is None:
+            text = str(bool(value)) if kind == "bool" else str(value)
+            if len(self.texts) < MAX_CACHED_TEXTS:
+                self.texts[value] = text
+        return text
+
+    def permute(self, order):
+        """Reorder the rows so that row i holds what was row order[i]"""
+        values = self.values
+        if self.kind == "object":
+            self.values = [values[row] for row in order]
+        else:
+            self.values = array(values.typecode, [values[row] for row in order])
+        if self.tags is not None:
+            tags = self.tags
+            self.tags = bytearray(tags[row] for row in order)
+        if self.exceptions:
+            exceptions = self.exceptions
+            self.exceptions = {
+                new_row: exceptions[row] for new_row, row in enumerate(order) if row in exceptions
+            }
+
+    def needs_rebuild(self):
+        if self._mostly_distinct():
+            return True
+        return len(self.exceptions) > max(self.rebuild_at, len(self.values) // 2)
+
+    def rebuilt(self):
+        """A copy of this column with its kind inferred from all its values"""
+        values = [self.get(row) for row in range(len(self.values))]
+        kind = infer_kind(values)
+        if kind == "str" and self._mostly_distinct():
+            kind = "object"
+        column = Column(kind, values)
+        # Mixed columns may never fit one kind well; back off instead of rebuilding again
+        column.rebuild_at = max(64, 2 * len(column.exceptions))
+        return column
+
+    def typed_values(self):
+        """
+        The typed storage as a numpy array (dictionary codes for str
+        columns), or None for object columns or without numpy. Cells whose
+        tag isn't TAG_VALUE or TAG_INT hold 0.
+        """
+        if numpy is None or self.kind == "object":
+            return None
+        return numpy.array(self.values)
+
+
+def sort_key(value, value_type):
+    """
+    Typed sort key of a cell for a JSON schema type, or None for values that
+    should sort after all others (missing, null or of another type)
+    """
+    if value_type in ("integer", "number"):
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value == value:
+            return value
+        return None
+    if value_type == "boolean":
+        return int(value) if isinstance(value, bool) else None
+    if value is None or value == "":
+        return None
+    # Strings and anything else sort by display text, ignoring case
+    return display_text(value).lower()
+
+
+def column_type(column):
+    """JSON schema type matching the values of a column"""
+    return {"int": "integer", "float": "number", "bool": "boolean"}.get(column.kind, "string")
+
+
+def _argsort(keys, descending):
+    """Stable order of numeric keys (a numpy array), largest first if descending"""
+    # Dense ranks make descending order a stable ascending sort of -rank
+    _, ranks = numpy.unique(keys, return_inverse=True)
+    ranks = ranks.reshape(-1)
+    return numpy.argsort(-ranks if descending else ranks, kind="stable")
+
+
+def _typed_sort_keys(column, value_type):
+    """
+    (rows, keys) of the sortable cells of a typed column, straight from its
+    storage, or None if the column has to be sorted cell by cell
+    """
+    if numpy is None or column.exceptions:
+        return None
+
+    if column.kind == "str" and value_type not in ("integer", "number", "boolean"):
+        # Sort the distinct values once, then look up each cell's rank by its code
+        category_keys = [sort_key(value, value_type) for value in column.categories]
+        valid = numpy.array([key is not None for key in category_keys] or [False])
+        rank_by_key = {
+            key: rank for rank, key in enumerate(sorted({key for key in category_keys if key is not None}))
+        }
+        ranks = numpy.array(
+            [rank_by_key.get(key, 0) for key in category_keys] or [0], dtype=numpy.int64
+        )
+        codes = numpy.array(column.values, dtype=numpy.int64)
+        rows = numpy.flatnonzero(valid[codes])
+        return rows, ranks[codes[rows]]
+
+    kinds = {"integer": ("int", "float"), "number": ("int", "float"), "boolean": ("bool",)}
+    if column.kind not in kinds.get(value_type, ()):
+        return None
+    tags = numpy.frombuffer(bytes(column.tags), dtype=numpy.uint8)
+    values = column.typed_values()
+    valid = (tags == TAG_VALUE) | (tags == TAG_INT)
+    if column.kind == "float":
+        valid &= ~numpy.isnan(values)
+    rows = numpy.flatnonzero(valid)
+    return rows, values[rows]
+
+
+def sort_order(column, value_type=None, descending=False):
+    """
+    Row order that sorts a column by typed value according to value_type, a
+    JSON schema type (inferred from the column if None). Cells without a
+    value of that type keep their relative order after all others.
+    """
+    if value_type is None:
+        value_type = column_type(column)
+
+    typed = _typed_sort_keys(column, value_type)
+    if typed is not None:
+        rows, keys = typed
+        is_sortable = numpy.zeros(len(column), dtype=bool)
+        is_sortable[rows] = True
+        rest = numpy.flatnonzero(~is_sortable)
+        return rows[_argsort(keys, descending)].tolist() + rest.tolist()
+
+    rows = []
+    keys = []
+    rest = []
+    for row in range(len(column)):
+        key = sort_key(column.get(row), value_type)
+        if key is None:
+            rest.append(row)
+        else:
+            rows.append(row)
+            keys.append(key)
+
+    if numpy is not None and rows and value_type in ("integer", "number", "boolean"):
+        order = _argsort(numpy.array(keys), descending)
+        return numpy.array(rows)[order].tolist() + rest
+    # sorted() is stable in reverse too
+    order = sorted(range(len(rows)), key=keys.__getitem__, reverse=descending)
+    return [rows[i] for i in order] + rest
+
+
+def build_column(entries, parts):
+    """Column of the values of entries at a split header path"""
+    values = [resolve_path(entry, parts) for entry in entries]
+    kind = infer_kind(values)
+    if kind == "str":
+        # Only strings and None go in the dictionary; lists and dicts aren't hashable
+        distinct = {value for value in values if type(value) is str or value is None}
+        if len(distinct) > max(256, len(values) // 2):
+            kind = "object"
+    column = Column(kind, values)
+    if column.needs_rebuild():
+        column = column.rebuilt()
+    return column
+
+
+class ColumnStore:
+    """
+    Table cells of a list of entries, stored column by column.
+
+    The store reads rows from entries, a list the caller owns and reports
+    changes to through rows_appended, row_changed and row_removed. Columns
+    are only built on first access, so creating a store is cheap and columns
+    that are never looked at cost nothing.
+    """
+
+    def __init__(self, fields, entries):
+        self.fields = list(fields)
+        # Split once and shared by every row
+        self.paths = [split_path(field) for field in self.fields]
+        self.entries = entries
+        self.columns = [None] * len(self.fields)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def rows_appended(self, start):
+        """Entries from row start onwards were appended"""
+        for col, column in enumerate(self.columns):
+            if column is None:
+                continue
+            parts = self.paths[col]
+            for entry in self.entries[start:]:
+                column.append(resolve_path(entry, parts))
+            if column.needs_rebuild():
+                self.columns[col] = column.rebuilt()
+
+    def row_changed(self, row):
+        """The entry at row was replaced"""
+        entry = self.entries[row]
+        for col, column in enumerate(self.columns):
+            if column is not None:
+                column.set(row, resolve_path(entry, self.paths[col]))
+
+    def row_removed(self, row):
+        """The entry at row was removed"""
+        for column in self.columns:
+            if column is not None:
+                column.delete(row)
+
+    def rows_permuted(self, order):
+        """The entries were reordered so that row i holds what was row order[i]"""
+        for column in self.columns:
+            if column is not None:
+                column.permute(order)
+
+    def value(self, row, col):
+        """Value of a cell, "" where the entry has no value at the header path"""
+        column = self.columns[col]
+        if column is None:
+            column = self.column(col)
+        return column.get(row)
+
+    def display(self, row, col):
+        """Display text of a cell"""
+        column = self.columns[col]
+        if column is None:
+            column = self.column(col)
+        return column.display(row)
+
+    def column(self, col):
+        """The Column of a header, built on first use"""
+        column = self.columns[col]
+        if column is None:
+            column = self.columns[col] = build_column(self.entries, self.paths[col])
+        return column
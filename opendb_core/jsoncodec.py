@@ -0,0 +1,117 @@
+"""
+JSON parsing and serialization with a fast backend when one is installed.
+
+orjson is used when available and the stdlib json module otherwise. Either
+way the results are the same as with the stdlib:
+
+- Documents the fast parser rejects (NaN, integers beyond 64 bits, lone
+  surrogates, syntax errors) are parsed again with the stdlib, so they are
+  accepted or reported with the same json.JSONDecodeError messages as before.
+- dumps_pretty() writes exactly what json.dumps(indent=2, ensure_ascii=False)
+  does, so saved entry files don't change byte for byte. Values whose
+  formatting differs between the two (floats, very large integers and
+  non-string keys) are always written by the stdlib.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used instead
+    orjson = None
+
+STDLIB = "stdlib"
+ORJSON = "orjson"
+
+_backend = ORJSON if orjson is not None else STDLIB
+
+# Largest integer orjson writes; larger ones go through the stdlib
+_MAX_INT = 2 ** 63 - 1
+
+
+def available_backends():
+    """Names of the backends that can be used"""
+    return [STDLIB] + ([ORJSON] if orjson is not None else [])
+
+
+def backend():
+    """Name of the backend in use"""
+    return _backend
+
+
+def set_backend(name):
+    """Select the backend by name; raises ValueError if it isn't available"""
+    global _backend
+    if name not in available_backends():
+        raise ValueError(f"JSON backend not available: {name}")
+    _backend = name
+
+
+def loads(data):
+    """Parse a JSON document from str or UTF-8 bytes"""
+    if _backend == ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def load_file(path):
+    """Read and parse a UTF-8 JSON file"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if _backend == ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    # Decoded as the file was read before, so encoding errors read the same
+    return json.loads(data.decode("utf-8"))
+
+
+def dumps(value):
+    """Compact JSON text, for storing values rather than for people to read"""
+    if _backend == ORJSON and _orjson_safe(value):
+        try:
+            return orjson.dumps(value).decode("utf-8")
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps_pretty(value):
+    """Same text as json.dumps(value, indent=2, ensure_ascii=False)"""
+    if _backend == ORJSON and _orjson_safe(value):
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # Lone surrogates or nesting deeper than orjson supports
+            pass
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+
+def _orjson_safe(value):
+    """Whether orjson writes value exactly like the stdlib does"""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type is str or value_type is bool or value is None:
+            continue
+        if value_type is int:
+            if -_MAX_INT - 1 <= value <= _MAX_INT:
+                continue
+            return False
+        if value_type is dict:
+            for key in value:
+                if type(key) is not str:
+                    return False
+            stack.extend(value.values())
+        elif value_type is list:
+            stack.extend(value)
+        else:
+            # Floats are formatted differently; tuples, subclasses and other
+            # types are left to the stdlib as well
+            return False
+    return True
@@ -0,0 +1,9 @@
+"""Default locations of the schema, data and cache directories"""
+
+from pathlib import Path
+
+# Set up paths relative to the scripts directory
+SCRIPT_DIR = Path(__file__).resolve().parent.parent
+SCHEMA_DIR = SCRIPT_DIR.parent / "schemas"
+DATA_DIR = SCRIPT_DIR.parent / "open-db"
+CACHE_DIR = SCRIPT_DIR / ".cache"
@@ -0,0 +1,476 @@
+"""
+Structured queries over entry fields, for example
+
+    cores>=8 AND socket=AM5 AND tdp<120
+    manufacturer in (AMD, Intel) AND NOT unlocked
+    metadata.released is null OR name ~ "ryzen"
+
+Fields are the dotted paths of the schema. Predicates compare typed values:
+numbers compare numerically, strings case-insensitively, and true, false and
+null are literals. Supported operators are =, !=, <, <=, >, >=, ~ (contains),
+in (...), is null and is not null. A bare field name matches when its value is
+true. Predicates combine with AND, OR, NOT and parentheses.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+
+class QueryError(ValueError):
+    """Raised for queries that can't be parsed or refer to unknown fields"""
+
+
+_TOKEN_RE = re.compile(
+    r"""
+    \s*(?:
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<op>>=|<=|!=|==|=|<|>|~)
+      | (?P<punct>[(),])
+      | (?P<word>[^\s()<>=!~,"']+)
+    )
+    """,
+    re.VERBOSE,
+)
+
+_KEYWORDS = {"and", "or", "not", "in", "is", "null", "true", "false"}
+
+
+def tokenize(text):
+    """Split a query into (kind, value) tokens"""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if not match or match.end() == position:
+            # Point at the offending character, not the whitespace before it
+            while text[position].isspace():
+                position += 1
+            raise QueryError(f"Unexpected character at position {position}: {text[position]!r}")
+        position = match.end()
+
+        if match.group("string") is not None:
+            raw = match.group("string")[1:-1]
+            tokens.append(("string", re.sub(r"\\(.)", r"\1", raw)))
+        elif match.group("op") is not None:
+            op = match.group("op")
+            tokens.append(("op", "=" if op == "==" else op))
+        elif match.group("punct") is not None:
+            tokens.append((match.group("punct"), match.group("punct")))
+        else:
+            word = match.group("word")
+            if word.lower() in _KEYWORDS:
+                tokens.append(("keyword", word.lower()))
+            else:
+                tokens.append(("word", word))
+    return tokens
+
+
+def _literal(kind, value):
+    """Typed value of a literal token"""
+    if kind == "string":
+        return value
+    if kind == "keyword":
+        return {"null": None, "true": True, "false": False}[value]
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def resolve(entry, parts):
+    """Value at a pre-split dot path, or None if it doesn't exist"""
+    value = entry
+    for part in parts:
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return None
+    return value
+
+
+def _compare(value, op, literal):
+    """Apply a comparison operator to an entry value and a literal"""
+    if op in ("=", "!="):
+        if literal is None:
+            equal = value is None
+        elif isinstance(literal, bool):
+            equal = value is literal
+        elif _is_number(literal):
+            equal = _is_number(value) and value == literal
+        else:
+            equal = isinstance(value, str) and value.lower() == str(literal).lower()
+        return equal if op == "=" else not equal
+
+    if op == "~":
+        needle = str(literal).lower()
+        if isinstance(value, str):
+            return needle in value.lower()
+        if isinstance(value, list):
+            return any(isinstance(item, str) and needle in item.lower() for item in value)
+        return False
+
+    # Ordering: numbers with numbers, strings with strings
+    if _is_number(literal):
+        if not _is_number(value):
+            return False
+    elif isinstance(literal, str):
+        if not isinstance(value, str):
+            return False
+        value, literal = value.lower(), literal.lower()
+    else:
+        return False
+
+    if op == "<":
+        return value < literal
+    if op == "<=":
+        return value <= literal
+    if op == ">":
+        return value > literal
+    return value >= literal
+
+
+class Node:
+    """Base class of query syntax tree nodes"""
+
+    def matches(self, entry):
+        """Evaluate the query against a single entry"""
+        raise NotImplementedError
+
+    def evaluate(self, index):
+        """Evaluate the query against a QueryIndex, returning the matching ids"""
+        raise NotImplementedError
+
+
+class And(Node):
+    def __init__(self, children):
+        self.children = children
+
+    def matches(self, entry):
+        return all(child.matches(entry) for child in self.children)
+
+    def evaluate(self, index):
+        result = None
+        for child in self.children:
+            ids = child.evaluate(index)
+            result = set(ids) if result is None else result & ids
+            if not result:
+                break
+        return result or set()
+
+
+class Or(Node):
+    def __init__(self, children):
+        self.children = children
+
+    def matches(self, entry):
+        return any(child.matches(entry) for child in self.children)
+
+    def evaluate(self, index):
+        result = set()
+        for child in self.children:
+            result |= child.evaluate(index)
+        return result
+
+
+class Not(Node):
+    def __init__(self, child):
+        self.child = child
+
+    def matches(self, entry):
+        return not self.child.matches(entry)
+
+    def evaluate(self, index):
+        return index.all_ids - self.child.evaluate(index)
+
+
+class Compare(Node):
+    def __init__(self, field, op, value):
+        self.field = field
+        self.parts = tuple(field.split("."))
+        self.op = op
+        self.value = value
+
+    def matches(self, entry):
+        return _compare(resolve(entry, self.parts), self.op, self.value)
+
+    def evaluate(self, index):
+        return index.field(self.field).compare(self.op, self.value)
+
+
+class In(Node):
+    def __init__(self, field, values):
+        self.field = field
+        self.parts = tuple(field.split("."))
+        self.values = values
+
+    def matches(self, entry):
+        value = resolve(entry, self.parts)
+        return any(_compare(value, "=", literal) for literal in self.values)
+
+    def evaluate(self, index):
+        field_index = index.field(self.field)
+        result = set()
+        for literal in self.values:
+            result |= field_index.compare("=", literal)
+        return result
+
+
+class IsTrue(Node):
+    """A bare field name: matches entries where the field is true"""
+
+    def __init__(self, field):
+        self.field = field
+        self.parts = tuple(field.split("."))
+
+    def matches(self, entry):
+        return resolve(entry, self.parts) is True
+
+    def evaluate(self, index):
+        return index.field(self.field).compare("=", True)
+
+
+class Parser:
+    """Recursive descent parser producing a Node tree"""
+
+    def __init__(self, text, fields=None):
+        self.tokens = tokenize(text)
+        self.position = 0
+        self.fields = None
+        if fields is not None:
+            self.fields = {field.lower(): field for field in fields}
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def expect(self, kind, value=None):
+        token_kind, token_value = self.take()
+        if token_kind != kind or (value is not None and token_value != value):
+            found = token_value if token_kind else "end of query"
+            raise QueryError(f"Expected {value or kind}, found {found!r}")
+        return token_value
+
+    def at_keyword(self, *keywords):
+        kind, value = self.peek()
+        return kind == "keyword" and value in keywords
+
+    def parse(self):
+        if not self.tokens:
+            raise QueryError("Empty query")
+        node = self.parse_or()
+        if self.position < len(self.tokens):
+            raise QueryError(f"Unexpected {self.peek()[1]!r}")
+        return node
+
+    def parse_or(self):
+        children = [self.parse_and()]
+        while self.at_keyword("or"):
+            self.take()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def parse_and(self):
+        children = [self.parse_not()]
+        while self.at_keyword("and"):
+            self.take()
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else And(children)
+
+    def parse_not(self):
+        if self.at_keyword("not"):
+            self.take()
+            return Not(self.parse_not())
+        return self.parse_primary()
+
+    def parse_primary(self):
+        if self.peek()[0] == "(":
+            self.take()
+            node = self.parse_or()
+            self.expect(")")
+            return node
+        return self.parse_predicate()
+
+    def field_name(self, name):
+        if self.fields is None:
+            return name
+        field = self.fields.get(name.lower())
+        if field is None:
+            raise QueryError(f"Unknown field {name!r}")
+        return field
+
+    def parse_value(self):
+        kind, value = self.take()
+        if kind in ("word", "string") or (kind == "keyword" and value in ("null", "true", "false")):
+            return _literal(kind, value)
+        found = value if kind else "end of query"
+        raise QueryError(f"Expected a value, found {found!r}")
+
+    def parse_predicate(self):
+        kind, name = self.take()
+        if kind != "word":
+            found = name if kind else "end of query"
+            raise QueryError(f"Expected a field name, found {found!r}")
+        field = self.field_name(name)
+
+        kind, value = self.peek()
+        if kind == "op":
+            self.take()
+            return Compare(field, value, self.parse_value())
+
+        if self.at_keyword("in"):
+            self.take()
+            self.expect("(")
+            values = [self.parse_value()]
+            while self.peek()[0] == ",":
+                self.take()
+                values.append(self.parse_value())
+            self.expect(")")
+            return In(field, values)
+
+        if self.at_keyword("is"):
+            self.take()
+            negate = self.at_keyword("not")
+            if negate:
+                self.take()
+            self.expect("keyword", "null")
+            return Compare(field, "!=" if negate else "=", None)
+
+        return IsTrue(field)
+
+
+def parse(text, fields=None):
+    """
+    Parse a query into a Node tree. When fields is given, field names are
+    checked against it (case-insensitively). Raises QueryError.
+    """
+    return Parser(text, fields).parse()
+
+
+@lru_cache(maxsize=32)
+def compile_query(text, fields=None):
+    """Parse a query once per text and tuple of fields; raises QueryError"""
+    return parse(text, fields)
+
+
+class FieldIndex:
+    """
+    Typed index of one field: sorted numeric and string values for range
+    lookups with bisect, and id sets for booleans and nulls
+    """
+
+    def __init__(self, field, entries):
+        parts = tuple(field.split("."))
+        numbers = []
+        strings = []
+        self.true_ids = set()
+        self.false_ids = set()
+        self.null_ids = set()
+        # Entries with list or object values, only reachable through ~ and !=
+        self.other = []
+
+        for entry_id, entry in entries:
+            value = resolve(entry, parts)
+            if value is None:
+                self.null_ids.add(entry_id)
+            elif value is True:
+                self.true_ids.add(entry_id)
+            elif value is False:
+                self.false_ids.add(entry_id)
+            elif _is_number(value):
+                numbers.append((value, entry_id))
+            elif isinstance(value, str):
+                strings.append((value.lower(), entry_id))
+            else:
+                self.other.append((entry_id, value))
+
+        numbers.sort(key=lambda item: item[0])
+        strings.sort(key=lambda item: item[0])
+        self.number_keys = [value for value, _ in numbers]
+        self.number_ids = [entry_id for _, entry_id in numbers]
+        self.string_keys = [value for value, _ in strings]
+        self.string_ids = [entry_id for _, entry_id in strings]
+
+    @staticmethod
+    def _range(keys, ids, op, literal):
+        if op == "=":
+            start, end = bisect_left(keys, literal), bisect_right(keys, literal)
+        elif op == "<":
+            start, end = 0, bisect_left(keys, literal)
+        elif op == "<=":
+            start, end = 0, bisect_right(keys, literal)
+        elif op == ">":
+            start, end = bisect_right(keys, literal), len(keys)
+        else:
+            start, end = bisect_left(keys, literal), len(keys)
+        return set(ids[start:end])
+
+    def compare(self, op, literal):
+        """Ids of entries whose value satisfies op against literal"""
+        if op == "!=":
+            return self.all_ids() - self.compare("=", literal)
+
+        if op == "~":
+            needle = str(literal).lower()
+            result = {
+                entry_id for key, entry_id in zip(self.string_keys, self.string_ids)
+                if needle in key
+            }
+            result.update(
+                entry_id for entry_id, value in self.other
+                if _compare(value, "~", literal)
+            )
+            return result
+
+        if op == "=" and literal is None:
+            return set(self.null_ids)
+        if isinstance(literal, bool):
+            if op != "=":
+                return set()
+            return set(self.true_ids if literal else self.false_ids)
+        if _is_number(literal):
+            return self._range(self.number_keys, self.number_ids, op, literal)
+        if isinstance(literal, str):
+            return self._range(self.string_keys, self.string_ids, op, literal.lower())
+        return set()
+
+    def all_ids(self):
+        return (
+            set(self.number_ids) | set(self.string_ids) | self.true_ids | self.false_ids
+            | self.null_ids | {entry_id for entry_id, _ in self.other}
+        )
+
+
+class QueryIndex:
+    """Per-field indexes over a set of entries, built lazily for queried fields"""
+
+    def __init__(self, entries):
+        # (entry_id, entry) pairs
+        self.entries = [(entry.get("opendb_id"), entry) for entry in entries]
+        self.all_ids = {entry_id for entry_id, _ in self.entries}
+        self._fields = {}
+
+    def field(self, field):
+        field_index = self._fields.get(field)
+        if field_index is None:
+            field_index = self._fields[field] = FieldIndex(field, self.entries)
+        return field_index
+
+    def search(self, node):
+        """Ids of the entries matching a parsed query"""
+        return node.evaluate(self)
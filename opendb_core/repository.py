@@ -0,0 +1,622 @@
+"""Loading and saving of schemas and per-category entry files"""
+
+import os
+import pickle
+import secrets
+import sqlite3
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from . import jsoncodec
+from .paths import DATA_DIR, SCHEMA_DIR
+from .snapshot import CategorySnapshot
+
+
+class EntryCache:
+    """
+    Persistent SQLite cache of parsed entries for one category directory.
+
+    Each row stores the parsed entry of one file together with the file's
+    mtime, size and inode, so unchanged files can be loaded without re-parsing.
+    """
+
+    FORMAT_VERSION = "2"
+
+    def __init__(self, cache_path, category_dir):
+        cache_path = Path(cache_path)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(str(cache_path))
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "filename TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, "
+            "inode INTEGER, entry BLOB)"
+        )
+
+        # Drop the cached entries if they belong to another directory or format
+        expected = {
+            "format_version": self.FORMAT_VERSION,
+            "category_dir": str(Path(category_dir).resolve()),
+        }
+        stored = dict(self.connection.execute("SELECT key, value FROM meta"))
+        if stored != expected:
+            with self.connection:
+                self.connection.execute("DELETE FROM entries")
+                self.connection.execute("DELETE FROM meta")
+                self.connection.executemany(
+                    "INSERT INTO meta (key, value) VALUES (?, ?)", expected.items()
+                )
+
+    def stats(self):
+        """Return {filename: (mtime_ns, size, inode)} for every cached file"""
+        rows = self.connection.execute(
+            "SELECT filename, mtime_ns, size, inode FROM entries"
+        )
+        return {filename: (mtime_ns, size, inode) for filename, mtime_ns, size, inode in rows}
+
+    def get_entries(self, filenames):
+        """Return {filename: entry} for the given cached files"""
+        entries = {}
+        filenames = list(filenames)
+        # Stay well below SQLite's host parameter limit
+        for start in range(0, len(filenames), 500):
+            batch = filenames[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                f"SELECT filename, entry FROM entries WHERE filename IN ({placeholders})",
+                batch,
+            )
+            for filename, blob in rows:
+                entries[filename] = pickle.loads(blob)
+        return entries
+
+    def update(self, stored, removed):
+        """
+        Store freshly parsed entries and forget removed files.
+
+        stored is a list of (filename, (mtime_ns, size, inode), entry) tuples and
+        removed is an iterable of filenames.
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO entries (filename, mtime_ns, size, inode, entry) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (filename, *stat_key, pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+                    for filename, stat_key, entry in stored
+                ),
+            )
+            self.connection.executemany(
+                "DELETE FROM entries WHERE filename = ?",
+                ((filename,) for filename in removed),
+            )
+
+    def close(self):
+        self.connection.close()
+
+
+class CategoryLoader:
+    """Reads and parses the entry files of a category using a thread pool"""
+
+    def __init__(self, max_workers=None, cache_dir=None, snapshot_dir=None):
+        self.max_workers = max_workers or default_loader_workers()
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+
+    @staticmethod
+    def read_entry(data_file):
+        """Read and parse a single entry file; raises ValueError if it is not an object"""
+        entry = jsoncodec.load_file(data_file)
+        if not isinstance(entry, dict):
+            raise ValueError("top-level value is not an object")
+        return entry
+
+    def _load_one(self, data_file):
+        try:
+            return data_file, self.read_entry(data_file), None
+        except Exception as e:
+            return data_file, None, str(e)
+
+    @staticmethod
+    def scan(category_dir):
+        """Return {filename: (mtime_ns, size, inode)} for every *.json file"""
+        stats = {}
+        with os.scandir(category_dir) as it:
+            for dir_entry in it:
+                if not dir_entry.name.endswith(".json") or not dir_entry.is_file():
+                    continue
+                st = dir_entry.stat()
+                stats[dir_entry.name] = (st.st_mtime_ns, st.st_size, dir_entry.inode())
+        return stats
+
+    def open_cache(self, category_dir):
+        """
+        Open the category snapshot or the entry cache for category_dir,
+        or return None if neither is available
+        """
+        if self.snapshot_dir is not None:
+            try:
+                self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+                return CategorySnapshot(
+                    self.snapshot_dir / f"{Path(category_dir).name}.snapshot", category_dir
+                )
+            except OSError:
+                return None
+
+        if self.cache_dir is None:
+            return None
+
+        cache_path = self.cache_dir / f"{Path(category_dir).name}.entries.sqlite"
+        try:
+            return EntryCache(cache_path, category_dir)
+        except (sqlite3.Error, OSError):
+            # Loading still works without the cache, just slower
+            return None
+
+    def iter_chunks(self, category_dir, chunk_size=500, stats=None, entry_ids=None):
+        """
+        Load every *.json file in category_dir, yielding results in chunks.
+
+        Yields tuples (entries, errors, done, total) where entries is a list of
+        parsed entries that have an opendb_id, errors is a list of (path, message)
+        tuples for files that could not be read or parsed, and done/total count
+        the files processed so far. Closing the generator early cancels any
+        files that have not been read yet.
+
+        Files whose mtime, size and inode match the category snapshot or the
+        entry cache are taken from it and yielded first; only the remaining
+        files are parsed. A fresh snapshot means no entry file is opened.
+        stats is the result of scan(category_dir) if the caller already has it.
+        If entry_ids is a dict, the file name of every yielded entry is added
+        to it, mapped to the entry's opendb_id.
+        """
+        category_dir = Path(category_dir)
+        if stats is None:
+            stats = self.scan(category_dir)
+        total = len(stats)
+        entries = []
+        errors = []
+        done = 0
+
+        cache = self.open_cache(category_dir)
+        try:
+            cached_stats = cache.stats() if cache is not None else {}
+            unchanged = sorted(
+                filename for filename, stat_key in stats.items()
+                if cached_stats.get(filename) == stat_key
+            )
+            changed = sorted(set(stats) - set(unchanged))
+
+            # Cached entries need no parsing, so they provide the first rows
+            for start in range(0, len(unchanged), chunk_size):
+                batch = unchanged[start:start + chunk_size]
+                cached_entries = cache.get_entries(batch)
+                for filename in batch:
+                    done += 1
+                    entry = cached_entries.get(filename)
+                    if isinstance(entry, dict) and entry.get("opendb_id"):
+                        entries.append(entry)
+                        if entry_ids is not None:
+                            entry_ids[filename] = entry["opendb_id"]
+
+                if len(entries) >= chunk_size:
+                    yield entries, errors, done, total
+                    entries, errors = [], []
+
+            stored = []
+            failed = set()
+            if changed:
+                executor = ThreadPoolExecutor(max_workers=self.max_workers)
+                data_files = [category_dir / filename for filename in changed]
+                try:
+                    for data_file, entry, error in executor.map(self._load_one, data_files):
+                        done += 1
+                        if error is not None:
+                            errors.append((data_file, error))
+                            failed.add(data_file.name)
+                            continue
+
+                        stored.append((data_file.name, stats[data_file.name], entry))
+                        if isinstance(entry, dict) and entry.get("opendb_id"):
+                            entries.append(entry)
+                            if entry_ids is not None:
+                                entry_ids[data_file.name] = entry["opendb_id"]
+
+                        if len(entries) >= chunk_size:
+                            yield entries, errors, done, total
+                            entries, errors = [], []
+                finally:
+                    executor.shutdown(wait=False, cancel_futures=True)
+
+            if cache is not None:
+                removed = (set(cached_stats) - set(stats)) | failed
+                try:
+                    cache.update(stored, removed)
+                except (sqlite3.Error, OSError):
+                    pass
+        finally:
+            if cache is not None:
+                cache.close()
+
+        yield entries, errors, done, total
+
+    def read_changes(self, category_dir, known_stats):
+        """
+        Find the files of category_dir that were added, modified or removed
+        since known_stats (a previous scan() result) and parse the new ones.
+
+        Returns a tuple (stats, updated, removed, errors) where stats is the
+        current scan() result, updated is a list of (filename, entry) tuples
+        for the added or modified files that could be parsed, with entry None
+        if the file has no opendb_id, removed lists the names of removed
+        files, and errors is a list of (path, message) tuples.
+        """
+        category_dir = Path(category_dir)
+        stats = self.scan(category_dir)
+        changed = sorted(
+            filename for filename, stat_key in stats.items()
+            if known_stats.get(filename) != stat_key
+        )
+        removed = sorted(set(known_stats) - set(stats))
+
+        updated = []
+        errors = []
+        for data_file, entry, error in self.read_files(category_dir, changed):
+            if error is not None:
+                errors.append((data_file, error))
+            elif isinstance(entry, dict) and entry.get("opendb_id"):
+                updated.append((data_file.name, entry))
+            else:
+                updated.append((data_file.name, None))
+        return stats, updated, removed, errors
+
+    def read_files(self, category_dir, filenames):
+        """
+        Read and parse the given files of category_dir in parallel.
+
+        Returns a list of (path, entry, error) tuples in the order of
+        filenames, where error is a message if the file could not be parsed.
+        """
+        if not filenames:
+            return []
+        data_files = [Path(category_dir) / filename for filename in filenames]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self._load_one, data_files))
+
+    def load(self, category_dir):
+        """
+        Load every *.json file in category_dir.
+
+        Returns a tuple (entries, errors) with the same meaning as in iter_chunks.
+        """
+        entries = []
+        errors = []
+        for chunk_entries, chunk_errors, _, _ in self.iter_chunks(category_dir):
+            entries.extend(chunk_entries)
+            errors.extend(chunk_errors)
+        return entries, errors
+
+
+def default_loader_workers():
+    """Default number of loader threads, following ThreadPoolExecutor's I/O heuristic"""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def format_error_summary(errors, limit=20):
+    """Build one message from a list of (path, message) tuples"""
+    lines = [f"{Path(path).name}: {message}" for path, message in errors[:limit]]
+    if len(errors) > limit:
+        lines.append(f"... and {len(errors) - limit} more")
+    return "\n".join(lines)
+
+
+def fsync_directory(directory):
+    """Make renames in a directory durable, where the platform supports it"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # e.g. Windows, where directories can't be opened
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def create_temp_file(path):
+    """
+    Create a new file next to path for writing its replacement and return
+    (fd, temp_path).
+
+    Unlike with mkstemp, which creates files readable only by the owner, the
+    file gets the permissions of the file it replaces, or those of any newly
+    created file (0666 less the umask, applied by the OS) if there is none.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        mode = None
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        temp_path = path.parent / f".{path.name}.{secrets.token_hex(4)}.tmp"
+        try:
+            fd = os.open(temp_path, flags, 0o666)
+            break
+        except FileExistsError:
+            continue
+    if mode is not None and hasattr(os, "fchmod"):
+        try:
+            os.fchmod(fd, mode)
+        except BaseException:
+            os.close(fd)
+            os.unlink(temp_path)
+            raise
+    return fd, temp_path
+
+
+def write_temp_json(path, data, fsync=True):
+    """
+    Write data as JSON to a temporary file next to path and return its path.
+    The temporary name doesn't end in .json, so loaders never pick it up.
+    """
+    path = Path(path)
+    fd, temp_path = create_temp_file(path)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(jsoncodec.dumps_pretty(data))
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return Path(temp_path)
+
+
+def atomic_write_json(path, data, fsync=True):
+    """
+    Replace path with data written as JSON, so that readers and crashes only
+    ever see the old or the new file, never a partly written one. With fsync
+    the new content is on disk when this returns.
+    """
+    temp_path = write_temp_json(path, data, fsync)
+    try:
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    if fsync:
+        fsync_directory(Path(path).parent)
+
+
+class WriteBatch:
+    """
+    Entry writes that share a single round of fsyncs.
+
+    Each write goes to a temporary file right away; commit() syncs them all
+    to disk, renames them into place and syncs each directory once. Every
+    file is replaced atomically, but the batch as a whole is not: if a rename
+    fails, the files renamed before it keep their new content and the
+    remaining writes are dropped. If the batch fails or is discarded before
+    commit, the temporary files are removed and no entry file changes.
+
+        with repository.write_batch() as batch:
+            for entry in entries:
+                batch.save_entry(category, entry)
+    """
+
+    def __init__(self, repository, fsync=True):
+        self.repository = repository
+        self.fsync = fsync
+        # {target path: temporary path}; a later write of the same path replaces the earlier one
+        self._pending = {}
+
+    def save_entry(self, category, entry_data):
+        """Stage an entry write and return the path it will be written to"""
+        file_path = self.repository.prepare_entry_path(category, entry_data)
+        # Synced all at once in commit()
+        temp_path = write_temp_json(file_path, entry_data, fsync=False)
+        previous = self._pending.pop(file_path, None)
+        if previous is not None:
+            os.unlink(previous)
+        self._pending[file_path] = temp_path
+        return file_path
+
+    def commit(self):
+        """
+        Make all staged writes durable and visible. If this raises, some of
+        the files may already have been replaced; the others are unchanged.
+        """
+        pending = self._pending
+        self._pending = {}
+        try:
+            if self.fsync:
+                for temp_path in pending.values():
+                    # Windows only syncs descriptors opened for writing
+                    with open(temp_path, "r+b") as f:
+                        os.fsync(f.fileno())
+        except BaseException:
+            self._pending = pending
+            self.discard()
+            raise
+
+        directories = set()
+        try:
+            for file_path, temp_path in list(pending.items()):
+                os.replace(temp_path, file_path)
+                del pending[file_path]
+                directories.add(file_path.parent)
+        except BaseException:
+            self._pending = pending
+            self.discard()
+            raise
+
+        if self.fsync:
+            for directory in directories:
+                fsync_directory(directory)
+
+    def discard(self):
+        """Drop all staged writes"""
+        for temp_path in self._pending.values():
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+
+class Repository:
+    """
+    Headless access to an open-db tree: one schema file per category in
+    schema_dir and one <opendb_id>.json file per entry in data_dir/<category>
+    """
+
+    def __init__(self, data_dir=DATA_DIR, schema_dir=SCHEMA_DIR, cache_dir=None,
+                 max_workers=None, fsync=True, snapshot_dir=None):
+        self.data_dir = Path(data_dir)
+        self.schema_dir = Path(schema_dir)
+        # Entry cache directory, or None to always parse every file
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_workers = max_workers
+        # Directory of packed category snapshots, used instead of the entry cache
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        # Whether writes are synced to disk before they count as done
+        self.fsync = fsync
+
+    def schema_path(self, category):
+        return self.schema_dir / f"{category}.schema.json"
+
+    def category_dir(self, category):
+        return self.data_dir / category
+
+    def entry_path(self, category, entry_id):
+        return self.category_dir(category) / f"{entry_id}.json"
+
+    def categories(self):
+        """Names of all categories that have a schema file"""
+        return [
+            schema_file.name.split(".")[0]
+            for schema_file in self.schema_dir.glob("*.schema.json")
+        ]
+
+    def load_schema(self, category):
+        """Load the schema of a category"""
+        return jsoncodec.load_file(self.schema_path(category))
+
+    def load_schemas(self):
+        """
+        Load all available schemas.
+
+        Returns a tuple (schemas, errors) where schemas maps category to schema
+        and errors is a list of (path, message) tuples.
+        """
+        schemas = {}
+        errors = []
+        for schema_file in self.schema_dir.glob("*.schema.json"):
+            category = schema_file.name.split(".")[0]
+            try:
+                schemas[category] = jsoncodec.load_file(schema_file)
+            except Exception as e:
+                errors.append((schema_file, str(e)))
+        return schemas, errors
+
+    def save_schema(self, category, schema):
+        """Write the schema of a category"""
+        atomic_write_json(self.schema_path(category), schema, self.fsync)
+
+    def loader(self):
+        """CategoryLoader configured for this repository"""
+        return CategoryLoader(self.max_workers, self.cache_dir, self.snapshot_dir)
+
+    def iter_category_chunks(self, category, chunk_size=500, stats=None, entry_ids=None):
+        """Load a category in chunks, see CategoryLoader.iter_chunks"""
+        category_dir = self.category_dir(category)
+        category_dir.mkdir(parents=True, exist_ok=True)
+        return self.loader().iter_chunks(category_dir, chunk_size, stats, entry_ids)
+
+    def scan_category(self, category):
+        """Current file stats of a category, see CategoryLoader.scan"""
+        category_dir = self.category_dir(category)
+        category_dir.mkdir(parents=True, exist_ok=True)
+        return CategoryLoader.scan(category_dir)
+
+    def count_category_files(self, category):
+        """Number of entry files of a category, from the directory listing alone"""
+        category_dir = self.category_dir(category)
+        if not category_dir.is_dir():
+            return 0
+        with os.scandir(category_dir) as it:
+            return sum(1 for dir_entry in it if dir_entry.name.endswith(".json"))
+
+    def read_category_changes(self, category, known_stats):
+        """Entry files changed since known_stats, see CategoryLoader.read_changes"""
+        return self.loader().read_changes(self.category_dir(category), known_stats)
+
+    def scan_schemas(self):
+        """Current file stats of the schema directory, see CategoryLoader.scan"""
+        if not self.schema_dir.is_dir():
+            return {}
+        return CategoryLoader.scan(self.schema_dir)
+
+    def open_snapshot(self, category):
+        """
+        The packed snapshot of a category for random access by opendb_id, or
+        None if snapshots are disabled. It may be older than the entry files.
+        """
+        if self.snapshot_dir is None:
+            return None
+        return CategorySnapshot(
+            self.snapshot_dir / f"{category}.snapshot", self.category_dir(category)
+        )
+
+    def load_category(self, category):
+        """Load all entries of a category, returning (entries, errors)"""
+        category_dir = self.category_dir(category)
+        category_dir.mkdir(parents=True, exist_ok=True)
+        return self.loader().load(category_dir)
+
+    def prepare_entry_path(self, category, entry_data):
+        """Path of an entry's file, creating the category directory if needed"""
+        entry_id = entry_data.get("opendb_id")
+        if not entry_id:
+            raise ValueError("Entry has no opendb_id")
+
+        file_path = self.entry_path(category, entry_id)
+
+        # Create directory if it doesn't exist
+        file_path.parent.mkdir(exist_ok=True)
+        return file_path
+
+    def save_entry(self, category, entry_data):
+        """Write an entry to <category>/<opendb_id>.json and return the path"""
+        file_path = self.prepare_entry_path(category, entry_data)
+        atomic_write_json(file_path, entry_data, self.fsync)
+        return file_path
+
+    def write_batch(self):
+        """WriteBatch for saving many entries with a single round of fsyncs"""
+        return WriteBatch(self, self.fsync)
+
+    def delete_entry(self, category, entry_id):
+        """Delete the file of an entry, if it exists"""
+        file_path = self.entry_path(category, entry_id)
+        if file_path.exists():
+            file_path.unlink()
@@ -0,0 +1,169 @@
+"""Write-behind queue that saves and deletes entry files on a background thread"""
+
+import copy
+import threading
+
+# Pending operations
+SAVE = "save"
+DELETE = "delete"
+
+
+class SaveQueue:
+    """
+    Accepts entry saves and deletes immediately and applies them to the
+    repository in batches on a background thread.
+
+    Operations on the same entry are coalesced: only the latest one is
+    written. Saves of a batch go through a single Repository.write_batch(),
+    so they share one round of fsyncs. A batch starts flush_delay seconds
+    after the first queued operation, to collect quick successive edits.
+
+    Callbacks are called from the background thread:
+    on_pending(count) when the number of pending operations changes,
+    on_flushed(count) after a batch has been written, and
+    on_error(exception) when a batch failed. Failed operations stay queued
+    and are retried with the next operation or flush().
+    """
+
+    def __init__(self, repository, flush_delay=0.5, on_pending=None, on_flushed=None,
+                 on_error=None):
+        self.repository = repository
+        self.flush_delay = flush_delay
+        self.on_pending = on_pending
+        self.on_flushed = on_flushed
+        self.on_error = on_error
+
+        # {(category, opendb_id): (operation, entry)} in the order first queued
+        self._pending = {}
+        self._flushing = 0
+        self._paused = False
+        # Number of flush() calls waiting, which skip the flush delay
+        self._flush_requests = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="SaveQueue", daemon=True)
+        self._thread.start()
+
+    def save(self, category, entry_data):
+        """Queue a write of an entry; raises ValueError if it has no opendb_id"""
+        entry_id = entry_data.get("opendb_id")
+        if not entry_id:
+            raise ValueError("Entry has no opendb_id")
+        # The caller may keep editing its dict; write the entry as it is now
+        self._queue(category, entry_id, SAVE, copy.deepcopy(entry_data))
+
+    def delete(self, category, entry_id):
+        """Queue the deletion of an entry's file"""
+        self._queue(category, entry_id, DELETE, None)
+
+    def _queue(self, category, entry_id, operation, entry_data):
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Save queue is closed")
+            key = (category, entry_id)
+            # Re-queue at the end, so the latest operation is written last
+            self._pending.pop(key, None)
+            self._pending[key] = (operation, entry_data)
+            self._paused = False
+            count = self._pending_count()
+            self._condition.notify_all()
+        self._notify(self.on_pending, count)
+
+    def pending_entry(self, category, entry_id):
+        """
+        The queued state of an entry: (SAVE, entry), (DELETE, None), or None
+        if nothing is queued for it
+        """
+        with self._condition:
+            return self._pending.get((category, entry_id))
+
+    def pending_count(self):
+        """Number of operations not yet written, including a batch being written"""
+        with self._condition:
+            return self._pending_count()
+
+    def _pending_count(self):
+        return len(self._pending) + self._flushing
+
+    def flush(self, timeout=None):
+        """
+        Write all queued operations now and wait until they are on disk.
+        Returns True if everything was written, False on error or timeout.
+        """
+        with self._condition:
+            self._paused = False
+            self._flush_requests += 1
+            self._condition.notify_all()
+            try:
+                return self._condition.wait_for(
+                    lambda: self._pending_count() == 0 or self._paused, timeout
+                ) and not self._pending
+            finally:
+                self._flush_requests -= 1
+
+    def close(self, timeout=None):
+        """Flush and stop the background thread; returns whether everything was written"""
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        return flushed
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or (self._pending and not self._paused)
+                )
+                if self._closed:
+                    return
+
+                # Give quick successive edits a moment to coalesce
+                self._condition.wait_for(
+                    lambda: self._flush_requests or self._closed, self.flush_delay
+                )
+                if self._paused or not self._pending:
+                    continue
+                batch = self._pending
+                self._pending = {}
+                self._flushing = len(batch)
+
+            error = None
+            try:
+                self._write(batch)
+            except Exception as e:
+                error = e
+
+            with self._condition:
+                self._flushing = 0
+                if error is not None:
+                    # Keep the failed operations unless they were superseded meanwhile
+                    for key, operation in batch.items():
+                        if key not in self._pending:
+                            self._pending[key] = operation
+                    self._paused = True
+                count = self._pending_count()
+                self._condition.notify_all()
+
+            if error is not None:
+                self._notify(self.on_error, error)
+            else:
+                self._notify(self.on_flushed, len(batch))
+            self._notify(self.on_pending, count)
+
+    def _write(self, batch):
+        with self.repository.write_batch() as write_batch:
+            for (category, entry_id), (operation, entry_data) in batch.items():
+                if operation == SAVE:
+                    write_batch.save_entry(category, entry_data)
+        # Deletes only go after every save was written. A failed batch is
+        # queued again as a whole; saves already written are written again.
+        for (category, entry_id), (operation, _) in batch.items():
+            if operation == DELETE:
+                self.repository.delete_entry(category, entry_id)
+
+    @staticmethod
+    def _notify(callback, value):
+        if callback is not None:
+            callback(value)
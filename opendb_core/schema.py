@@ -0,0 +1,257 @@
+"""JSON schema helpers and per-entry validation"""
+
+import hashlib
+import json
+
+
+class CompiledSchema:
+    """
+    Per-schema data needed to validate entries, built once and reused for
+    every entry validated against the same schema
+    """
+
+    def __init__(self, schema):
+        # Imported here so importing the core package stays cheap
+        from jsonschema import Draft7Validator
+
+        self.schema = schema
+        self.validator = Draft7Validator(schema)
+
+        # Field lists, including nested ones with dot notation
+        self.all_fields = SchemaHelper.get_all_properties(schema)
+        self.required_fields = SchemaHelper.get_required_fields(schema)
+        self.required_set = set(self.required_fields)
+        self.optional_fields = [f for f in self.all_fields if f not in self.required_set]
+
+        # Dot paths split once instead of once per entry
+        self.required_paths = [(f, tuple(f.split("."))) for f in self.required_fields]
+        self.optional_paths = [(f, tuple(f.split("."))) for f in self.optional_fields]
+
+        # Identifies this schema version in the validation result cache
+        self.fingerprint = content_hash(schema)
+
+
+def content_hash(data):
+    """Stable hash of JSON-compatible data, independent of key order"""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class SchemaHelper:
+    """Helper class for working with JSON schema"""
+
+    # Compiled schemas keyed by id() of the schema dict they were built from
+    _compiled_schemas = {}
+    MAX_COMPILED_SCHEMAS = 64
+
+    @staticmethod
+    def compile_schema(schema):
+        """Return the cached CompiledSchema for a schema, building it if needed"""
+        if isinstance(schema, CompiledSchema):
+            return schema
+
+        compiled = SchemaHelper._compiled_schemas.get(id(schema))
+        # The compiled schema keeps its source alive, so a matching id is the same dict
+        if compiled is None or compiled.schema is not schema:
+            compiled = CompiledSchema(schema)
+            # Keep the cache small when callers pass throwaway schema dicts
+            if len(SchemaHelper._compiled_schemas) >= SchemaHelper.MAX_COMPILED_SCHEMAS:
+                SchemaHelper._compiled_schemas.clear()
+            SchemaHelper._compiled_schemas[id(schema)] = compiled
+        return compiled
+
+    @staticmethod
+    def clear_compiled_schemas():
+        """Forget all compiled schemas, e.g. after a schema has been edited"""
+        SchemaHelper._compiled_schemas.clear()
+
+    @staticmethod
+    def get_all_properties(schema, prefix=""):
+        """Get all properties from a schema including nested ones"""
+        properties = []
+
+        if not schema or not isinstance(schema, dict):
+            return properties
+
+        schema_properties = schema.get("properties", {})
+
+        for prop_name, prop_data in schema_properties.items():
+            # Skip opendb_id for display
+            if prop_name == "opendb_id":
+                continue
+
+            # Add the property itself
+            prop_path = f"{prefix}{prop_name}" if prefix else prop_name
+            properties.append(prop_path)
+
+            # Check if this is an object with nested properties
+            prop_type = prop_data.get("type")
+
+            # Handle type that could be a list like ["object", "null"]
+            if isinstance(prop_type, list):
+                prop_type = next((t for t in prop_type if t != "null"), None)
+
+            if prop_type == "object" and "properties" in prop_data:
+                # Add nested properties with dot notation
+                nested_prefix = f"{prop_path}."
+                nested_props = SchemaHelper.get_all_properties(prop_data, nested_prefix)
+                properties.extend(nested_props)
+
+        return properties
+
+    @staticmethod
+    def get_property_types(schema, prefix=""):
+        """Get the JSON type of every property including nested ones, keyed by dotted path"""
+        types = {}
+
+        if not schema or not isinstance(schema, dict):
+            return types
+
+        for prop_name, prop_data in schema.get("properties", {}).items():
+            prop_path = f"{prefix}{prop_name}" if prefix else prop_name
+            prop_type = prop_data.get("type")
+
+            # Handle type that could be a list like ["object", "null"]
+            if isinstance(prop_type, list):
+                prop_type = next((t for t in prop_type if t != "null"), None)
+
+            if prop_type is not None:
+                types[prop_path] = prop_type
+
+            if prop_type == "object" and "properties" in prop_data:
+                types.update(SchemaHelper.get_property_types(prop_data, f"{prop_path}."))
+
+        return types
+
+    @staticmethod
+    def get_required_fields(schema, prefix=""):
+        """Get all required fields including nested ones with dot notation"""
+        required = []
+
+        if not schema or not isinstance(schema, dict):
+            return required
+
+        # Get top-level required fields
+        for field in schema.get("required", []):
+            if field != "opendb_id":  # Skip ID field
+                field_path = f"{prefix}{field}" if prefix else field
+                required.append(field_path)
+
+        # Check for required fields in nested objects
+        for prop_name, prop_data in schema.get("properties", {}).items():
+            prop_type = prop_data.get("type")
+
+            # Handle type that could be a list like ["object", "null"]
+            if isinstance(prop_type, list):
+                prop_type = next((t for t in prop_type if t != "null"), None)
+
+            if prop_type == "object" and "properties" in prop_data:
+                # Add nested required fields with dot notation
+                nested_prefix = f"{prefix}{prop_name}." if prefix else f"{prop_name}."
+                nested_required = SchemaHelper.get_required_fields(prop_data, nested_prefix)
+                required.extend(nested_required)
+
+        return required
+
+    @staticmethod
+    def validate_entry(entry_data, schema):
+        """
+        Validate a single entry against the schema, handling nested structures.
+
+        schema may be a schema dict or a CompiledSchema.
+        """
+        compiled = SchemaHelper.compile_schema(schema)
+        errors = sorted(compiled.validator.iter_errors(entry_data), key=lambda e: e.path)
+
+        results = {
+            "is_valid": len(errors) == 0,
+            "errors": [],
+            "missing_required": [],
+            "missing_optional": [],
+            "type_mismatches": [],
+        }
+
+        # Required fields, including nested ones
+        required_set = compiled.required_set
+
+        # Check for each error from the validator
+        for error in errors:
+            results["errors"].append(str(error))
+
+            # Handle missing required properties
+            if error.validator == "required":
+                parent_path = [str(p) for p in error.path]
+                parent_prefix = ".".join(parent_path)
+                parent_prefix = f"{parent_prefix}." if parent_prefix else ""
+
+                for missing in error.validator_value:
+                    # Skip opendb_id
+                    if missing == "opendb_id":
+                        continue
+
+                    # Create the full path to the missing field
+                    missing_path = f"{parent_prefix}{missing}"
+
+                    # Check if this is a required field
+                    if missing_path in required_set:
+                        results["missing_required"].append(missing_path)
+                    else:
+                        results["missing_optional"].append(missing_path)
+
+            # Handle type mismatches
+            elif error.validator == "type":
+                path = ".".join(str(p) for p in error.path)
+                expected = error.validator_value
+                actual = type(error.instance).__name__
+                results["type_mismatches"].append({
+                    "field": path,
+                    "expected": expected,
+                    "actual": actual,
+                    "value": error.instance,
+                })
+
+        # Check for empty values in required fields
+        for field, parts in compiled.required_paths:
+            # Get the field value using dot notation
+            value = entry_data
+            valid_path = True
+
+            for part in parts:
+                if isinstance(value, dict) and part in value:
+                    value = value[part]
+                else:
+                    valid_path = False
+                    break
+
+            if valid_path:
+                # Check for empty strings or null values
+                if isinstance(value, str) and value.strip() == "":
+                    if field not in results["missing_required"]:
+                        results["missing_required"].append(field)
+                elif value is None:
+                    if field not in results["missing_required"]:
+                        results["missing_required"].append(field)
+
+        # Check for missing optional fields
+        for field, parts in compiled.optional_paths:
+            # Get the field value using dot notation
+            value = entry_data
+            valid_path = True
+
+            for part in parts:
+                if isinstance(value, dict) and part in value:
+                    value = value[part]
+                else:
+                    valid_path = False
+                    break
+
+            if not valid_path or value is None:
+                results["missing_optional"].append(field)
+            elif isinstance(value, str) and value.strip() == "":
+                results["missing_optional"].append(field)
+
+        # Update is_valid based on our findings
+        if results["missing_required"] or results["type_mismatches"]:
+            results["is_valid"] = False
+
+        return results
@@ -0,0 +1,228 @@
+"""Inverted trigram index over the display text of table cells"""
+
+import re
+from functools import lru_cache
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Search modes, shared with AdvancedFilterProxyModel
+CONTAINS = 0
+EXACT = 1
+STARTS_WITH = 2
+ENDS_WITH = 3
+REGEX = 4
+# Structured field queries, answered by opendb_core.query rather than this index
+QUERY = 5
+
+
+def trigrams(text):
+    """Set of all 3-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+@lru_cache(maxsize=32)
+def compile_regex(pattern):
+    """Compile a search pattern once; raises re.error for invalid patterns"""
+    return re.compile(pattern)
+
+
+_ASCII_RUN = re.compile(r"[\x00-\x7f]+")
+
+
+@lru_cache(maxsize=32)
+def required_literals(pattern):
+    """
+    Lowercased ASCII substrings that every match of pattern must contain,
+    used to skip texts that can't match before running the regex
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, RecursionError):
+        return ()
+
+    # Case-insensitive matching also folds characters like "ſ" to "s", which
+    # lowercasing doesn't, so don't prefilter those patterns
+    if parsed.state.flags & re.IGNORECASE:
+        return ()
+
+    literals = []
+
+    def collect(items):
+        run = []
+        for op, arg in items:
+            if op == sre_parse.LITERAL:
+                run.append(chr(arg))
+                continue
+            if run:
+                literals.append("".join(run))
+                run = []
+            # A plain group is required as a whole, so its literals are too
+            if op == sre_parse.SUBPATTERN and not arg[1] & re.IGNORECASE:
+                collect(arg[-1])
+        if run:
+            literals.append("".join(run))
+
+    collect(parsed)
+    # Lowercasing non-ASCII text depends on context (a final "Σ" becomes "ς",
+    # not "σ"), so only the ASCII runs of a literal are sure to survive it
+    return tuple(
+        run.lower() for literal in literals for run in _ASCII_RUN.findall(literal)
+    )
+
+
+class ColumnIndex:
+    """
+    Index of one column. Rows are grouped by their exact cell text, and the
+    lowercased distinct texts are indexed by trigram, so a query only has to
+    check the few distinct values that share all trigrams of the search term.
+    """
+
+    def __init__(self):
+        self.ids_by_text = {}
+        self.texts_by_lower = {}
+        self.postings = {}
+
+    def add(self, entry_id, text):
+        ids = self.ids_by_text.get(text)
+        if ids is None:
+            ids = self.ids_by_text[text] = set()
+            lower = text.lower()
+            texts = self.texts_by_lower.get(lower)
+            if texts is None:
+                texts = self.texts_by_lower[lower] = set()
+                for trigram in trigrams(lower):
+                    self.postings.setdefault(trigram, set()).add(lower)
+            texts.add(text)
+        ids.add(entry_id)
+
+    def remove(self, entry_id, text):
+        ids = self.ids_by_text.get(text)
+        if ids is None:
+            return
+        ids.discard(entry_id)
+        if ids:
+            return
+
+        # Last row with this text: drop it from the lowercase and trigram maps
+        del self.ids_by_text[text]
+        lower = text.lower()
+        texts = self.texts_by_lower[lower]
+        texts.discard(text)
+        if texts:
+            return
+
+        del self.texts_by_lower[lower]
+        for trigram in trigrams(lower):
+            values = self.postings.get(trigram)
+            if values is not None:
+                values.discard(lower)
+                if not values:
+                    del self.postings[trigram]
+
+    def candidates(self, *terms):
+        """Lowercased distinct texts that may contain all terms (already lowercased)"""
+        term_trigrams = set()
+        for term in terms:
+            term_trigrams.update(trigrams(term))
+        if not term_trigrams:
+            return self.texts_by_lower.keys()
+
+        postings = []
+        for trigram in term_trigrams:
+            values = self.postings.get(trigram)
+            if not values:
+                return ()
+            postings.append(values)
+
+        # Intersect starting from the rarest trigram
+        postings.sort(key=len)
+        result = set(postings[0])
+        for values in postings[1:]:
+            result &= values
+            if not result:
+                break
+        return result
+
+    def matching_lower_texts(self, term, mode):
+        """Lowercased distinct texts matching term in a case insensitive mode"""
+        if mode == CONTAINS:
+            return [lower for lower in self.candidates(term) if term in lower]
+        if mode == STARTS_WITH:
+            return [lower for lower in self.candidates(term) if lower.startswith(term)]
+        if mode == ENDS_WITH:
+            return [lower for lower in self.candidates(term) if lower.endswith(term)]
+        return []
+
+    def search(self, term, mode, result):
+        """Add the ids of rows matching term to the result set"""
+        if mode == EXACT:
+            result.update(self.ids_by_text.get(term, ()))
+            return
+
+        if mode == REGEX:
+            regex = compile_regex(term)
+            literals = required_literals(term)
+            for lower in self.candidates(*literals):
+                if not all(literal in lower for literal in literals):
+                    continue
+                for text in self.texts_by_lower[lower]:
+                    if regex.search(text):
+                        result.update(self.ids_by_text[text])
+            return
+
+        for lower in self.matching_lower_texts(term.lower(), mode):
+            for text in self.texts_by_lower[lower]:
+                result.update(self.ids_by_text[text])
+
+
+class SearchIndex:
+    """
+    Search index for a table, mapping cell text to the ids of the rows that
+    contain it. Answers queries in every search mode without looking at every
+    cell; REGEX queries only run the regex on distinct texts that contain the
+    pattern's literal substrings. Every change bumps version, so callers can
+    tell when a cached result is stale.
+    """
+
+    SUPPORTED_MODES = (CONTAINS, EXACT, STARTS_WITH, ENDS_WITH, REGEX)
+
+    def __init__(self, column_count):
+        self.columns = [ColumnIndex() for _ in range(column_count)]
+        self.version = 0
+
+    def add(self, entry_id, texts):
+        """Index a row given the display text of each of its columns"""
+        for column, text in zip(self.columns, texts):
+            column.add(entry_id, text)
+        self.version += 1
+
+    def remove(self, entry_id, texts):
+        """Remove a row previously added with the same texts"""
+        for column, text in zip(self.columns, texts):
+            column.remove(entry_id, text)
+        self.version += 1
+
+    def supports(self, mode):
+        return mode in self.SUPPORTED_MODES
+
+    def search(self, term, mode, columns=None, is_cancelled=None):
+        """
+        Return the set of ids of rows where any of the given columns (all by
+        default) matches term in the given mode, or None if is_cancelled()
+        returned True before the search finished. Raises re.error for an
+        invalid REGEX pattern.
+        """
+        if columns:
+            column_indexes = [self.columns[c] for c in columns if 0 <= c < len(self.columns)]
+        else:
+            column_indexes = self.columns
+
+        result = set()
+        for column in column_indexes:
+            if is_cancelled is not None and is_cancelled():
+                return None
+            column.search(term, mode, result)
+        return result
@@ -0,0 +1,188 @@
+"""Packed single-file snapshots of the entry files of a category"""
+
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from pathlib import Path
+
+# File layout: header, one encoded entry per file, index. The header points
+# to the index, which lists every file with its stats, opendb_id and the
+# offset and length of its encoded entry.
+MAGIC = b"OPENDBS1"
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<8sIQQ")  # magic, format version, index offset, index length
+
+
+class CategorySnapshot:
+    """
+    Memory-mapped snapshot of the parsed entries of one category directory.
+
+    Entries are stored pickled, like in EntryCache, and are decoded straight
+    from the mapping when accessed. Each file's mtime, size and inode are kept, so the
+    loose JSON files stay the source of truth: a file whose stats changed is
+    read again and the snapshot updated.
+
+    Has the same stats/get_entries/update/close interface as EntryCache. A
+    missing, outdated or unreadable snapshot file reads as an empty snapshot.
+    """
+
+    def __init__(self, path, category_dir):
+        self.path = Path(path)
+        self.category_dir = str(Path(category_dir).resolve())
+        self._file = None
+        self._mmap = None
+        self._view = None
+        # {filename: (mtime_ns, size, inode)}
+        self._stats = {}
+        # {filename: (offset, length, opendb_id)} and {opendb_id: filename}
+        self._records = {}
+        self._by_id = {}
+        self._open()
+
+    def _open(self):
+        try:
+            self._file = open(self.path, "rb")
+        except OSError:
+            return
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+            self._read_index()
+        except (OSError, ValueError, EOFError, TypeError, struct.error, pickle.UnpicklingError):
+            # Written by another version or damaged; it is rewritten on update()
+            self._close_file()
+            self._stats, self._records, self._by_id = {}, {}, {}
+
+    def _read_index(self):
+        magic, format_version, index_offset, index_length = _HEADER.unpack_from(self._view)
+        if (magic, format_version) != (MAGIC, FORMAT_VERSION):
+            raise ValueError("Unsupported snapshot format")
+        with self._view[index_offset:index_offset + index_length] as index:
+            category_dir, filenames, stat_keys, entry_ids, offsets, lengths = pickle.loads(index)
+        if category_dir != self.category_dir:
+            raise ValueError("Snapshot of another directory")
+
+        self._stats = dict(zip(filenames, stat_keys))
+        self._records = dict(zip(filenames, zip(offsets, lengths, entry_ids)))
+        self._by_id = {
+            entry_id: filename for filename, entry_id in zip(filenames, entry_ids) if entry_id
+        }
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, entry_id):
+        return entry_id in self._by_id
+
+    def ids(self):
+        """opendb_ids of all entries in the snapshot"""
+        return list(self._by_id)
+
+    def stats(self):
+        """Return {filename: (mtime_ns, size, inode)} for every file in the snapshot"""
+        return dict(self._stats)
+
+    def _decode(self, filename):
+        offset, length, _ = self._records[filename]
+        with self._view[offset:offset + length] as data:
+            return pickle.loads(data)
+
+    def get(self, entry_id):
+        """Decode the entry with the given opendb_id, or return None"""
+        filename = self._by_id.get(entry_id)
+        return self._decode(filename) if filename else None
+
+    def get_entries(self, filenames):
+        """Return {filename: entry} for the given files in the snapshot"""
+        return {
+            filename: self._decode(filename)
+            for filename in filenames if filename in self._records
+        }
+
+    def update(self, stored, removed):
+        """
+        Rewrite the snapshot with freshly parsed entries and without removed files.
+
+        stored is a list of (filename, (mtime_ns, size, inode), entry) tuples and
+        removed is an iterable of filenames. Unchanged entries are copied over
+        without decoding them.
+        """
+        removed = set(removed)
+        if not stored and not removed & set(self._records):
+            return
+
+        fresh = {
+            filename: (stat_key, entry) for filename, stat_key, entry in stored
+        }
+        filenames, stat_keys, entry_ids, offsets, lengths = [], [], [], [], []
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(bytes(_HEADER.size))
+                offset = _HEADER.size
+                for filename in sorted(set(self._records) | set(fresh)):
+                    if filename in removed:
+                        continue
+                    if filename in fresh:
+                        stat_key, entry = fresh[filename]
+                        entry_id = entry.get("opendb_id") if isinstance(entry, dict) else None
+                        if not isinstance(entry_id, str):
+                            entry_id = ""
+                        length = f.write(pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+                    else:
+                        stat_key = self._stats[filename]
+                        start, length, entry_id = self._records[filename]
+                        with self._view[start:start + length] as data:
+                            f.write(data)
+                    filenames.append(filename)
+                    stat_keys.append(tuple(stat_key))
+                    entry_ids.append(entry_id)
+                    offsets.append(offset)
+                    lengths.append(length)
+                    offset += length
+
+                index = pickle.dumps(
+                    (self.category_dir, filenames, stat_keys, entry_ids, offsets, lengths),
+                    pickle.HIGHEST_PROTOCOL,
+                )
+                f.write(index)
+                f.seek(0)
+                f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, offset, len(index)))
+
+            # The mapping has to go before the file can be replaced on Windows
+            self._close_file()
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+        self._stats, self._records, self._by_id = {}, {}, {}
+        self._open()
+
+    def _close_file(self):
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        self._close_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
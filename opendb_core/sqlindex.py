@@ -0,0 +1,443 @@
+"""
+Persistent SQLite index of the entries of all categories, for queries that
+don't need every entry in memory.
+
+Every entry is stored as JSON together with one row per schema field
+(SchemaHelper.get_all_properties) holding the field's typed value and sort
+key. Queries of the query language are translated to SQL over those rows, so
+filtering, sorting and paging happen in SQLite with the same results as
+evaluating the query in Python.
+"""
+
+import sqlite3
+from pathlib import Path
+
+from . import jsoncodec
+from .columns import sort_key
+from .query import And, Compare, In, IsTrue, Not, Or, _is_number, resolve
+from .schema import SchemaHelper, content_hash
+
+# Kinds of field rows. Each non-null field value has one row of the first
+# five kinds; list values also get an ITEM row per string item, for ~.
+NUMBER = 1
+TEXT = 2
+TRUE = 3
+FALSE = 4
+OTHER = 5
+ITEM = 6
+VALUE_KINDS = (NUMBER, TEXT, TRUE, FALSE, OTHER)
+
+# Files read and field rows derived per transaction during sync
+SYNC_BATCH = 1000
+
+_SQL_INT_MIN = -2 ** 63
+_SQL_INT_MAX = 2 ** 63 - 1
+
+
+def _sql_number(value):
+    """A number SQLite can store; larger integers become floats"""
+    if isinstance(value, int) and not _SQL_INT_MIN <= value <= _SQL_INT_MAX:
+        return float(value)
+    return value
+
+
+def field_rows(fields, field_types, entry):
+    """(field, kind, value, sort key) rows of an entry for the given fields"""
+    rows = []
+    for field in fields:
+        value = resolve(entry, tuple(field.split(".")))
+        if value is None:
+            continue
+
+        if value is True:
+            kind, stored = TRUE, 1
+        elif value is False:
+            kind, stored = FALSE, 0
+        elif _is_number(value):
+            kind, stored = NUMBER, _sql_number(value)
+        elif isinstance(value, str):
+            kind, stored = TEXT, value.lower()
+        else:
+            kind, stored = OTHER, None
+
+        key = sort_key(value, field_types.get(field))
+        if _is_number(key):
+            key = _sql_number(key)
+        rows.append((field, kind, stored, key))
+
+        if isinstance(value, list):
+            rows.extend(
+                (field, ITEM, item.lower(), None) for item in value if isinstance(item, str)
+            )
+    return rows
+
+
+class SqliteIndex:
+    """
+    SQLite index of the entry files of any number of categories.
+
+    sync() brings a category up to date with its files, reading only files
+    whose mtime, size or inode changed, like EntryCache. A connection belongs
+    to the thread that created it, so open one index per worker thread.
+    """
+
+    FORMAT_VERSION = "1"
+
+    def __init__(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        # Readers, like a paged table, keep working while a sync writes
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS categories (
+                category TEXT PRIMARY KEY, schema_hash TEXT, fields TEXT);
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY, category TEXT, filename TEXT,
+                mtime_ns INTEGER, size INTEGER, inode INTEGER,
+                opendb_id TEXT, entry TEXT, UNIQUE (category, filename));
+            CREATE INDEX IF NOT EXISTS entries_by_id ON entries (category, opendb_id);
+            CREATE TABLE IF NOT EXISTS fields (
+                entry INTEGER, field TEXT, kind INTEGER, value, sort);
+            CREATE INDEX IF NOT EXISTS fields_by_value ON fields (field, kind, value);
+            CREATE INDEX IF NOT EXISTS fields_by_entry ON fields (entry, field);
+            """
+        )
+
+        # Start over if the index was written by another format version
+        stored = dict(self.connection.execute("SELECT key, value FROM meta"))
+        if stored.get("format_version") != self.FORMAT_VERSION:
+            with self.connection:
+                for table in ("meta", "categories", "entries", "fields"):
+                    self.connection.execute(f"DELETE FROM {table}")
+                self.connection.execute(
+                    "INSERT INTO meta (key, value) VALUES ('format_version', ?)",
+                    (self.FORMAT_VERSION,),
+                )
+
+    def sync(self, repository, category, schema):
+        """
+        Update the index of a category from its entry files and schema.
+
+        Returns a tuple (changed, errors) where changed is the number of files
+        that were indexed again or removed and errors is a list of
+        (path, message) tuples for files that could not be parsed. Files that
+        can't be parsed are left out of the results and reported again only
+        once they change.
+        """
+        fields = ["opendb_id"] + SchemaHelper.get_all_properties(schema)
+        field_types = SchemaHelper.get_property_types(schema)
+        schema_hash = content_hash(schema)
+
+        stats = repository.scan_category(category)
+        known = {
+            filename: (row_id, (mtime_ns, size, inode))
+            for row_id, filename, mtime_ns, size, inode in self.connection.execute(
+                "SELECT id, filename, mtime_ns, size, inode FROM entries WHERE category = ?",
+                (category,),
+            )
+        }
+        changed = sorted(
+            filename for filename, stat_key in stats.items()
+            if known.get(filename, (None, None))[1] != stat_key
+        )
+        removed_files = [filename for filename in known if filename not in stats]
+        removed = [known[filename][0] for filename in removed_files]
+        row = self.connection.execute(
+            "SELECT schema_hash FROM categories WHERE category = ?", (category,)
+        ).fetchone()
+        schema_changed = row is None or row[0] != schema_hash
+
+        with self.connection:
+            self._delete(removed)
+
+        # Files are read and stored a batch at a time, each batch in its own
+        # transaction, so memory use doesn't grow with the category. An
+        # interrupted sync resumes from the stats of the stored batches; the
+        # schema hash is only stored at the end, so missing field rows of
+        # a changed schema are always derived again.
+        errors = []
+        loader = repository.loader()
+        category_dir = repository.category_dir(category)
+        for start in range(0, len(changed), SYNC_BATCH):
+            results = loader.read_files(category_dir, changed[start:start + SYNC_BATCH])
+            with self.connection:
+                for data_file, entry, error in results:
+                    if error is not None:
+                        errors.append((data_file, error))
+                    self._store(
+                        category, data_file.name, stats[data_file.name], entry, error,
+                        known.get(data_file.name, (None,))[0],
+                        fields, field_types, index_fields=not schema_changed,
+                    )
+
+        if schema_changed:
+            # New fields or types: derive every field row again, without reading files
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM fields WHERE entry IN "
+                    "(SELECT id FROM entries WHERE category = ?)",
+                    (category,),
+                )
+            # A chunk at a time by row id, as each chunk is committed
+            last_id = 0
+            while True:
+                rows = self.connection.execute(
+                    "SELECT id, entry FROM entries WHERE category = ? AND id > ? "
+                    "AND opendb_id IS NOT NULL ORDER BY id LIMIT ?",
+                    (category, last_id, SYNC_BATCH),
+                ).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                with self.connection:
+                    for row_id, entry_json in rows:
+                        self._insert_fields(
+                            row_id, fields, field_types, jsoncodec.loads(entry_json)
+                        )
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO categories (category, schema_hash, fields) "
+                    "VALUES (?, ?, ?)",
+                    (category, schema_hash, jsoncodec.dumps(fields)),
+                )
+
+        return len(changed) + len(removed_files), errors
+
+    def _store(self, category, filename, stat_key, entry, error, row_id, fields,
+               field_types, index_fields=True):
+        """Insert or update the row of a file that was read; returns its row id"""
+        entry_id = entry.get("opendb_id") if isinstance(entry, dict) else None
+        if not isinstance(entry_id, str) or not entry_id:
+            entry_id = None
+        # A file that can't be parsed is remembered by its stats, so it is
+        # only read again once it changes
+        values = (
+            *stat_key, entry_id, None if error is not None else jsoncodec.dumps(entry),
+        )
+
+        # Changed files keep their row, so row keys held by readers stay valid
+        if row_id is not None:
+            self.connection.execute(
+                "UPDATE entries SET mtime_ns = ?, size = ?, inode = ?, opendb_id = ?, "
+                "entry = ? WHERE id = ?",
+                (*values, row_id),
+            )
+            self.connection.execute("DELETE FROM fields WHERE entry = ?", (row_id,))
+        else:
+            row_id = self.connection.execute(
+                "INSERT INTO entries "
+                "(category, filename, mtime_ns, size, inode, opendb_id, entry) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (category, filename, *values),
+            ).lastrowid
+        if entry_id is not None and index_fields:
+            self._insert_fields(row_id, fields, field_types, entry)
+        return row_id
+
+    def _delete(self, row_ids):
+        for start in range(0, len(row_ids), 500):
+            batch = row_ids[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            self.connection.execute(f"DELETE FROM fields WHERE entry IN ({placeholders})", batch)
+            self.connection.execute(f"DELETE FROM entries WHERE id IN ({placeholders})", batch)
+
+    def _insert_fields(self, row_id, fields, field_types, entry):
+        self.connection.executemany(
+            "INSERT INTO fields (entry, field, kind, value, sort) VALUES (?, ?, ?, ?, ?)",
+            (
+                (row_id, field, kind, value, key)
+                for field, kind, value, key in field_rows(fields, field_types, entry)
+            ),
+        )
+
+    def remove_category(self, category):
+        """Drop a category from the index"""
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM fields WHERE entry IN (SELECT id FROM entries WHERE category = ?)",
+                (category,),
+            )
+            self.connection.execute("DELETE FROM entries WHERE category = ?", (category,))
+            self.connection.execute("DELETE FROM categories WHERE category = ?", (category,))
+
+    def categories(self):
+        """Names of the indexed categories"""
+        return [row[0] for row in self.connection.execute(
+            "SELECT category FROM categories ORDER BY category"
+        )]
+
+    def fields(self, category=None):
+        """Indexed fields of a category, or of all categories"""
+        if category is not None:
+            rows = self.connection.execute(
+                "SELECT fields FROM categories WHERE category = ?", (category,)
+            )
+        else:
+            rows = self.connection.execute("SELECT fields FROM categories")
+        fields = []
+        for (fields_json,) in rows:
+            fields.extend(field for field in jsoncodec.loads(fields_json) if field not in fields)
+        return fields
+
+    # Queries
+
+    def _compare_sql(self, field, op, literal, params):
+        """SQL condition on e.id for one comparison, following query._compare"""
+        if op == "~":
+            kinds, condition = (TEXT, ITEM), "instr(value, ?) > 0"
+            literal = str(literal).lower()
+        elif literal is None:
+            if op not in ("=", "!="):
+                return "0"
+            # Missing and null values have no row
+            kinds, condition = VALUE_KINDS, None
+            if op == "=":
+                return f"NOT {self._compare_sql(field, '!=', None, params)}"
+        elif op == "!=":
+            return f"NOT {self._compare_sql(field, '=', literal, params)}"
+        elif isinstance(literal, bool):
+            if op != "=":
+                return "0"
+            kinds, condition = (TRUE if literal else FALSE,), None
+        elif _is_number(literal):
+            kinds, condition = (NUMBER,), f"value {op} ?"
+            literal = _sql_number(literal)
+        elif isinstance(literal, str):
+            kinds, condition = (TEXT,), f"value {op} ?"
+            literal = literal.lower()
+        else:
+            return "0"
+
+        sql = (
+            "e.id IN (SELECT entry FROM fields WHERE field = ? "
+            f"AND kind IN ({','.join(str(kind) for kind in kinds)})"
+        )
+        params.append(field)
+        if condition is not None:
+            sql += f" AND {condition}"
+            params.append(literal)
+        return sql + ")"
+
+    def where(self, node, params):
+        """Translate a parsed query to an SQL condition on the entries table e"""
+        if isinstance(node, And):
+            return "(" + " AND ".join(self.where(child, params) for child in node.children) + ")"
+        if isinstance(node, Or):
+            return "(" + " OR ".join(self.where(child, params) for child in node.children) + ")"
+        if isinstance(node, Not):
+            return f"NOT {self.where(node.child, params)}"
+        if isinstance(node, Compare):
+            return self._compare_sql(node.field, node.op, node.value, params)
+        if isinstance(node, In):
+            return "(" + " OR ".join(
+                self._compare_sql(node.field, "=", literal, params) for literal in node.values
+            ) + ")"
+        if isinstance(node, IsTrue):
+            return self._compare_sql(node.field, "=", True, params)
+        raise TypeError(f"Unsupported query node {type(node).__name__}")
+
+    def _select(self, columns, node, category, sort=None, descending=False,
+                offset=0, limit=None, ordered=True):
+        params = []
+        sql = f"SELECT {columns} FROM entries e"
+        if sort is not None:
+            sql += f" LEFT JOIN fields s ON s.entry = e.id AND s.field = ? AND s.kind != {ITEM}"
+            params.append(sort)
+
+        conditions = ["e.opendb_id IS NOT NULL"]
+        if category is not None:
+            conditions.append("e.category = ?")
+            params.append(category)
+        if node is not None:
+            conditions.append(self.where(node, params))
+        sql += " WHERE " + " AND ".join(conditions)
+
+        if sort is not None:
+            # Values that have no sort key go last in both directions
+            direction = "DESC" if descending else "ASC"
+            sql += f" ORDER BY s.sort IS NULL, s.sort {direction}, e.category, e.opendb_id"
+        elif ordered:
+            sql += " ORDER BY e.category, e.opendb_id"
+
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([-1 if limit is None else limit, offset])
+        return self.connection.execute(sql, params)
+
+    def count(self, node=None, category=None):
+        """Number of entries matching a parsed query (all entries if node is None)"""
+        return self._select("COUNT(*)", node, category, ordered=False).fetchone()[0]
+
+    def ids(self, node=None, category=None, sort=None, descending=False, offset=0, limit=None):
+        """
+        opendb_ids of the matching entries of a category, ordered by the typed
+        values of the sort field or by opendb_id, and paged with offset/limit
+        """
+        return [
+            row[0] for row in self._select(
+                "e.opendb_id", node, category, sort, descending, offset, limit
+            )
+        ]
+
+    def search(self, node=None, category=None, sort=None, descending=False, offset=0,
+               limit=None):
+        """Like ids(), but returns (category, entry) tuples, across all categories by default"""
+        return [
+            (entry_category, jsoncodec.loads(entry_json))
+            for entry_category, entry_json in self._select(
+                "e.category, e.entry", node, category, sort, descending, offset, limit
+            )
+        ]
+
+    def keys(self, node=None, category=None, sort=None, descending=False):
+        """
+        Row keys of the matching entries in the order of ids(), for reading
+        them a page at a time with get_rows(). Keys stay valid while the
+        entry's file exists.
+        """
+        return [row[0] for row in self._select("e.id", node, category, sort, descending)]
+
+    def get_rows(self, keys):
+        """Return {key: (category, entry)} for row keys from keys()"""
+        rows = {}
+        keys = list(keys)
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            for key, category, entry_json in self.connection.execute(
+                f"SELECT id, category, entry FROM entries "
+                f"WHERE id IN ({placeholders}) AND opendb_id IS NOT NULL",
+                batch,
+            ):
+                rows[key] = (category, jsoncodec.loads(entry_json))
+        return rows
+
+    def get_entries(self, category, entry_ids):
+        """Return {opendb_id: entry} for the given ids of a category"""
+        entries = {}
+        entry_ids = list(entry_ids)
+        # Stay well below SQLite's host parameter limit
+        for start in range(0, len(entry_ids), 500):
+            batch = entry_ids[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                f"SELECT opendb_id, entry FROM entries "
+                f"WHERE category = ? AND opendb_id IN ({placeholders})",
+                [category, *batch],
+            )
+            for entry_id, entry_json in rows:
+                entries[entry_id] = jsoncodec.loads(entry_json)
+        return entries
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
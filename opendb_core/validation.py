@@ -0,0 +1,220 @@
+"""Bulk validation of entries with a process pool and a persistent result cache"""
+
+import multiprocessing
+import os
+import sqlite3
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from . import jsoncodec
+from .schema import CompiledSchema, SchemaHelper, content_hash
+
+
+class ValidationCache:
+    """
+    Persistent SQLite cache of validate_entry results keyed by
+    (schema hash, entry content hash). Safe to share between the GUI and
+    command line tools; each process opens its own connection.
+    """
+
+    def __init__(self, cache_path):
+        cache_path = Path(cache_path)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(str(cache_path), timeout=30)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "schema_hash TEXT, entry_hash TEXT, result TEXT, "
+            "PRIMARY KEY (schema_hash, entry_hash))"
+        )
+
+    def get_many(self, schema_hash, entry_hashes):
+        """Return {entry_hash: result} for the cached entry hashes"""
+        results = {}
+        entry_hashes = list(set(entry_hashes))
+        # Stay well below SQLite's host parameter limit
+        for start in range(0, len(entry_hashes), 500):
+            batch = entry_hashes[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                f"SELECT entry_hash, result FROM results "
+                f"WHERE schema_hash = ? AND entry_hash IN ({placeholders})",
+                [schema_hash, *batch],
+            )
+            for entry_hash, result in rows:
+                results[entry_hash] = jsoncodec.loads(result)
+        return results
+
+    def put_many(self, schema_hash, results):
+        """Store (entry_hash, result) pairs for a schema"""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results (schema_hash, entry_hash, result) "
+                "VALUES (?, ?, ?)",
+                (
+                    (schema_hash, entry_hash, jsoncodec.dumps(result))
+                    for entry_hash, result in results
+                ),
+            )
+
+    def prune(self, keep_schema_hashes):
+        """Delete results for every schema version not in keep_schema_hashes"""
+        keep = list(keep_schema_hashes)
+        placeholders = ",".join("?" * len(keep))
+        with self.connection:
+            if keep:
+                self.connection.execute(
+                    f"DELETE FROM results WHERE schema_hash NOT IN ({placeholders})", keep
+                )
+            else:
+                self.connection.execute("DELETE FROM results")
+
+    def close(self):
+        self.connection.close()
+
+
+# Schema compiled once per validation worker process by its initializer
+_worker_schema = None
+
+
+def _init_validation_worker(schema):
+    """Process pool initializer: compile the schema for this worker"""
+    global _worker_schema
+    _worker_schema = CompiledSchema(schema)
+
+
+def _validate_shard(shard):
+    """Validate a list of (entry_id, entry) pairs in a worker process"""
+    return [
+        (entry_id, SchemaHelper.validate_entry(entry, _worker_schema))
+        for entry_id, entry in shard
+    ]
+
+
+class ValidationEngine:
+    """
+    Validates many entries against one schema, sharding them across a
+    process pool. The schema is sent to each worker once, when the pool starts.
+    """
+
+    def __init__(self, max_workers=None, shard_size=250, min_parallel=1000, cache_path=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Optional ValidationCache file; only entries not found there are validated
+        self.cache_path = cache_path
+        self.shard_size = shard_size
+        # Below this many entries starting processes costs more than it saves
+        self.min_parallel = min_parallel
+        self._executor = None
+        self._executor_schema = None
+
+    def _get_executor(self, schema):
+        """Return a process pool whose workers have compiled this schema"""
+        if self._executor is not None and self._executor_schema is not schema:
+            self.shutdown()
+
+        if self._executor is None:
+            # Spawn rather than fork: forking a process with running Qt threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_validation_worker,
+                initargs=(schema,),
+            )
+            self._executor_schema = schema
+        return self._executor
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._executor_schema = None
+
+    def iter_validate(self, schema, entries, is_cancelled=None):
+        """
+        Validate (entry_id, entry) pairs against schema.
+
+        Yields tuples (results, done, total) as shards complete, where results
+        maps entry_id to the validate_entry result dict. Stops early when
+        is_cancelled() returns True. With a cache_path, cached results are
+        yielded first and only the remaining entries are validated.
+        """
+        entries = list(entries)
+        total = len(entries)
+        is_cancelled = is_cancelled or (lambda: False)
+
+        if self.cache_path is None:
+            yield from self._iter_validate_uncached(schema, entries, 0, total, is_cancelled)
+            return
+
+        try:
+            cache = ValidationCache(self.cache_path)
+        except (sqlite3.Error, OSError):
+            yield from self._iter_validate_uncached(schema, entries, 0, total, is_cancelled)
+            return
+
+        try:
+            schema_hash = SchemaHelper.compile_schema(schema).fingerprint
+            entry_hashes = {entry_id: content_hash(entry) for entry_id, entry in entries}
+            cached = cache.get_many(schema_hash, entry_hashes.values())
+
+            hits = {
+                entry_id: cached[entry_hash]
+                for entry_id, entry_hash in entry_hashes.items()
+                if entry_hash in cached
+            }
+            done = len(hits)
+            if hits:
+                yield hits, done, total
+
+            misses = [(entry_id, entry) for entry_id, entry in entries if entry_id not in hits]
+            for results, done, _ in self._iter_validate_uncached(
+                schema, misses, done, total, is_cancelled
+            ):
+                cache.put_many(
+                    schema_hash,
+                    ((entry_hashes[entry_id], result) for entry_id, result in results.items()),
+                )
+                yield results, done, total
+        finally:
+            cache.close()
+
+    def _iter_validate_uncached(self, schema, entries, done, total, is_cancelled):
+        """Validate entries without the cache, continuing the done count"""
+        if len(entries) < self.min_parallel or self.max_workers <= 1:
+            compiled = SchemaHelper.compile_schema(schema)
+            for start in range(0, len(entries), self.shard_size):
+                if is_cancelled():
+                    return
+                results = {
+                    entry_id: SchemaHelper.validate_entry(entry, compiled)
+                    for entry_id, entry in entries[start:start + self.shard_size]
+                }
+                done += len(results)
+                yield results, done, total
+            return
+
+        executor = self._get_executor(schema)
+        pending = {
+            executor.submit(_validate_shard, entries[start:start + self.shard_size])
+            for start in range(0, len(entries), self.shard_size)
+        }
+        try:
+            while pending:
+                finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                if is_cancelled():
+                    return
+                for future in finished:
+                    results = dict(future.result())
+                    done += len(results)
+                    yield results, done, total
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def validate(self, schema, entries):
+        """Validate (entry_id, entry) pairs and return {entry_id: result}"""
+        merged = {}
+        for results, _, _ in self.iter_validate(schema, entries):
+            merged.update(results)
+        return merged
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from opendb_core import Repository
+
+CPU_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "title": "CPU",
+    "type": "object",
+    "required": ["opendb_id", "name", "cores"],
+    "properties": {
+        "opendb_id": {"type": "string"},
+        "name": {"type": "string"},
+        "socket": {"type": "string"},
+        "cores": {"type": "integer"},
+        "tdp": {"type": "number"},
+        "unlocked": {"type": "boolean"},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "metadata": {
+            "type": "object",
+            "properties": {"series": {"type": "string"}, "released": {"type": "string"}},
+        },
+    },
+}
+
+
+def make_cpu(i):
+    """A test entry whose values vary with i, with some missing and null fields"""
+    entry = {
+        "opendb_id": f"cpu-{i:04d}",
+        "name": f"{'Ryzen' if i % 2 else 'Core'} {i}",
+        "cores": [2, 4, 8, 16, 24][i % 5],
+        "tdp": [35, 65.5, 125][i % 3],
+        "unlocked": i % 4 == 0,
+        "tags": ["oem", "boxed"][: i % 3],
+        "metadata": {"series": f"S{i % 7}", "released": str(2015 + i % 9)},
+    }
+    if i % 6:
+        entry["socket"] = ["AM4", "AM5", "LGA1700"][i % 3]
+    elif i % 12 == 0:
+        entry["socket"] = None
+    return entry
+
+
+def write_entry(repository, category, entry):
+    path = repository.entry_path(category, entry["opendb_id"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(entry, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """An open-db tree with a cpu category of 60 entries"""
+    repository = Repository(tmp_path / "data", tmp_path / "schemas", fsync=False)
+    repository.schema_dir.mkdir()
+    repository.schema_path("cpu").write_text(json.dumps(CPU_SCHEMA), encoding="utf-8")
+    for i in range(60):
+        write_entry(repository, "cpu", make_cpu(i))
+    return repository
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The QApplication, for tests of the editor's Qt models"""
+    from PyQt5.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,91 @@
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from opendb_core.cli import main
+
+from .conftest import make_cpu, write_entry
+
+
+@pytest.fixture
+def tree(repository):
+    # Validation needs values of the schema types everywhere
+    for i in range(0, 60, 12):
+        entry = make_cpu(i)
+        del entry["socket"]
+        write_entry(repository, "cpu", entry)
+    return ["--data-dir", str(repository.data_dir), "--schema-dir", str(repository.schema_dir)]
+
+
+def validate(tree, *args):
+    return main(["validate", *tree, "--workers", "2", *args])
+
+
+def test_validate_valid_tree(tree, capsys):
+    assert validate(tree) == 0
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Validated 60 entries" in captured.err
+    assert "0 invalid" in captured.err
+
+
+def test_validate_reports_invalid_entries(repository, tree, capsys):
+    write_entry(repository, "cpu", {"opendb_id": "bad", "name": 5})
+    (repository.category_dir("cpu") / "broken.json").write_text("{", encoding="utf-8")
+
+    assert validate(tree) == 1
+    records = {
+        record["opendb_id"] or record["file"].rsplit("/", 1)[-1]: record
+        for record in map(json.loads, capsys.readouterr().out.splitlines())
+    }
+    assert set(records) == {"bad", "broken.json"}
+    assert not records["bad"]["is_valid"]
+    assert "cores" in records["bad"]["missing_required"]
+    assert "parse_error" in records["broken.json"]
+
+
+def test_validate_junit(repository, tree, tmp_path):
+    write_entry(repository, "cpu", {"opendb_id": "bad", "name": "x"})
+    report = tmp_path / "report.xml"
+
+    assert validate(tree, "--format", "junit", "--output", str(report)) == 1
+
+    root = ET.parse(report).getroot()
+    assert (root.tag, root.get("tests"), root.get("failures")) == ("testsuites", "61", "1")
+    suite = root.find("testsuite")
+    assert suite.get("name") == "cpu"
+    failures = [case for case in suite.iter("testcase") if case.find("failure") is not None]
+    assert [case.get("name") for case in failures] == ["bad"]
+    assert "missing required: cores" in failures[0].find("failure").text
+
+
+def test_validate_unknown_category(tree, capsys):
+    assert validate(tree, "--category", "gpu") == 1
+    assert "No schema for category" in capsys.readouterr().out
+
+
+def query(tree, tmp_path, *args):
+    return main(["query", *tree, "--index", str(tmp_path / "index.sqlite"), *args])
+
+
+def test_query(tree, tmp_path, capsys):
+    assert query(tree, tmp_path, "cores >= 16 and unlocked", "--sort", "cores",
+                 "--descending", "--limit", "3") == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert [line["category"] for line in lines] == ["cpu"] * 3
+    assert [line["entry"]["cores"] for line in lines] == [24, 24, 24]
+    assert all(line["entry"]["unlocked"] for line in lines)
+
+
+def test_query_count(tree, tmp_path, capsys):
+    assert query(tree, tmp_path, "socket = AM5", "--count") == 0
+    expected = sum(1 for i in range(60) if i % 6 and i % 3 == 1)
+    assert capsys.readouterr().out == f"{expected}\n"
+
+
+@pytest.mark.parametrize("args", [["cores >="], ["threads > 1"], ["", "--sort", "threads"]])
+def test_query_errors_exit_2(tree, tmp_path, capsys, args):
+    assert query(tree, tmp_path, *args) == 2
+    assert capsys.readouterr().err.splitlines()[-1].startswith("Invalid query: ")
@@ -0,0 +1,71 @@
+from opendb_core import ColumnStore
+from opendb_core.columns import build_column, sort_order, split_path
+
+
+def test_mixed_str_and_list_column():
+    # Mostly strings with one unhashable value must not break the distinct count
+    entries = [{"socket": f"S{i % 3}"} for i in range(10)]
+    entries.append({"socket": ["AM4", "AM5"]})
+    entries.append({"socket": {"name": "AM5"}})
+
+    column = build_column(entries, split_path("socket"))
+
+    assert column.kind == "str"
+    assert column.get(10) == ["AM4", "AM5"]
+    assert column.display(10) == "[2 items]"
+    assert column.display(11) == "{...}"
+    assert column.display(0) == "S0"
+
+
+def test_mostly_distinct_strings_with_list_become_object_column():
+    entries = [{"name": f"name {i}"} for i in range(600)]
+    entries.append({"name": ["a", "b"]})
+
+    column = build_column(entries, split_path("name"))
+
+    assert column.kind == "object"
+    assert column.get(600) == ["a", "b"]
+
+
+def test_store_get_and_display():
+    entries = [
+        {"opendb_id": "a", "cores": 8, "specs": {"tdp": 65}},
+        {"opendb_id": "b", "cores": None, "specs": {}},
+        {"opendb_id": "c", "cores": 16, "specs": {"tdp": 105.5}},
+    ]
+    store = ColumnStore(["opendb_id", "cores", "specs.tdp"], entries)
+
+    assert store.value(0, 1) == 8
+    assert store.display(1, 1) == "null"
+    assert store.value(1, 2) == ""
+    assert store.display(2, 2) == "105.5"
+
+
+def test_store_follows_entry_changes():
+    entries = [{"cores": 4}, {"cores": 8}]
+    store = ColumnStore(["cores"], entries)
+    assert store.value(1, 0) == 8
+
+    entries.append({"cores": 12})
+    store.rows_appended(2)
+    entries[0] = {"cores": "many"}
+    store.row_changed(0)
+    del entries[1]
+    store.row_removed(1)
+
+    assert [store.value(row, 0) for row in range(len(store))] == ["many", 12]
+
+
+def test_sort_order_typed_values():
+    entries = [{"cores": value} for value in (8, None, 2, "x", 16, "")]
+    column = build_column(entries, split_path("cores"))
+
+    assert sort_order(column, "integer") == [2, 0, 4, 1, 3, 5]
+    assert sort_order(column, "integer", descending=True) == [4, 0, 2, 1, 3, 5]
+
+
+def test_sort_order_strings_ignore_case():
+    entries = [{"name": value} for value in ("beta", "Alpha", "", "gamma", "alpha")]
+    column = build_column(entries, split_path("name"))
+
+    assert sort_order(column, "string") == [1, 4, 0, 3, 2]
@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+pytest.importorskip("PyQt5")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QModelIndex, Qt  # noqa: E402
+
+import main  # noqa: E402
+from opendb_core import Repository, SqliteIndex, query  # noqa: E402
+
+from .conftest import CPU_SCHEMA, make_cpu, write_entry  # noqa: E402
+
+ENTRIES = 5000
+HEADERS = ["opendb_id", "name", "cores", "socket", "metadata.series"]
+
+
+@pytest.fixture(scope="module")
+def index_path(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("paged")
+    repository = Repository(tmp_path / "data", tmp_path / "schemas", fsync=False)
+    for i in range(ENTRIES):
+        write_entry(repository, "cpu", make_cpu(i))
+    path = tmp_path / "index.sqlite"
+    with SqliteIndex(path) as index:
+        assert index.sync(repository, "cpu", CPU_SCHEMA) == (ENTRIES, [])
+    return path
+
+
+@pytest.fixture
+def model(app, index_path):
+    model = main.PagedTableModel(index_path, "cpu", HEADERS, page_size=100, max_pages=4)
+    yield model
+    model.close()
+
+
+def fetch_all(model):
+    fetches = 0
+    while model.canFetchMore(QModelIndex()):
+        model.fetchMore(QModelIndex())
+        fetches += 1
+    return fetches
+
+
+def cell(model, row, col):
+    return model.data(model.index(row, col), Qt.DisplayRole)
+
+
+def test_fetch_more_pages_through_the_index(model):
+    assert model.rowCount() == 100
+    assert model.total_count() == ENTRIES
+
+    assert fetch_all(model) == ENTRIES // 100 - 1
+    assert model.rowCount() == ENTRIES
+    assert not model.canFetchMore(QModelIndex())
+
+    ids = [cell(model, row, 0) for row in range(model.rowCount())]
+    assert ids == [f"cpu-{i:04d}" for i in range(ENTRIES)]
+    # Only the pages around the last one read are held
+    assert len(model._pages) <= 4
+    assert model.get_row_data(1234) == make_cpu(1234)
+
+
+def test_sort_and_filter_are_paged(model):
+    model.sort(HEADERS.index("cores"), Qt.DescendingOrder)
+    assert model.rowCount() == 100
+    fetch_all(model)
+    cores = [int(cell(model, row, 2)) for row in range(model.rowCount())]
+    assert cores == sorted(cores, reverse=True)
+
+    model.set_query(query.compile_query('socket = "AM5" and cores >= 16', tuple(HEADERS)))
+    expected = [
+        i for i in range(ENTRIES)
+        if make_cpu(i).get("socket") == "AM5" and make_cpu(i)["cores"] >= 16
+    ]
+    assert model.total_count() == len(expected)
+    fetch_all(model)
+    assert model.rowCount() == len(expected)
+    assert {cell(model, row, 3) for row in range(model.rowCount())} == {"AM5"}
+
+
+def test_edits_show_until_synced(model):
+    model.upsert_entry(dict(make_cpu(3), name="Edited"))
+    model.remove_entry("cpu-0004")
+
+    assert cell(model, 3, 1) == "Edited"
+    assert model.data(model.index(4, 1), Qt.ForegroundRole) == model.REMOVED_COLOR
@@ -0,0 +1,149 @@
+import pytest
+
+from opendb_core import QueryError, QueryIndex, SqliteIndex
+from opendb_core.query import And, Compare, In, IsTrue, Not, Or, parse, tokenize
+
+from .conftest import CPU_SCHEMA, make_cpu, write_entry
+
+FIELDS = ["opendb_id", "name", "socket", "cores", "tdp", "unlocked", "tags",
+          "metadata.series", "metadata.released"]
+
+# Values of unexpected types, which every evaluator has to treat alike
+EDGE_ENTRIES = [
+    {"opendb_id": "edge-1", "name": "AMD", "cores": "8", "tdp": None, "socket": "am5",
+     "tags": ["Boxed", 3]},
+    {"opendb_id": "edge-2", "cores": 8.0, "unlocked": "true", "metadata": {"series": None}},
+    {"opendb_id": "edge-3", "name": "", "cores": True, "tags": "oem", "metadata": "S1"},
+    {"opendb_id": "edge-4", "name": "ryzen 7", "cores": -1, "tdp": 2 ** 70, "socket": 5},
+]
+
+QUERIES = [
+    "cores >= 8",
+    "cores = 8",
+    "cores != 8",
+    "cores < 4 or cores > 16",
+    "tdp <= 65.5",
+    "tdp > 100",
+    "socket = AM5",
+    "socket = am5 and cores >= 16",
+    "socket != AM5",
+    "socket is null",
+    "socket is not null",
+    "socket in (AM4, LGA1700)",
+    "socket in (5, null)",
+    "socket < AM5",
+    "socket >= b",
+    "name ~ ryzen",
+    'name ~ "ryzen 1"',
+    "name = ''",
+    "tags ~ box",
+    "tags ~ oem",
+    "tags = oem",
+    "unlocked",
+    "not unlocked",
+    "unlocked = false",
+    "unlocked = true",
+    "metadata.series = S1",
+    "metadata.series is null",
+    "metadata.released > 2020",
+    'metadata.released >= "2020"',
+    "not (socket = AM4 or cores < 8)",
+    "(name ~ core and unlocked) or tdp = 35",
+    "opendb_id ~ edge",
+    "cores = 8.0",
+    "cores = true",
+]
+
+
+@pytest.fixture
+def entries(repository):
+    for entry in EDGE_ENTRIES:
+        write_entry(repository, "cpu", entry)
+    return [make_cpu(i) for i in range(60)] + EDGE_ENTRIES
+
+
+@pytest.fixture
+def index(repository, entries, tmp_path):
+    with SqliteIndex(tmp_path / "index.sqlite") as index:
+        index.sync(repository, "cpu", CPU_SCHEMA)
+        yield index
+
+
+def test_tokenize():
+    assert tokenize('cores>=8 AND name ~ "a \\"b\\""') == [
+        ("word", "cores"), ("op", ">="), ("word", "8"), ("keyword", "and"),
+        ("word", "name"), ("op", "~"), ("string", 'a "b"'),
+    ]
+    assert tokenize("a == 1") == [("word", "a"), ("op", "="), ("word", "1")]
+
+
+def test_parse_tree():
+    node = parse("not a and (b = 1 or c in (x, 'y', null)) or d is not null")
+
+    assert isinstance(node, Or)
+    first, second = node.children
+    assert isinstance(first, And)
+    assert isinstance(first.children[0], Not)
+    assert isinstance(first.children[0].child, IsTrue)
+    inner = first.children[1]
+    assert isinstance(inner, Or)
+    assert (inner.children[0].field, inner.children[0].op, inner.children[0].value) == ("b", "=", 1)
+    assert isinstance(inner.children[1], In)
+    assert inner.children[1].values == ["x", "y", None]
+    assert isinstance(second, Compare)
+    assert (second.field, second.op, second.value) == ("d", "!=", None)
+
+
+def test_parse_literals():
+    assert parse("a = 1.5").value == 1.5
+    assert parse("a = 2020").value == 2020
+    assert parse('a = "2020"').value == "2020"
+    assert parse("a = TRUE").value is True
+    assert parse("a = x1").value == "x1"
+
+
+def test_field_names_are_checked():
+    assert parse("CORES >= 8", FIELDS).field == "cores"
+    with pytest.raises(QueryError, match="Unknown field 'threads'"):
+        parse("threads > 4", FIELDS)
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "Empty query"),
+    ("   ", "Empty query"),
+    ("cores >=", "Expected a value, found 'end of query'"),
+    ("cores >= >", "Expected a value, found '>'"),
+    ("(cores > 1", "Expected ), found 'end of query'"),
+    ("cores > 1)", "Unexpected ')'"),
+    ("and cores", "Expected a field name, found 'and'"),
+    ("socket in AM4", "Expected (, found 'AM4'"),
+    ("socket is AM4", "Expected null, found 'AM4'"),
+    ('name = "open', "Unexpected character at position 7: '\"'"),
+    ("cores ! 1", "Unexpected character at position 6: '!'"),
+])
+def test_parse_errors(text, message):
+    with pytest.raises(QueryError) as raised:
+        parse(text)
+    assert str(raised.value) == message
+
+
+@pytest.mark.parametrize("text", QUERIES)
+def test_evaluators_agree(text, entries, index):
+    node = parse(text, FIELDS)
+
+    expected = {entry["opendb_id"] for entry in entries if node.matches(entry)}
+
+    assert QueryIndex(entries).search(node) == expected
+    assert set(index.ids(node, "cpu")) == expected
+    assert index.count(node, "cpu") == len(expected)
+
+
+def test_sql_sort_and_paging(index, entries):
+    ids = index.ids(parse("socket is not null"), "cpu", sort="cores", descending=True)
+    cores = {entry["opendb_id"]: entry.get("cores") for entry in entries}
+
+    numbers = [cores[entry_id] for entry_id in ids if type(cores[entry_id]) in (int, float)]
+    assert numbers == sorted(numbers, reverse=True)
+    assert index.ids(
+        parse("socket is not null"), "cpu", sort="cores", descending=True, offset=5, limit=10
+    ) == ids[5:15]
@@ -0,0 +1,148 @@
+import json
+import os
+import stat
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+import pytest
+
+from opendb_core.repository import atomic_write_json
+
+from .conftest import make_cpu, write_entry
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_atomic_write_output(tmp_path):
+    path = tmp_path / "entry.json"
+    data = {"name": "Ryzen ß", "cores": 8, "tdp": 65.5, "tags": []}
+
+    atomic_write_json(path, data, fsync=False)
+
+    assert path.read_text(encoding="utf-8") == json.dumps(data, indent=2, ensure_ascii=False)
+    assert [p.name for p in tmp_path.iterdir()] == ["entry.json"]
+
+
+@posix_only
+def test_new_file_gets_umask_permissions(tmp_path):
+    old_umask = os.umask(0o027)
+    try:
+        atomic_write_json(tmp_path / "new.json", {}, fsync=False)
+    finally:
+        os.umask(old_umask)
+
+    assert mode(tmp_path / "new.json") == 0o640
+
+
+@posix_only
+def test_replaced_file_keeps_its_permissions(tmp_path):
+    path = tmp_path / "entry.json"
+    path.write_text("{}", encoding="utf-8")
+    os.chmod(path, 0o604)
+
+    atomic_write_json(path, {"a": 1}, fsync=False)
+
+    assert mode(path) == 0o604
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": 1}
+
+
+def test_write_batch_commit(repository):
+    with repository.write_batch() as batch:
+        batch.save_entry("cpu", dict(make_cpu(1), name="First"))
+        batch.save_entry("cpu", dict(make_cpu(1), name="Second"))
+        batch.save_entry("cpu", make_cpu(100))
+        assert len(batch) == 2
+
+    entries = {entry["opendb_id"]: entry for entry in repository.load_category("cpu")[0]}
+    assert entries["cpu-0001"]["name"] == "Second"
+    assert "cpu-0100" in entries
+    assert not list(repository.category_dir("cpu").glob("*.tmp"))
+
+
+def test_write_batch_discarded_on_error(repository):
+    before = repository.entry_path("cpu", "cpu-0001").read_bytes()
+
+    with pytest.raises(RuntimeError):
+        with repository.write_batch() as batch:
+            batch.save_entry("cpu", dict(make_cpu(1), name="Lost"))
+            raise RuntimeError
+
+    assert repository.entry_path("cpu", "cpu-0001").read_bytes() == before
+    assert not list(repository.category_dir("cpu").glob(".*"))
+
+
+@posix_only
+def test_write_batch_commit_with_fsync(repository, monkeypatch):
+    synced = []
+    fsync = os.fsync
+
+    def checked_fsync(fd):
+        # Windows refuses to sync files opened read-only; directories are
+        # only synced where they can be opened, so they are left out
+        if stat.S_ISREG(os.fstat(fd).st_mode):
+            assert fcntl.fcntl(fd, fcntl.F_GETFL) & (os.O_WRONLY | os.O_RDWR)
+            synced.append(fd)
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", checked_fsync)
+    repository.fsync = True
+    with repository.write_batch() as batch:
+        batch.save_entry("cpu", dict(make_cpu(1), name="Synced"))
+        batch.save_entry("cpu", make_cpu(100))
+
+    assert len(synced) >= 2
+    entries = {entry["opendb_id"]: entry for entry in repository.load_category("cpu")[0]}
+    assert entries["cpu-0001"]["name"] == "Synced"
+
+
+def test_loaded_entries_are_mapped_to_their_files(repository):
+    write_entry(repository, "cpu", make_cpu(1))
+    odd = repository.category_dir("cpu") / "odd-name.json"
+    odd.write_text(json.dumps(make_cpu(200)), encoding="utf-8")
+
+    entry_ids = {}
+    for _ in repository.iter_category_chunks("cpu", entry_ids=entry_ids):
+        pass
+
+    assert len(entry_ids) == 61
+    assert entry_ids["cpu-0001.json"] == "cpu-0001"
+    assert entry_ids["odd-name.json"] == "cpu-0200"
+
+
+def test_read_changes_reports_file_names(repository):
+    stats = repository.scan_category("cpu")
+    odd = repository.category_dir("cpu") / "odd-name.json"
+    odd.write_text(json.dumps(make_cpu(200)), encoding="utf-8")
+    repository.entry_path("cpu", "cpu-0002").write_text('{"name": "No id"}', encoding="utf-8")
+    repository.entry_path("cpu", "cpu-0003").unlink()
+    repository.entry_path("cpu", "cpu-0004").write_text("{", encoding="utf-8")
+
+    _, updated, removed, errors = repository.read_category_changes("cpu", stats)
+
+    updated = dict(updated)
+    assert sorted(updated) == ["cpu-0002.json", "odd-name.json"]
+    assert updated["odd-name.json"]["opendb_id"] == "cpu-0200"
+    assert updated["cpu-0002.json"] is None
+    assert removed == ["cpu-0003.json"]
+    assert [path.name for path, _ in errors] == ["cpu-0004.json"]
+
+
+def test_non_object_file_is_a_load_error(repository):
+    stats = repository.scan_category("cpu")
+    listing = repository.category_dir("cpu") / "listing.json"
+    listing.write_text('[{"opendb_id": "cpu-0200"}]', encoding="utf-8")
+
+    _, updated, _, errors = repository.read_category_changes("cpu", stats)
+    assert updated == []
+    assert errors == [(listing, "top-level value is not an object")]
+
+    entries, errors = repository.load_category("cpu")
+    assert len(entries) == 60
+    assert errors == [(listing, "top-level value is not an object")]
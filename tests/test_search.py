@@ -0,0 +1,62 @@
+import re
+
+import pytest
+
+from opendb_core import SearchIndex
+from opendb_core.search import CONTAINS, ENDS_WITH, EXACT, REGEX, STARTS_WITH, required_literals
+
+ROWS = {
+    "a": ["Ryzen 7 5800X", "AM4"],
+    "b": ["Core i9-13900K", "LGA1700"],
+    "c": ["ΑΣ", "Straße"],
+    "d": ["ryzen 5 3600", "am4"],
+}
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex(2)
+    for entry_id, texts in ROWS.items():
+        index.add(entry_id, texts)
+    return index
+
+
+def brute_force(pattern, columns=None):
+    regex = re.compile(pattern)
+    return {
+        entry_id for entry_id, texts in ROWS.items()
+        if any(regex.search(text) for col, text in enumerate(texts)
+               if columns is None or col in columns)
+    }
+
+
+def test_modes(index):
+    assert index.search("ryzen", CONTAINS) == {"a", "d"}
+    assert index.search("AM4", EXACT) == {"a"}
+    assert index.search("core", STARTS_WITH) == {"b"}
+    assert index.search("00x", ENDS_WITH) == {"a"}
+    assert index.search("am4", CONTAINS, columns=[0]) == set()
+
+
+@pytest.mark.parametrize("pattern", [
+    "Σ", "ΑΣ", "Σ$", "σ", "ß", "Stra", "Ryzen \\d", "(?i)ryzen", "i9-1\\d+K", "^am",
+])
+def test_regex_matches_like_a_full_scan(index, pattern):
+    assert index.search(pattern, REGEX) == brute_force(pattern)
+
+
+def test_required_literals_keep_ascii_runs():
+    assert required_literals("Ryzen \\d+") == ("ryzen ",)
+    assert required_literals("aΣbc") == ("a", "bc")
+    assert required_literals("(?i)Ryzen") == ()
+
+
+def test_remove(index):
+    index.remove("a", ROWS["a"])
+    assert index.search("ryzen", CONTAINS) == {"d"}
+    assert index.search("AM4", REGEX) == set()
+
+
+def test_invalid_regex(index):
+    with pytest.raises(re.error):
+        index.search("(", REGEX)
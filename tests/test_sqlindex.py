@@ -0,0 +1,85 @@
+import copy
+
+import pytest
+
+from opendb_core import SqliteIndex, sqlindex
+
+from .conftest import CPU_SCHEMA, make_cpu, write_entry
+
+
+@pytest.fixture
+def index(tmp_path):
+    with SqliteIndex(tmp_path / "index.sqlite") as index:
+        yield index
+
+
+def test_sync_in_batches(repository, index, monkeypatch):
+    monkeypatch.setattr(sqlindex, "SYNC_BATCH", 7)
+    read_sizes = []
+    read_files = repository.loader().read_files
+
+    class Loader:
+        def read_files(self, category_dir, filenames):
+            read_sizes.append(len(filenames))
+            return read_files(category_dir, filenames)
+
+    monkeypatch.setattr(repository, "loader", Loader)
+
+    changed, errors = index.sync(repository, "cpu", CPU_SCHEMA)
+
+    assert (changed, errors) == (60, [])
+    assert max(read_sizes) == 7
+    assert sum(read_sizes) == 60
+    assert index.count(None, "cpu") == 60
+    assert index.get_entries("cpu", ["cpu-0003"]) == {"cpu-0003": make_cpu(3)}
+
+
+def test_resync_reads_only_changed_files(repository, index):
+    index.sync(repository, "cpu", CPU_SCHEMA)
+    keys = index.keys(None, "cpu")
+
+    edited = dict(make_cpu(5), name="Edited")
+    write_entry(repository, "cpu", edited)
+    repository.entry_path("cpu", "cpu-0006").unlink()
+
+    assert index.sync(repository, "cpu", CPU_SCHEMA) == (2, [])
+    assert index.count(None, "cpu") == 59
+    assert index.get_entries("cpu", ["cpu-0005"])["cpu-0005"]["name"] == "Edited"
+    # The edited entry keeps its row key
+    assert [key for key in keys if key in index.get_rows(keys)] == index.keys(None, "cpu")
+    assert index.sync(repository, "cpu", CPU_SCHEMA) == (0, [])
+
+
+def test_broken_file_reported_once(repository, index):
+    broken = repository.category_dir("cpu") / "broken.json"
+    broken.write_text("{oops", encoding="utf-8")
+
+    changed, errors = index.sync(repository, "cpu", CPU_SCHEMA)
+    assert [path.name for path, _ in errors] == ["broken.json"]
+    assert index.count(None, "cpu") == 60
+
+    assert index.sync(repository, "cpu", CPU_SCHEMA) == (0, [])
+
+
+def test_schema_change_rebuilds_fields_in_batches(repository, index, monkeypatch):
+    monkeypatch.setattr(sqlindex, "SYNC_BATCH", 7)
+    index.sync(repository, "cpu", CPU_SCHEMA)
+    assert index.fields("cpu").count("threads") == 0
+
+    schema = copy.deepcopy(CPU_SCHEMA)
+    schema["properties"]["threads"] = {"type": "integer"}
+    for i in range(3):
+        write_entry(repository, "cpu", dict(make_cpu(i), threads=32))
+
+    assert index.sync(repository, "cpu", schema) == (3, [])
+    assert "threads" in index.fields("cpu")
+    assert index.count(sqlindex.Compare("threads", "=", 32), "cpu") == 3
+    assert index.count(sqlindex.Compare("cores", ">=", 8), "cpu") == 36
+
+
+def test_remove_category(repository, index):
+    index.sync(repository, "cpu", CPU_SCHEMA)
+    index.remove_category("cpu")
+
+    assert index.categories() == []
+    assert index.count() == 0
@@ -0,0 +1,73 @@
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("PyQt5")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import main  # noqa: E402
+from opendb_core import search  # noqa: E402
+
+from .conftest import make_cpu  # noqa: E402
+
+HEADERS = ["opendb_id", "name", "socket"]
+
+
+@pytest.fixture
+def model(app):
+    return main.DataTableModel([make_cpu(i) for i in range(50)], HEADERS)
+
+
+def test_search_index_is_built_without_the_lock(model, monkeypatch):
+    lock_free = []
+    edited = []
+    add = main.SearchIndex.add
+
+    def add_and_edit(index, entry_id, texts):
+        if entry_id == "cpu-0010" and not edited:
+            # The GUI thread can still change rows while the index is built
+            def try_lock():
+                if model._index_lock.acquire(timeout=5):
+                    model._index_lock.release()
+                    lock_free.append(True)
+
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+            model.upsert_entry(dict(make_cpu(3), name="Edited"))
+            model.remove_entry("cpu-0004")
+            model.append_entries([make_cpu(50)])
+            edited.append(True)
+        add(index, entry_id, texts)
+
+    monkeypatch.setattr(main.SearchIndex, "add", add_and_edit)
+    _, ids = model.search_ids("edited", search.CONTAINS)
+
+    assert lock_free == [True]
+    assert ids == {"cpu-0003"}
+    assert model.search_ids("Ryzen 3", search.EXACT)[1] == set()
+    assert model.search_ids("cpu-0004", search.EXACT)[1] == set()
+    assert model.search_ids("cpu-0050", search.EXACT)[1] == {"cpu-0050"}
+
+
+def test_search_after_refresh(model):
+    model.search_ids("ryzen", search.CONTAINS)
+    model.refresh_data([make_cpu(i) for i in range(100, 110)])
+
+    _, ids = model.search_ids("cpu-00", search.STARTS_WITH)
+    assert ids == set()
+    assert len(model.search_ids("cpu-01", search.STARTS_WITH)[1]) == 10
+
+
+@pytest.mark.parametrize("mode, text", [(search.REGEX, "ryzen ("), (search.QUERY, "cores >=")])
+def test_invalid_filter_shows_no_rows(model, mode, text):
+    proxy = main.AdvancedFilterProxyModel()
+    proxy.setSourceModel(model)
+    proxy.setSearchMode(mode)
+
+    proxy.setFilterRegExp(text)
+    assert proxy.rowCount() == 0
+
+    proxy.setFilterRegExp("")
+    assert proxy.rowCount() == 50